@@ -0,0 +1 @@
+"""Offline benchmarks of the tick pipeline against the local simulator (`python -m benchmarks`)."""
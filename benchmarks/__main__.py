@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+from benchmarks.harness import compare, load_baseline, same_machine, save_baseline
+from benchmarks.pipeline import CANDLES, SYMBOLS, run_suite
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "baseline.json"
+
+def _ints(value: str) -> list:
+    return [int(v) for v in value.split(",")]
+
+def _print_results(results: dict, rows: list):
+    by_case = {row["case"]: row for row in rows}
+    print(f"{'case':<60} {'median':>10} {'p95':>10} {'baseline':>10} {'ratio':>7}  status")
+    for name, stats in results.items():
+        if "skipped" in stats:
+            print(f"{name:<60} skipped: {stats['skipped']}")
+            continue
+        row = by_case.get(name, {})
+        baseline = f"{row['baseline_ms']:.3f}" if row else "-"
+        ratio = f"{row['ratio']:.2f}" if row else "-"
+        print(f"{name:<60} {stats['median_ms']:>10.3f} {stats['p95_ms']:>10.3f} {baseline:>10} {ratio:>7}  {row.get('status', 'new')}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the tick pipeline offline against the local simulator")
+    parser.add_argument("--candles", type=_ints, default=list(CANDLES), help="comma-separated kline window sizes")
+    parser.add_argument("--symbols", type=_ints, default=list(SYMBOLS), help="comma-separated symbol counts")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per case")
+    parser.add_argument("--case", action="append", help="only these cases (get_klines, select_strategy, manage_orders, plot, plotter, tick)")
+    parser.add_argument("--playback", metavar="DIR", help="replay the primary symbol's archived candles instead of a random walk")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON to compare with")
+    parser.add_argument("--save", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed median slowdown before a case regresses")
+    parser.add_argument("--min-delta", type=float, default=1.0, help="ms a slowdown must also exceed to count")
+    parser.add_argument("--strict", action="store_true", help="fail on a regression even when the baseline is from another machine")
+    parser.add_argument("--json", action="store_true", help="print results and comparison as JSON")
+    args = parser.parse_args()
+
+    # Strategies log every tick; only errors would matter to a timing run
+    logging.basicConfig(level=logging.ERROR, format="%(asctime)s - %(levelname)s - %(message)s")
+    playback = os.path.abspath(args.playback) if args.playback else None
+    baseline = load_baseline(args.baseline)
+
+    # main and the web server create logs/ in the working directory; keep that out of the checkout
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        results = asyncio.run(run_suite(args.candles, args.symbols, args.repeat, playback, set(args.case) if args.case else None))
+
+    rows = compare(results, baseline, args.tolerance, args.min_delta) if baseline else []
+    if args.json:
+        print(json.dumps({"results": results, "comparison": rows}, indent=2))
+    else:
+        _print_results(results, rows)
+    if args.save:
+        params = {"candles": args.candles, "symbols": args.symbols, "repeat": args.repeat, "playback": bool(playback)}
+        save_baseline(args.baseline, results, params)
+        print(f"Baseline saved: {args.baseline}", file=sys.stderr)
+    regressed = [row["case"] for row in rows if row["status"] == "REGRESSED"]
+    if regressed:
+        print(f"{len(regressed)} case(s) regressed beyond {args.tolerance:.0%}: {', '.join(regressed)}", file=sys.stderr)
+        # Timings from other hardware only inform; the gate needs a baseline recorded on this machine
+        if same_machine(baseline["machine"]) or args.strict:
+            sys.exit(1)
+        recorded = baseline["machine"]
+        print(
+            f"Baseline was recorded on {recorded.get('node')} ({recorded.get('cpus')} CPUs, Python {recorded.get('python')}), "
+            "not this machine, so the check is advisory; re-record it here with --save to gate on it",
+            file=sys.stderr
+        )
@@ -0,0 +1,100 @@
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASELINE_VERSION = 1
+
+async def measure(fn, repeat: int, warmup: int = 1, setup=None) -> dict:
+    """Time `await fn(*args)` repeat times after warmup calls; `setup()` supplies args untimed."""
+    samples = []
+    for i in range(warmup + repeat):
+        args = await setup() if setup is not None else ()
+        started = time.perf_counter()
+        await fn(*args)
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            samples.append(elapsed)
+    return summarize(samples)
+
+def summarize(samples: list) -> dict:
+    """Milliseconds statistics of a list of durations in seconds."""
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "n": len(ms),
+        "min_ms": round(ms[0], 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+    }
+
+def machine() -> dict:
+    """Where a baseline was recorded; numbers only compare on like hardware."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "node": platform.node(),
+    }
+
+def same_machine(recorded: dict, current: dict = None) -> bool:
+    """True when a baseline's machine block matches this host closely enough for its timings to gate a run.
+
+    Host, architecture, CPU count and Python minor version must agree; the
+    kernel string is ignored, since it changes with every upgrade.
+    """
+    current = current or machine()
+    keys = ("node", "machine", "cpus")
+    return all(recorded.get(k) == current.get(k) for k in keys) and (
+        str(recorded.get("python", "")).rsplit(".", 1)[0] == str(current.get("python", "")).rsplit(".", 1)[0]
+    )
+
+def save_baseline(path: Path, results: dict, params: dict):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        "version": BASELINE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": machine(),
+        "params": params,
+        "results": results,
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+    tmp.replace(path)
+
+def load_baseline(path: Path):
+    path = Path(path)
+    if not path.exists():
+        return None
+    baseline = json.loads(path.read_text())
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Baseline {path} has version {baseline.get('version')}, expected {BASELINE_VERSION}")
+    return baseline
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25, min_delta_ms: float = 1.0) -> list:
+    """Compare medians with a baseline; returns one row per case both runs have.
+
+    A case regresses when its median is more than `tolerance` slower than
+    the baseline and by at least min_delta_ms, so sub-millisecond noise on
+    fast cases does not fail a run.
+    """
+    rows = []
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None or "median_ms" not in result or "median_ms" not in base:
+            continue
+        before, after = base["median_ms"], result["median_ms"]
+        ratio = after / before if before else float("inf")
+        if ratio > 1 + tolerance and after - before >= min_delta_ms:
+            status = "REGRESSED"
+        elif ratio < 1 - tolerance and before - after >= min_delta_ms:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"case": name, "baseline_ms": before, "median_ms": after, "ratio": round(ratio, 3), "status": status})
+    return rows
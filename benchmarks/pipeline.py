@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+from aiohttp import web
+from config import Config
+from simulator.exchange import Market, SimExchange, recorded_candles
+from simulator.server import create_app
+from strategies.matching import split_symbol
+from strategies.feeder import Feeder
+from strategies.scanner import Scanner
+from strategies.tick_scheduler import TickScheduler
+from benchmarks.harness import measure
+
+logger = logging.getLogger(__name__)
+
+CANDLES = (50, 1000, 10_000)
+SYMBOLS = (1, 5, 20)
+UNLIMITED = 10 ** 9  # rate-limit budget that never throttles; the limits are exchange policy, not our cost
+FUNDS = 1000.0  # quote and base funds per symbol, enough for every template order
+
+def bench_symbols(config: Config, count: int) -> list:
+    """The primary symbol plus made-up USDT pairs up to count."""
+    return [config.SYMBOL] + [f"BENCH{i}USDT" for i in range(1, count)]
+
+def bench_config(symbols: list, candles: int, root: Path) -> Config:
+    config = Config()
+    config.SYMBOLS = symbols
+    config.KLINE_WINDOW = candles
+    config.FILL_DIR = str(root / "fills")
+    config.RECORD_KLINES = False
+    config.STREAM_KLINES = False
+    config.STREAM_ACCOUNT = False
+    # Only the simulator is timed: no SDK retries, and throwaway keys in case one slipped through
+    config.SDK_FALLBACK = False
+    config.API_KEY = "bench-key"
+    config.API_SECRET = "bench-secret"
+    config.API_WEIGHT_LIMIT = UNLIMITED
+    config.ORDER_WEIGHT_PER_SEC = UNLIMITED
+    config.ORDER_WEIGHT_BURST = UNLIMITED
+    return config
+
+class BenchEnvironment:
+    """The real Feeder, Scanners and strategies wired to an in-process simulator.
+
+    The simulator's clock is stepped by hand, one candle per timed call
+    that needs fresh data, so every run sees the same sequence whatever
+    the wall clock does.
+    """
+
+    def __init__(self, candles: int, symbols: int, root: Path, playback_dir: str = None, seed: int = 7):
+        self.root = root
+        self.config = bench_config(bench_symbols(Config(), symbols), candles, root)
+        # Each symbol gets its own share of quote funds plus base to sell, so no order is rejected for funds
+        balances = {"USDT": FUNDS * symbols, **{split_symbol(s)[0]: FUNDS for s in self.config.SYMBOLS}}
+        self.exchange = SimExchange(self.config.SYMBOLS, balances, self.config.INTERVAL, speed=0, history=candles, seed=seed)
+        if playback_dir:
+            recorded = recorded_candles(playback_dir, self.config.SYMBOL, self.config.INTERVAL)
+            for symbol in self.config.SYMBOLS:
+                self.exchange.markets[symbol] = Market(symbol, recorded, self.exchange.interval_ms, candles)
+        self.dynamic_dir = root / "dynamic"
+        self.runner = None
+        self.feeder = None
+        self.scanners = {}
+        self.schedulers = {}
+
+    async def __aenter__(self):
+        app = create_app(self.exchange, self.config.API_KEY, self.config.API_SECRET)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self.runner.addresses[0][:2]
+        self.config.BASE_URL = f"http://{host}:{port}"
+        self.config.WS_URL = f"ws://{host}:{port}/ws"
+        self.feeder = Feeder(self.config)
+        for symbol in self.config.SYMBOLS:
+            self.scanners[symbol] = Scanner(self.config)
+            await self.scanners[symbol].initialize_strategies()
+            self.schedulers[symbol] = TickScheduler(self.config, symbol)
+        # Load every window and warm the indicators before anything is timed
+        for snapshot in await self.snapshots():
+            await self.scanners[snapshot.symbol].select_strategy(snapshot.klines)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.feeder.close()
+        await self.runner.cleanup()
+
+    async def snapshots(self) -> list:
+        return await asyncio.gather(*(self.feeder.get_snapshot(s) for s in self.config.SYMBOLS))
+
+    def reset_orders(self):
+        """Cancel every resting order so the next case starts from an empty book."""
+        for symbol, book in self.exchange.engine.orders.items():
+            for order_id in list(book):
+                self.exchange.cancel(symbol, order_id)
+
+    async def next_candle(self):
+        self.exchange.advance()
+        return ()
+
+async def bench_get_klines(env: BenchEnvironment, repeat: int) -> dict:
+    async def run():
+        await asyncio.gather(*(env.feeder.get_klines(s) for s in env.config.SYMBOLS))
+    return await measure(run, repeat, setup=env.next_candle)
+
+async def bench_select_strategy(env: BenchEnvironment, repeat: int) -> dict:
+    async def setup():
+        env.exchange.advance()
+        return (await asyncio.gather(*(env.feeder.get_klines(s) for s in env.config.SYMBOLS)),)
+
+    async def run(views):
+        for view in views:
+            await env.scanners[view.symbol].select_strategy(view)
+    return await measure(run, repeat, setup=setup)
+
+async def bench_manage_orders(env: BenchEnvironment, repeat: int) -> dict:
+    """One case per registered strategy, each run on every symbol's snapshot."""
+    results = {}
+    for index, name in enumerate(env.scanners[env.config.SYMBOL].registry.names):
+        strategies = {s: scanner.registry.get(index) for s, scanner in env.scanners.items()}
+        env.reset_orders()
+
+        async def setup():
+            env.exchange.advance()
+            return (await env.snapshots(),)
+
+        async def run(snapshots):
+            await asyncio.gather(*(
+                strategies[snap.symbol].manage_orders(env.feeder, env.config, env.dynamic_dir / snap.symbol, snap)
+                for snap in snapshots
+            ))
+        results[name] = await measure(run, repeat, setup=setup)
+    return results
+
+async def bench_plot(env: BenchEnvironment, repeat: int) -> dict:
+    import plot
+
+    async def setup():
+        return (await env.feeder.get_snapshot(env.config.SYMBOL),)
+
+    async def run(snapshot):
+        # No notifier: the chart is rendered and saved, never uploaded
+        await plot.generate_and_send_plot(snapshot, env.config, env.dynamic_dir)
+    return await measure(run, repeat, setup=setup)
+
+async def bench_plotter(env: BenchEnvironment, repeat: int) -> dict:
+    try:
+        import plotter
+    except ImportError as e:
+        return {"skipped": str(e)}
+
+    async def setup():
+        snapshot = await env.feeder.get_snapshot(env.config.SYMBOL)
+        # plotter takes raw REST rows (12 columns), open orders and fills
+        rows = [[t, o, h, l, c, v, ct, 0, 0, 0, 0, 0] for t, o, h, l, c, v, ct, _ in snapshot.klines.rows()]
+        return {"klines": rows}, [dict(o) for o in snapshot.open_orders], [dict(f) for f in snapshot.fills]
+
+    async def run(klines, open_orders, fills):
+        await plotter.generate_and_send_plot(klines, env.config, env.dynamic_dir, open_orders, fills)
+    return await measure(run, repeat, setup=setup)
+
+async def bench_tick(env: BenchEnvironment, repeat: int) -> dict:
+    """main.tick on every symbol at once, as the per-symbol loops run it, with a new candle each time."""
+    import main
+    from web_server.server import chart_feed
+    main.config = env.config
+    main.chart_feed = chart_feed
+    main.feeder = env.feeder
+    main.render_worker = main.RenderWorker(env.config)  # frames are queued, never rendered
+
+    async def run():
+        await asyncio.gather(*(
+            main.tick(s, env.scanners[s], env.schedulers[s], None, env.dynamic_dir / s) for s in env.config.SYMBOLS
+        ))
+    return await measure(run, repeat, setup=env.next_candle)
+
+async def run_suite(candles=CANDLES, symbols=SYMBOLS, repeat: int = 10, playback_dir: str = None, cases: set = None) -> dict:
+    """Run every case at every (candles, symbols) point; returns {"case/candles=N/symbols=S": stats}.
+
+    Charts follow the primary symbol only, so plot cases run once per
+    candle count, at the smallest symbol count.
+    """
+    results = {}
+
+    def wanted(case):
+        return cases is None or case.split("[")[0] in cases
+
+    def record(case, n, s, stats):
+        key = f"{case}/candles={n}/symbols={s}"
+        results[key] = stats
+        logger.info(f"{key}: {stats}")
+
+    for n in candles:
+        for s in symbols:
+            with tempfile.TemporaryDirectory() as tmp:
+                async with BenchEnvironment(n, s, Path(tmp), playback_dir) as env:
+                    if wanted("get_klines"):
+                        record("get_klines", n, s, await bench_get_klines(env, repeat))
+                    if wanted("select_strategy"):
+                        record("select_strategy", n, s, await bench_select_strategy(env, repeat))
+                    if wanted("manage_orders"):
+                        for name, stats in (await bench_manage_orders(env, repeat)).items():
+                            record(f"manage_orders[{name}]", n, s, stats)
+                    if s == min(symbols):
+                        if wanted("plot"):
+                            record("plot", n, s, await bench_plot(env, repeat))
+                        if wanted("plotter"):
+                            record("plotter", n, s, await bench_plotter(env, repeat))
+                    if wanted("tick"):
+                        record("tick", n, s, await bench_tick(env, repeat))
+    return results
@@ -2,82 +2,168 @@ import asyncio
 import logging
 import os
 from datetime import datetime
-import time
 from pathlib import Path
 from strategies.scanner import Scanner
 from strategies.feeder import Feeder
-from plot import generate_and_send_plot
+from strategies.recorder import KlineRecorder
+from strategies.tick_scheduler import TickScheduler
+from strategies.metrics import METRICS
+from notifier import TelegramNotifier
+from render_worker import RenderWorker, render_payload
 from config import Config
-from web_server.server import app
-
-# Ensure logs/ directory exists
-log_dir = "logs"
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler(os.path.join(log_dir, "main.log")), logging.StreamHandler()]
-)
+
 logger = logging.getLogger(__name__)
 
-config = Config()
-scanner = Scanner(config)
-feeder = Feeder(config)
+# Built by setup(), not at import: the render worker's spawned child re-imports this module
+config = None
+feeder = None
+scanners = {}
+recorders = {}
+schedulers = {}
+notifier = None
+render_worker = None
+chart_feed = None
 
-async def send_message_to_telegram(message: str):
-    """Send message to Telegram with ban handling."""
-    from telegram import Bot
-    try:
-        bot = Bot(token=config.TG_BOT_TOKEN)
-        await bot.send_message(chat_id=config.TG_USER_ID, text=message)
-        logger.info("Message sent to Telegram")
-    except Exception as e:
-        if "429" in str(e) or "Flood control exceeded" in str(e):
-            ban_duration = 16514  # ~4.5 hours
-            config.TELEGRAM_BAN = int(time.time() + ban_duration)
-            logger.warning(f"Telegram ban until {datetime.fromtimestamp(config.TELEGRAM_BAN)}")
-        logger.error(f"Telegram message error: {e}")
+def setup():
+    """Configure logging and build the bot's shared objects."""
+    global config, feeder, scanners, recorders, schedulers, notifier, render_worker, chart_feed
+    # Ensure logs/ directory exists
+    log_dir = "logs"
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.FileHandler(os.path.join(log_dir, "main.log")), logging.StreamHandler()]
+    )
+
+    config = Config()
+    METRICS.configure(config)
+    feeder = Feeder(config)
+    # Strategy state is per symbol; the feeder and its pooled sessions are shared
+    scanners = {symbol: Scanner(config) for symbol in config.SYMBOLS}
+    recorders = {symbol: KlineRecorder(config, symbol) for symbol in config.SYMBOLS} if config.RECORD_KLINES else {}
+    schedulers = {symbol: TickScheduler(config, symbol, streaming=lambda s=symbol: feeder.is_streaming(s)) for symbol in config.SYMBOLS}
+    feeder.listeners.append(wake)
+    notifier = TelegramNotifier(config)
+    render_worker = RenderWorker(config, on_rendered=chart_rendered)
+    from web_server.server import chart_feed
+
+def wake(symbol: str = None):
+    """Stream callback: wake the symbol's scheduler, or every scheduler for account-wide events."""
+    for name, scheduler in schedulers.items():
+        if symbol is None or name == symbol:
+            scheduler.notify()
+
+async def chart_rendered(path):
+    notifier.send_chart(path)
 
 async def main():
     """Main bot loop."""
     dynamic_dir = Path(f"logs/dynamic/{datetime.now().strftime('%Y%m%d_%H%M%S')}")
     dynamic_dir.mkdir(parents=True, exist_ok=True)
 
-    await scanner.initialize_strategies()
-    await send_message_to_telegram("Bot started")
+    for scanner in scanners.values():
+        await scanner.initialize_strategies()
+    if config.STREAM_KLINES:
+        feeder.start_stream()
+        logger.info("Kline streaming enabled")
+    if config.STREAM_ACCOUNT:
+        feeder.start_user_stream()
+        logger.info("Account streaming enabled")
+    for recorder in recorders.values():
+        recorder.start()
+    if recorders:
+        logger.info("Kline recording enabled")
+    render_worker.start()
+    METRICS.start_loop_monitor(config.METRICS_LOOP_LAG_INTERVAL)
+    notifier.start()
+    notifier.send_message("Bot started")
 
     # Start web server in a separate thread
     import threading
-    threading.Thread(target=lambda: app.run(host="0.0.0.0", port=5000, debug=False, use_reloader=False), daemon=True).start()
+    from web_server.server import app, socketio
+    chart_feed.start()
+    threading.Thread(
+        target=lambda: socketio.run(app, host="0.0.0.0", port=5000, debug=False, use_reloader=False, allow_unsafe_werkzeug=True),
+        daemon=True
+    ).start()
     logger.info("Web server started at http://localhost:5000")
 
+    # One loop per symbol, so a slow symbol never holds up the others
+    await asyncio.gather(*(run_symbol(symbol, dynamic_dir) for symbol in config.SYMBOLS))
+
+async def run_symbol(symbol: str, dynamic_dir: Path):
+    """Trading loop for one symbol, woken by stream events or its poll clock."""
+    scanner = scanners[symbol]
+    recorder = recorders.get(symbol)
+    scheduler = schedulers[symbol]
+    symbol_dir = dynamic_dir / symbol if len(config.SYMBOLS) > 1 else dynamic_dir
     while True:
+        await scheduler.wait()
         try:
-            klines_result = await feeder.get_klines()
-            if not klines_result or "timestamp" not in klines_result:
-                logger.error("No valid Klines data")
-                await asyncio.sleep(config.CHECK_INTERVAL)
-                continue
-
-            klines_file = Path(f"strategies/klines/Klines_{datetime.now().strftime('%Y_%m_%d_%H_%M_%S')}")
-            klines_file.parent.mkdir(parents=True, exist_ok=True)
-            with klines_file.open("w") as f:
-                for kline in klines_result["klines"]:
-                    f.write(",".join(map(str, kline)) + "\n")
-
-            selected_strategy = await scanner.select_strategy(str(klines_file))
-            if selected_strategy:
-                await selected_strategy.manage_orders(feeder, config, dynamic_dir)
-            else:
-                logger.info("No strategy selected")
-
-            await generate_and_send_plot(feeder, config, dynamic_dir)
-            await asyncio.sleep(config.CHECK_INTERVAL)
+            with METRICS.timer("tick_stage_seconds", symbol=symbol, stage="total"):
+                await tick(symbol, scanner, scheduler, recorder, symbol_dir)
+        except asyncio.TimeoutError:
+            logger.error(f"{symbol} snapshot exceeded {config.SYMBOL_TICK_TIMEOUT}s, tick skipped")
+            METRICS.inc("ticks_total", symbol=symbol, outcome="timeout")
+            scheduler.failed()
         except Exception as e:
-            logger.error(f"Main loop error: {e}")
-            await asyncio.sleep(config.CHECK_INTERVAL)
+            logger.error(f"{symbol} loop error: {e}")
+            METRICS.inc("ticks_total", symbol=symbol, outcome="error")
+            scheduler.failed()
+
+async def tick(symbol: str, scanner: Scanner, scheduler: TickScheduler, recorder, dynamic_dir: Path):
+    """Fetch one snapshot for a symbol and let its selected strategy act on it if anything changed."""
+    # Only the fetch is bounded: cancelling an order refresh halfway would leave orders the strategy does not know about
+    with METRICS.timer("tick_stage_seconds", symbol=symbol, stage="snapshot"):
+        snapshot = await asyncio.wait_for(feeder.get_snapshot(symbol), config.SYMBOL_TICK_TIMEOUT)
+    if snapshot is None:
+        logger.error(f"No snapshot for {symbol}")
+        METRICS.inc("ticks_total", symbol=symbol, outcome="no_data")
+        scheduler.failed()
+        return
+
+    if recorder:
+        recorder.record(snapshot.klines)
+
+    # The chart follows the primary symbol: deltas to the dashboard every tick, a PNG for Telegram at the render cadence
+    if symbol == config.SYMBOL:
+        with METRICS.timer("tick_stage_seconds", symbol=symbol, stage="chart_feed"):
+            chart_feed.publish(snapshot)
+        if render_worker.due():
+            with METRICS.timer("tick_stage_seconds", symbol=symbol, stage="render_submit"):
+                render_worker.submit(render_payload(snapshot, dynamic_dir))
+
+    reason = scheduler.should_run(snapshot)
+    if reason is None:
+        METRICS.inc("ticks_total", symbol=symbol, outcome="skipped")
+        return
+    logger.debug(f"{symbol} tick: {reason}")
+
+    with METRICS.timer("tick_stage_seconds", symbol=symbol, stage="select"):
+        selected_strategy = await scanner.select_strategy(snapshot.klines)
+    if selected_strategy:
+        with METRICS.timer("tick_stage_seconds", symbol=symbol, stage="manage_orders"):
+            await selected_strategy.manage_orders(feeder, config, dynamic_dir, snapshot)
+        METRICS.inc("ticks_total", symbol=symbol, outcome="run")
+    else:
+        logger.info(f"No strategy selected for {symbol}")
+        METRICS.inc("ticks_total", symbol=symbol, outcome="no_strategy")
+
+async def run():
+    """Run the bot and release pooled connections on exit."""
+    setup()
+    try:
+        await main()
+    finally:
+        await METRICS.stop_loop_monitor()
+        await render_worker.stop()
+        await notifier.stop()
+        for recorder in recorders.values():
+            await recorder.stop()
+        await feeder.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(run())
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from config import Config
+from strategies.metrics import METRICS
+from strategies.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+class TelegramBan:
+    """Telegram flood-control deadline shared through a small state file.
+
+    The notifier writes it; the web server and any other process read it,
+    so every component sees the same ban. Config.TELEGRAM_BAN still works
+    as a manual floor.
+    """
+
+    def __init__(self, path: str, floor: float = 0):
+        self.path = Path(path)
+        self.floor = floor
+        self._until = 0.0
+        self._mtime = None
+
+    @property
+    def until(self) -> float:
+        try:
+            mtime = self.path.stat().st_mtime
+            if mtime != self._mtime:
+                self._until = float(json.loads(self.path.read_text()).get("banned_until", 0))
+                self._mtime = mtime
+        except (OSError, ValueError):
+            pass
+        return max(self.floor, self._until)
+
+    def remaining(self) -> float:
+        return max(self.until - time.time(), 0.0)
+
+    def set(self, until: float):
+        self._until = until
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"banned_until": until}))
+        tmp.replace(self.path)
+        self._mtime = self.path.stat().st_mtime
+
+def retry_after_seconds(error: Exception):
+    """Seconds Telegram asked us to wait, from RetryAfter or its message; None if it did not say."""
+    value = getattr(error, "retry_after", None)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r"retry (?:after|in) (\d+)", str(error), re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+class TelegramNotifier:
+    """Background Telegram sender with one reused Bot, so the trading loop never waits on it.
+
+    Text messages go through a bounded queue and are dropped when it is
+    full. Charts are latest-wins: a chart still waiting when a newer one
+    arrives is replaced, never sent. Sends share a token bucket, and a
+    flood-control reply bans sending for the retry_after Telegram gives,
+    after which the same item is retried.
+    """
+
+    def __init__(self, config: Config):
+        self.token = config.TG_BOT_TOKEN
+        self.chat_id = config.TG_USER_ID
+        self.ban = TelegramBan(config.TELEGRAM_STATE_FILE, config.TELEGRAM_BAN)
+        self.bucket = TokenBucket(config.TELEGRAM_RATE, config.TELEGRAM_BURST)
+        self.retry_fallback = config.TELEGRAM_RETRY_FALLBACK
+        self.max_attempts = config.TELEGRAM_MAX_ATTEMPTS
+        self._messages = deque()
+        self._queue_size = config.TELEGRAM_QUEUE_SIZE
+        self._chart = None
+        self._ready = asyncio.Event()
+        self._bot = None
+        self._task = None
+        self.sent = 0
+        self.dropped = 0
+        self.superseded = 0
+
+    # Producers: never block, never raise
+
+    def send_message(self, text: str):
+        if len(self._messages) >= self._queue_size:
+            self.dropped += 1
+            METRICS.inc("notifications_total", kind="message", outcome="dropped")
+            logger.warning(f"Telegram queue full, message dropped: {text[:80]}")
+            return
+        self._messages.append(text)
+        self._ready.set()
+
+    def send_chart(self, path):
+        if self._chart is not None:
+            self.superseded += 1
+            METRICS.inc("notifications_total", kind="chart", outcome="superseded")
+        self._chart = str(path)
+        self._ready.set()
+
+    # Sender
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, drain: float = 5.0):
+        """Stop the sender, giving queued items up to drain seconds to go out."""
+        if self._task is None:
+            return
+        deadline = time.monotonic() + drain
+        while (self._messages or self._chart) and not self.ban.remaining() and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._bot is not None:
+            try:
+                await self._bot.shutdown()
+            except Exception as e:
+                logger.error(f"Telegram shutdown error: {e}")
+            self._bot = None
+
+    async def _get_bot(self):
+        if self._bot is None:
+            from telegram import Bot
+            bot = Bot(token=self.token)
+            await bot.initialize()
+            self._bot = bot
+        return self._bot
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            wait = self.ban.remaining()
+            if wait > 0:
+                logger.info(f"Telegram banned until {datetime.fromtimestamp(self.ban.until)}, holding notifications")
+                await asyncio.sleep(wait)
+                continue
+            # Messages first: they are rare and a newer chart can always replace the pending one
+            if self._messages:
+                kind, item = "message", self._messages[0]
+            elif self._chart is not None:
+                kind, item = "chart", self._chart
+            else:
+                self._ready.clear()
+                continue
+            await self.bucket.acquire(1)
+            done = await self._deliver(kind, item)
+            if done:
+                if kind == "message":
+                    self._messages.popleft()
+                elif self._chart == item:
+                    self._chart = None
+
+    async def _deliver(self, kind: str, item: str) -> bool:
+        """Send one item; False when it should stay queued for a retry after a ban."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                bot = await self._get_bot()
+                if kind == "message":
+                    await bot.send_message(chat_id=self.chat_id, text=item)
+                else:
+                    with open(item, "rb") as photo:
+                        await bot.send_photo(chat_id=self.chat_id, photo=photo)
+                self.sent += 1
+                METRICS.inc("notifications_total", kind=kind, outcome="sent")
+                logger.info(f"Telegram {kind} sent")
+                return True
+            except Exception as e:
+                retry_after = retry_after_seconds(e)
+                if retry_after is None and ("429" in str(e) or "Flood control" in str(e)):
+                    retry_after = self.retry_fallback
+                if retry_after is not None:
+                    self.ban.set(time.time() + retry_after)
+                    METRICS.inc("notifications_total", kind=kind, outcome="rate_limited")
+                    logger.warning(f"Telegram flood control, retrying after {retry_after:.0f}s")
+                    return False
+                if isinstance(e, OSError) and kind == "chart":
+                    logger.error(f"Telegram chart unreadable, skipped: {e}")
+                    break
+                logger.error(f"Telegram {kind} error (attempt {attempt}/{self.max_attempts}): {e}")
+                if attempt < self.max_attempts:
+                    await asyncio.sleep(min(2 ** attempt, 30))
+        METRICS.inc("notifications_total", kind=kind, outcome="failed")
+        return True
@@ -1,191 +1,149 @@
 import logging
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-from matplotlib.dates import DateFormatter, MinuteLocator
-from telegram import Bot
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.dates import AutoDateLocator, DateFormatter, MinuteLocator
 from datetime import datetime
-import time
 from pathlib import Path
 import io
 import numpy as np
-from PIL import Image
-import shutil
-import pandas as pd
-from mexc_sdk import Spot
+from render_worker import render_payload
 
 logger = logging.getLogger(__name__)
 
-def fetch_orders(client):
-    """Fetch open and executed orders from MEXC SDK (synchronous)."""
-    try:
-        symbol = "USD1USDT"  # Default symbol
-
-        # Fetch open orders (synchronous method)
-        open_orders = client.open_orders(symbol)  # No 'await' needed
-        open_orders_list = [
-            {
-                "price": float(order["price"]),
-                "side": "buy" if order["side"] == "BUY" else "sell",
-                "timestamp": order.get("time", int(time.time() * 1000))
-            }
-            for order in open_orders
-        ]
-
-        # Fetch executed orders (trade history, synchronous method)
-        trades = client.account_trade_list(symbol, limit=100)  # No 'await' needed
-        executed_orders = [
-            {
-                "price": float(trade["price"]),
-                "side": "buy" if trade["isBuyer"] else "sell",
-                "timestamp": trade["time"],
-                "quantity": float(trade["qty"])
-            }
-            for trade in trades
-        ]
-
-        return open_orders_list, executed_orders
-    except Exception as e:
-        logger.error(f"Error fetching orders: {e}")
-        return [], []
-
-async def generate_and_send_plot(feeder, config, dynamic_dir: Path):
-    """Generate OHLC candlestick chart with volume and order markers."""
-    klines_result = await feeder.get_klines()
-    if not klines_result or "timestamp" not in klines_result or not klines_result["klines"]:
-        logger.error("No valid Klines data for plotting")
-        return
-
-    # Prepare data for candlestick chart
-    data = []
-    for kline in klines_result["klines"]:
-        if len(kline) >= 7:  # Ensure kline has required fields
-            try:
-                data.append({
-                    "time": datetime.fromtimestamp(kline[0] / 1000),
-                    "open": float(kline[1]),
-                    "high": float(kline[2]),
-                    "low": float(kline[3]),
-                    "close": float(kline[4]),
-                    "volume": float(kline[5])
-                })
-            except (ValueError, TypeError) as e:
-                logger.error(f"Invalid kline data: {kline}, error: {e}")
-                continue
-    if len(data) < 2:
-        logger.error(f"Insufficient kline data points: {len(data)}")
-        return
-    df = pd.DataFrame(data)
-    logger.info(f"Plotting {len(df)} klines from {df['time'].min()} to {df['time'].max()}")
+MS_PER_DAY = 86_400_000  # matplotlib dates are days since 1970-01-01
+TICK = 0.0001  # 1 price tick, USD1
+LOCAL_TZ = datetime.now().astimezone().tzinfo
 
-    # Validate volume data
-    if df["volume"].isnull().any() or (df["volume"] <= 0).all():
-        logger.warning("Volume data is invalid or all zeros, volume bars may not appear")
-    else:
-        logger.info(f"Volume range: {df['volume'].min()} to {df['volume'].max()}")
-
-    # Create MEXC SDK client using config attributes
-    client = Spot(api_key=config.API_KEY, api_secret=config.API_SECRET)
-    open_orders, executed_orders = fetch_orders(client)  # Synchronous call
+# Figure and artists are built once per process and updated in place
+_chart = None
 
-    # Set up dark theme
+def _build_chart():
+    """Create the persistent dark-themed figure and its (empty) artists."""
     plt.style.use("dark_background")
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), gridspec_kw={'height_ratios': [3, 1]}, sharex=True)
-
-    # Candlestick chart (make candles 3x thicker)
-    width = 0.0001  # Base width for open/close ticks
-    for idx, row in df.iterrows():
-        color = "green" if row["close"] >= row["open"] else "red"
-        # Body (3x thicker: linewidth from 2 to 6)
-        ax1.plot([row["time"], row["time"]], [row["open"], row["close"]], color=color, linewidth=6)
-        # Wicks
-        ax1.plot([row["time"], row["time"]], [row["low"], row["high"]], color=color, linewidth=1)
-        # Open/Close ticks (adjust width proportionally: 0.0001 to 0.0003)
-        ax1.plot([row["time"], row["time"] - pd.Timedelta(seconds=width * 3)], [row["open"], row["open"]], color=color, linewidth=1)
-        ax1.plot([row["time"], row["time"] + pd.Timedelta(seconds=width * 3)], [row["close"], row["close"]], color=color, linewidth=1)
-
-    # Volume bars (set width to span ~80% of a 1-minute interval)
-    bar_width = 0.0002  # Adjusted width for visibility (in fraction of time axis)
-    ax2.bar(df["time"], df["volume"], width=bar_width, color="gray", alpha=0.5)
-
-    # Set price padding (1 tick = 0.0001 USD1)
-    tick = 0.0001
-    price_min = df["low"].min() - tick
-    price_max = df["high"].max() + tick
-    ax1.set_ylim(price_min, price_max)
-
-    # Set volume axis limits to ensure visibility
-    if df["volume"].max() > 0:
-        ax2.set_ylim(0, df["volume"].max() * 1.1)  # Add 10% padding above max volume
-    else:
-        ax2.set_ylim(0, 1)  # Default range if no volume
-
-    # Plot open orders
-    for order in open_orders:
-        color = "green" if order["side"] == "buy" else "red"
-        ax1.axhline(y=order["price"], color=color, linestyle="--", linewidth=4, alpha=0.7)
-
-    # Plot executed orders
-    tick_offset = tick / 2  # 0.00005 USD1
-    for order in executed_orders:
-        order_time = datetime.fromtimestamp(order["timestamp"] / 1000)
-        # Find candle with matching timestamp
-        candle = df[df["time"].dt.floor("min") == order_time.replace(second=0, microsecond=0)]
-        if not candle.empty:
-            candle = candle.iloc[0]
-            if order["side"] == "sell":
-                # Red downward triangle above high
-                ax1.plot(order_time, candle["high"] + tick_offset, marker="v", color="red", markersize=10)
-            else:
-                # Green upward triangle below low
-                ax1.plot(order_time, candle["low"] - tick_offset, marker="^", color="green", markersize=10)
-
-    # X-axis: 5-minute markings, limit to 50-minute span
-    ax1.set_xlim(df["time"].min(), df["time"].max())
-    ax1.xaxis.set_major_locator(MinuteLocator(interval=5))
-    ax1.xaxis.set_major_formatter(DateFormatter("%H:%M"))
-    plt.xticks(rotation=45)
-
-    # Styling
-    ax1.set_title(f"OHLC Candlestick Chart for {klines_result['klines'][0][-1]}", color="white")
+    chart = {
+        "fig": fig,
+        "ax1": ax1,
+        "ax2": ax2,
+        "wicks": LineCollection([], linewidths=1),
+        "bodies": PolyCollection([], linewidths=0),
+        "volume": PolyCollection([], facecolors="gray", alpha=0.5, linewidths=0),
+        "orders": LineCollection([], linestyles="--", linewidths=4, alpha=0.7),
+        "sells": ax1.plot([], [], linestyle="none", marker="v", color="red", markersize=10)[0],
+        "buys": ax1.plot([], [], linestyle="none", marker="^", color="green", markersize=10)[0],
+    }
+    ax1.add_collection(chart["wicks"])
+    ax1.add_collection(chart["bodies"])
+    ax1.add_collection(chart["orders"])
+    ax2.add_collection(chart["volume"])
+
+    ax1.set_title("OHLC Candlestick Chart", color="white")  # placeholder so the layout reserves room
     ax1.set_ylabel("Price (USD1)", color="white")
     ax2.set_ylabel("Volume", color="white")
     ax1.grid(True, linestyle="--", alpha=0.3)
     ax2.grid(True, linestyle="--", alpha=0.3)
     ax1.tick_params(colors="white")
     ax2.tick_params(colors="white")
+    ax1.xaxis.set_major_formatter(DateFormatter("%H:%M", tz=LOCAL_TZ))
+    plt.setp(ax2.get_xticklabels(), rotation=45)
     fig.patch.set_facecolor("#1c2526")
     ax1.set_facecolor("#2a2e39")
     ax2.set_facecolor("#2a2e39")
+    fig.tight_layout()
+    return chart
+
+def _boxes(x, half_width, bottom, top):
+    """Rectangle vertices, shape (n, 4, 2), for bodies and volume bars."""
+    left, right = x - half_width, x + half_width
+    return np.stack([
+        np.column_stack([left, bottom]),
+        np.column_stack([left, top]),
+        np.column_stack([right, top]),
+        np.column_stack([right, bottom]),
+    ], axis=1)
+
+def render_chart(payload: dict):
+    """Render the OHLC candlestick chart with volume and order markers; returns the PNG path."""
+    global _chart
+    klines = payload["klines"]
+    dynamic_dir = Path(payload["dynamic_dir"])
+    if klines is None or len(klines) < 2:
+        logger.error(f"Insufficient kline data points: {0 if klines is None else len(klines)}")
+        return None
+    if _chart is None:
+        _chart = _build_chart()
+    chart = _chart
+    ax1, ax2 = chart["ax1"], chart["ax2"]
+
+    x = klines.open_time / MS_PER_DAY
+    opens, highs, lows, closes, volumes = klines.open, klines.high, klines.low, klines.close, klines.volume
+    logger.info(f"Plotting {len(x)} klines from {datetime.fromtimestamp(klines.open_time[0] / 1000)} to {datetime.fromtimestamp(klines.open_time[-1] / 1000)}")
 
-    # Adjust layout
-    plt.tight_layout()
+    # Validate volume data
+    if np.isnan(volumes).any() or (volumes <= 0).all():
+        logger.warning("Volume data is invalid or all zeros, volume bars may not appear")
 
-    # Save plot
+    # Candles: one collection each for wicks and bodies instead of per-row artists
+    step = float(np.median(np.diff(x)))
+    half = step * 0.3
+    price_min = lows.min() - TICK
+    price_max = highs.max() + TICK
+    colors = np.where(closes >= opens, "green", "red")
+    chart["wicks"].set_segments(np.stack([np.column_stack([x, lows]), np.column_stack([x, highs])], axis=1))
+    chart["wicks"].set_color(colors)
+    # Keep doji bodies visible as a thin bar
+    min_body = (price_max - price_min) * 0.002
+    body_low = np.minimum(opens, closes)
+    body_high = np.maximum(np.maximum(opens, closes), body_low + min_body)
+    chart["bodies"].set_verts(_boxes(x, half, body_low, body_high))
+    chart["bodies"].set_facecolor(colors)
+
+    # Volume bars
+    chart["volume"].set_verts(_boxes(x, half, np.zeros_like(volumes), volumes))
+    max_volume = volumes.max()
+    ax2.set_ylim(0, max_volume * 1.1 if max_volume > 0 else 1)
+
+    ax1.set_xlim(x[0] - step, x[-1] + step)
+    ax1.set_ylim(price_min, price_max)
+    span_minutes = (x[-1] - x[0]) * 1440
+    ax1.xaxis.set_major_locator(MinuteLocator(interval=5, tz=LOCAL_TZ) if span_minutes <= 120 else AutoDateLocator(tz=LOCAL_TZ))
+
+    # Open orders as dashed horizontal lines across the window
+    orders = payload["open_orders"]
+    prices = np.array([float(o["price"]) for o in orders])
+    chart["orders"].set_segments([[(x[0] - step, p), (x[-1] + step, p)] for p in prices])
+    chart["orders"].set_color(["green" if o["side"] == "buy" else "red" for o in orders])
+
+    # Executed orders: match each fill to its candle with one searchsorted pass
+    fills = payload["executed_orders"]
+    fill_times = np.array([f["timestamp"] for f in fills], dtype=np.int64)
+    fill_sell = np.array([f["side"] == "sell" for f in fills], dtype=bool)
+    idx = np.searchsorted(klines.open_time, fill_times, side="right") - 1
+    matched = (idx >= 0) & (fill_times <= klines.close_time[np.clip(idx, 0, None)])
+    fx = fill_times / MS_PER_DAY
+    sells = matched & fill_sell
+    buys = matched & ~fill_sell
+    tick_offset = TICK / 2
+    chart["sells"].set_data(fx[sells], highs[idx[sells]] + tick_offset)
+    chart["buys"].set_data(fx[buys], lows[idx[buys]] - tick_offset)
+
+    ax1.set_title(f"OHLC Candlestick Chart for {klines.symbol}", color="white")
+
+    # The dashboard draws its own chart from web_server.chart_feed; this PNG is for Telegram
     buffer = io.BytesIO()
-    plt.savefig(buffer, format="png", facecolor=fig.get_facecolor())
-    buffer.seek(0)
-    plt.close()
+    chart["fig"].savefig(buffer, format="png", facecolor=chart["fig"].get_facecolor())
 
     output_path = dynamic_dir / "kline_plot.png"
-    Image.open(buffer).save(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(buffer.getvalue())
     logger.info(f"Chart saved: {output_path}")
-
-    # Copy to static folder for Flask
-    static_path = Path("web_server/static/kline_plot.png")
-    shutil.copy(output_path, static_path)
-    logger.info(f"Chart copied to: {static_path}")
-
-    if config.TELEGRAM_BAN > time.time():
-        logger.info(f"Telegram banned, chart saved: {output_path}")
-        return
-
-    try:
-        bot = Bot(token=config.TG_BOT_TOKEN)
-        with open(output_path, "rb") as photo:
-            await bot.send_photo(chat_id=config.TG_USER_ID, photo=photo)
-        logger.info("Chart sent to Telegram")
-    except Exception as e:
-        if "429" in str(e) or "Flood control exceeded" in str(e):
-            ban_duration = 16514  # ~4.5 hours
-            config.TELEGRAM_BAN = int(time.time() + ban_duration)
-            logger.warning(f"Telegram ban until {datetime.fromtimestamp(config.TELEGRAM_BAN)}")
-        logger.error(f"Telegram chart error: {e}")
+    return output_path
+
+async def generate_and_send_plot(snapshot, config, dynamic_dir: Path, notifier=None):
+    """Render inline and hand the chart to a TelegramNotifier; the main loop uses render_worker.RenderWorker instead."""
+    output_path = render_chart(render_payload(snapshot, dynamic_dir))
+    if output_path and notifier is not None:
+        notifier.send_chart(output_path)
+    return output_path
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from pathlib import Path
+from config import Config
+from strategies.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+def render_payload(snapshot, dynamic_dir: Path) -> dict:
+    """Picklable copy of what the chart needs from the tick's snapshot."""
+    return {
+        "klines": snapshot.klines,
+        "open_orders": [dict(o) for o in snapshot.open_orders],
+        "executed_orders": [dict(f) for f in snapshot.fills],
+        "dynamic_dir": str(dynamic_dir)
+    }
+
+def _serve(conn):
+    """Child process loop: render each payload received, reply with the PNG path."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - render - %(message)s")
+    from plot import render_chart  # matplotlib is loaded here only; the bot process never imports plot
+    while True:
+        payload = conn.recv()
+        if payload is None:
+            break
+        try:
+            conn.send(("ok", render_chart(payload)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+class RenderWorker:
+    """Render charts in a separate process so the trading loop never waits on them.
+
+    Only the newest submitted payload is kept: frames submitted while a
+    render is in flight replace each other and only the last one is drawn.
+    """
+
+    def __init__(self, config: Config, on_rendered=None):
+        self.interval = config.RENDER_INTERVAL
+        self.timeout = config.RENDER_TIMEOUT
+        self.on_rendered = on_rendered  # async callback(path)
+        self.dropped = 0
+        self.rendered = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._latest = None
+        self._ready = asyncio.Event()
+        self._last_submit = 0.0
+        self._task = None
+
+    def due(self) -> bool:
+        """True when the render cadence allows another frame."""
+        return time.monotonic() - self._last_submit >= self.interval
+
+    def submit(self, payload: dict):
+        """Queue a frame, replacing any frame not yet picked up; never blocks."""
+        if self._latest is not None:
+            self.dropped += 1
+            METRICS.inc("render_frames_total", outcome="dropped")
+        self._latest = payload
+        self._last_submit = time.monotonic()
+        self._ready.set()
+
+    def start(self):
+        if self._task is None:
+            self._spawn()
+            self._task = asyncio.create_task(self._run())
+
+    def _spawn(self):
+        parent, child = self._ctx.Pipe()
+        self._process = self._ctx.Process(target=_serve, args=(child,), name="chart-render", daemon=True)
+        self._process.start()
+        child.close()
+        self._conn = parent
+        logger.info(f"Render worker started (pid {self._process.pid})")
+
+    def _kill(self):
+        if self._process is not None and self._process.is_alive():
+            self._process.kill()
+            self._process.join(1)
+        if self._conn is not None:
+            self._conn.close()
+        self._process, self._conn = None, None
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            payload, self._latest = self._latest, None
+            if payload is None:
+                continue
+            if self._process is None or not self._process.is_alive():
+                self._kill()
+                self._spawn()
+            started = time.monotonic()
+            try:
+                self._conn.send(payload)
+                if not await asyncio.to_thread(self._conn.poll, self.timeout):
+                    logger.error(f"Chart render exceeded {self.timeout}s, restarting worker")
+                    METRICS.inc("render_frames_total", outcome="timeout")
+                    self._kill()
+                    continue
+                status, result = self._conn.recv()
+            except (EOFError, OSError) as e:
+                logger.error(f"Render worker died: {e}")
+                METRICS.inc("render_frames_total", outcome="died")
+                self._kill()
+                continue
+            if status != "ok":
+                logger.error(f"Chart render error: {result}")
+                METRICS.inc("render_frames_total", outcome="error")
+                continue
+            self.rendered += 1
+            METRICS.inc("render_frames_total", outcome="rendered")
+            METRICS.observe("render_seconds", time.monotonic() - started)
+            logger.info(f"Chart rendered in {time.monotonic() - started:.2f}s ({self.dropped} stale frames dropped so far)")
+            if result and self.on_rendered:
+                try:
+                    await self.on_rendered(result)
+                except Exception as e:
+                    logger.error(f"Chart callback error: {e}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+                self._process.join(2)
+            except OSError:
+                pass
+        self._kill()
@@ -0,0 +1,3 @@
+"""Local MEXC spot stand-in for benchmarks and integration tests (`python -m simulator`)."""
+from simulator.exchange import SimExchange
+from simulator.server import FaultProfile, create_app
@@ -0,0 +1,35 @@
+import argparse
+import logging
+from aiohttp import web
+from config import Config
+from simulator.exchange import SimExchange
+from simulator.server import FaultProfile, create_app
+
+if __name__ == "__main__":
+    config = Config()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - sim - %(message)s")
+    parser = argparse.ArgumentParser(description="Local MEXC spot simulator; point BASE_URL/WS_URL at it")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--symbol", action="append", help="symbol to list (repeatable; default: Config.SYMBOLS)")
+    parser.add_argument("--balance", action="append", default=[], help="starting balance ASSET=AMOUNT (default USDT=1000)")
+    parser.add_argument("--speed", type=float, default=1.0, help="candles per interval of wall time")
+    parser.add_argument("--playback", metavar="DIR", help="replay candles from this kline archive instead of a random walk")
+    parser.add_argument("--fee", type=float, default=0.0, help="fee rate per fill")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every REST response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random seconds per response")
+    parser.add_argument("--error-429", type=float, default=0.0, help="share of REST requests answered with 429")
+    parser.add_argument("--reject-cancel", type=float, default=0.0, help="share of cancels answered with -2011")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    balances = {"USDT": 1000.0}
+    for item in args.balance:
+        asset, amount = item.split("=", 1)
+        balances[asset] = float(amount)
+    exchange = SimExchange(
+        args.symbol or list(config.SYMBOLS), balances, config.INTERVAL, args.speed, args.playback,
+        fee_rate=args.fee, seed=args.seed
+    )
+    faults = FaultProfile(args.latency, args.jitter, args.error_429, args.reject_cancel)
+    web.run_app(create_app(exchange, config.API_KEY, config.API_SECRET, faults), host=args.host, port=args.port)
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+import uuid
+import numpy as np
+from strategies.kline_archive import KlineArchive
+from strategies.market_stream import INTERVALS
+from strategies.matching import MatchingEngine, split_symbol
+
+logger = logging.getLogger(__name__)
+
+class Market:
+    """Candles for one symbol, revealed one at a time by the exchange clock.
+
+    Candle times are rebased so the current candle opens at the present
+    interval boundary, whatever period the data was recorded in.
+    """
+
+    def __init__(self, symbol: str, candles: np.ndarray, interval_ms: int, history: int):
+        self.symbol = symbol
+        self.candles = candles  # columns: open, high, low, close, volume
+        self.interval_ms = interval_ms
+        self.cursor = min(history, len(candles) - 1)  # index of the current candle
+        now = int(time.time() * 1000)
+        self.base = now - now % interval_ms - self.cursor * interval_ms
+
+    def open_time(self, i: int) -> int:
+        return self.base + i * self.interval_ms
+
+    @property
+    def price(self) -> float:
+        return float(self.candles[self.cursor, 3])
+
+    def klines(self, start_time: int = None, end_time: int = None, limit: int = 500) -> list:
+        """REST klines rows up to and including the current candle."""
+        first = 0 if start_time is None else max(-(-(start_time - self.base) // self.interval_ms), 0)
+        last = self.cursor if end_time is None else min(self.cursor, (end_time - self.base) // self.interval_ms)
+        if start_time is None:
+            first = max(last - limit + 1, 0)
+        rows = []
+        for i in range(first, min(last + 1, first + limit)):
+            o, h, l, c, v = self.candles[i]
+            t = self.open_time(i)
+            rows.append([t, f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.8f}", t + self.interval_ms - 1, f"{v * c:.8f}"])
+        return rows
+
+    def advance(self) -> bool:
+        """Move to the next candle; False once playback data runs out."""
+        if self.cursor + 1 >= len(self.candles):
+            return False
+        self.cursor += 1
+        return True
+
+def synthetic_candles(count: int, price: float = 1.0, volatility: float = 0.001, seed: int = None) -> np.ndarray:
+    """Mean-reverting random-walk candles around price, for runs without recorded data."""
+    rng = np.random.default_rng(seed)
+    closes = np.empty(count)
+    p = price
+    for i in range(count):
+        p += (price - p) * 0.05 + rng.normal(0, volatility * price)
+        closes[i] = p
+    opens = np.concatenate([[price], closes[:-1]])
+    wick = np.abs(rng.normal(0, volatility * price, (2, count)))
+    highs = np.maximum(opens, closes) + wick[0]
+    lows = np.minimum(opens, closes) - wick[1]
+    volumes = rng.uniform(100, 1000, count)
+    return np.column_stack([opens, highs, lows, closes, volumes])
+
+def recorded_candles(root: str, symbol: str, interval: str) -> np.ndarray:
+    """Candles from the kline archive, for playback."""
+    records = KlineArchive(root, symbol, interval).read()
+    if not len(records):
+        raise ValueError(f"No archived {interval} klines for {symbol} in {root}")
+    return np.column_stack([records["open"], records["high"], records["low"], records["close"], records["volume"]])
+
+class Subscription:
+    """One WebSocket client's channels and outgoing message queue."""
+
+    def __init__(self, listen_key: str = None):
+        self.listen_key = listen_key
+        self.channels = set()
+        self.queue = asyncio.Queue(maxsize=10_000)
+        self.dropped = 0
+
+class SimExchange:
+    """Local stand-in for MEXC spot: market clock, matching engine and event fan-out.
+
+    Each clock step reveals the next candle of every symbol, fills resting
+    orders its range trades through and publishes kline, deal and
+    user-data events to subscribed WebSocket queues.
+    """
+
+    def __init__(self, symbols: list, balances: dict, interval: str = "1m", speed: float = 1.0,
+                 playback_dir: str = None, history: int = 1000, fee_rate: float = 0.0, seed: int = None):
+        self.interval = interval
+        self.ws_interval, self.interval_ms = INTERVALS[interval]
+        self.speed = speed
+        self.engine = MatchingEngine(balances, fee_rate)
+        self.markets = {}
+        for symbol in symbols:
+            if playback_dir:
+                candles = recorded_candles(playback_dir, symbol, interval)
+            else:
+                candles = synthetic_candles(history + 100_000, seed=seed)
+            self.markets[symbol] = Market(symbol, candles, self.interval_ms, history)
+        self.listen_keys = set()
+        self.subscribers = set()
+        self._task = None
+
+    # Market clock
+
+    def start(self):
+        # speed 0 leaves the clock to advance(), for benchmarks that step it themselves
+        if self._task is None and self.speed > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        step = self.interval_ms / 1000 / self.speed
+        while True:
+            await asyncio.sleep(step)
+            self.advance()
+
+    def advance(self):
+        """Reveal the next candle of every symbol."""
+        for market in self.markets.values():
+            if market.advance():
+                self.step(market)
+
+    def step(self, market: Market):
+        """Publish the current candle and fill the orders it trades through."""
+        i = market.cursor
+        o, h, l, c, v = (float(x) for x in market.candles[i])
+        open_time = market.open_time(i)
+        fills = self.engine.match(market.symbol, l, h, open_time)
+        deals = [{"S": 1 if c >= o else 2, "p": f"{p:.8f}", "t": open_time + k, "v": f"{v / 4:.8f}"} for k, p in enumerate((o, h, l, c))]
+        self.publish(f"spot@public.deals.v3.api@{market.symbol}", market.symbol, {"deals": deals, "e": "spot@public.deals.v3.api"})
+        self.publish(f"spot@public.kline.v3.api@{market.symbol}@{self.ws_interval}", market.symbol, {
+            "k": {"t": open_time // 1000, "o": o, "h": h, "l": l, "c": c, "v": v, "a": v * c,
+                  "T": (open_time + self.interval_ms) // 1000, "i": self.ws_interval},
+            "e": "spot@public.kline.v3.api"
+        })
+        for fill in fills:
+            self.publish_fill(market.symbol, fill)
+
+    # Event fan-out
+
+    def subscribe(self, listen_key: str = None) -> Subscription:
+        subscription = Subscription(listen_key)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+
+    def publish(self, channel: str, symbol: str, data: dict, private: bool = False):
+        message = {"c": channel, "d": data, "s": symbol, "t": int(time.time() * 1000)}
+        for subscription in self.subscribers:
+            if channel not in subscription.channels or (private and subscription.listen_key not in self.listen_keys):
+                continue
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                subscription.dropped += 1
+
+    def publish_order(self, symbol: str, order: dict, status: int):
+        self.publish("spot@private.orders.v3.api", symbol, {
+            "i": order["order_id"], "S": 1 if order["side"] == "buy" else 2, "p": order["price"],
+            "v": order["quantity"], "s": status, "o": 1, "O": order.get("time", 0)
+        }, private=True)
+
+    def publish_balances(self, symbol: str):
+        for asset in split_symbol(symbol):
+            self.publish("spot@private.account.v3.api", None, {
+                "a": asset, "f": f"{self.engine.free.get(asset, 0.0):.8f}", "l": f"{self.engine.locked.get(asset, 0.0):.8f}",
+                "c": int(time.time() * 1000)
+            }, private=True)
+
+    def publish_fill(self, symbol: str, fill: dict):
+        self.publish_order(symbol, fill, 2)
+        self.publish("spot@private.deals.v3.api", symbol, {
+            "p": f"{fill['price']:.8f}", "v": f"{fill['quantity']:.8f}", "S": 1 if fill["side"] == "buy" else 2,
+            "T": fill["timestamp"], "t": fill["id"], "i": fill["order_id"]
+        }, private=True)
+        self.publish_balances(symbol)
+
+    # Account operations, mirrored to the user-data stream
+
+    def place(self, symbol: str, side: str, quantity, price):
+        now = int(time.time() * 1000)
+        order_id = self.engine.place(symbol, side, quantity, price, now)
+        if order_id is not None:
+            self.publish_order(symbol, self.engine.orders[symbol][order_id], 1)
+            self.publish_balances(symbol)
+        return order_id
+
+    def cancel(self, symbol: str, order_id: str) -> bool:
+        order = self.engine.orders.get(symbol, {}).get(order_id)
+        if order is None or not self.engine.cancel(symbol, order_id):
+            return False
+        self.publish_order(symbol, order, 4)
+        self.publish_balances(symbol)
+        return True
+
+    def new_listen_key(self) -> str:
+        key = uuid.uuid4().hex
+        self.listen_keys.add(key)
+        return key
@@ -0,0 +1,288 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from aiohttp import web, WSMsgType
+from strategies.signing import verify_signature
+from simulator.exchange import SimExchange
+
+logger = logging.getLogger(__name__)
+
+class FaultProfile:
+    """Latency, jitter and injected errors applied to every REST request."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_429: float = 0.0, reject_cancel: float = 0.0,
+                 retry_after: float = 1.0):
+        self.latency = latency  # seconds added to every response
+        self.jitter = jitter  # extra uniform random seconds
+        self.error_429 = error_429  # share of requests answered with 429
+        self.reject_cancel = reject_cancel  # share of cancels answered with -2011
+        self.retry_after = retry_after
+
+def error(status: int, code: int, msg: str) -> web.Response:
+    return web.json_response({"code": code, "msg": msg}, status=status)
+
+def _order_json(symbol: str, order: dict, status: str = "NEW") -> dict:
+    return {
+        "symbol": symbol,
+        "orderId": order["order_id"],
+        "price": f"{order['price']:.8f}",
+        "origQty": f"{order['quantity']:.8f}",
+        "executedQty": "0",
+        "status": status,
+        "type": "LIMIT",
+        "side": "BUY" if order["side"] == "buy" else "SELL",
+        "time": order.get("time", 0),
+    }
+
+def create_app(exchange: SimExchange, api_key: str, api_secret: str, faults: FaultProfile = None,
+               recv_window_check: bool = True) -> web.Application:
+    """aiohttp app serving the MEXC spot REST endpoints and WebSocket streams the bot uses."""
+    faults = faults or FaultProfile()
+    stats = {"requests": 0, "errors_429": 0, "rejected_cancels": 0}
+    placed = {}  # order id -> order dict, kept after it fills or is cancelled
+    client_ids = {}  # (symbol, client order id) -> order id
+
+    @web.middleware
+    async def simulate_network(request, handler):
+        stats["requests"] += 1
+        if faults.latency or faults.jitter:
+            await asyncio.sleep(faults.latency + random.uniform(0, faults.jitter))
+        if request.path.startswith("/api/") and random.random() < faults.error_429:
+            stats["errors_429"] += 1
+            response = error(429, 429, "Too Many Requests")
+            response.headers["Retry-After"] = str(faults.retry_after)
+            return response
+        return await handler(request)
+
+    def signed(handler):
+        """Reject requests whose key, signature or timestamp would fail on MEXC."""
+        async def wrapper(request):
+            if request.headers.get("X-MEXC-APIKEY") != api_key:
+                return error(400, 700001, "API-key format invalid.")
+            if not verify_signature(api_secret, request.rel_url.raw_query_string):
+                return error(400, 700002, "Signature for this request is not valid.")
+            if recv_window_check:
+                sent = int(request.query.get("timestamp", 0))
+                window = int(request.query.get("recvWindow", 5000))
+                if abs(time.time() * 1000 - sent) > window:
+                    return error(400, 700003, "Timestamp for this request is outside of the recvWindow.")
+            return await handler(request)
+        return wrapper
+
+    def market(request):
+        symbol = request.query.get("symbol")
+        if symbol not in exchange.markets:
+            raise web.HTTPBadRequest(text=json.dumps({"code": -1121, "msg": "Invalid symbol."}), content_type="application/json")
+        return symbol
+
+    async def server_time(request):
+        return web.json_response({"serverTime": int(time.time() * 1000)})
+
+    async def klines(request):
+        symbol = market(request)
+        if request.query.get("interval") != exchange.interval:
+            return error(400, -1120, "Invalid interval.")
+        q = request.query
+        rows = exchange.markets[symbol].klines(
+            int(q["startTime"]) if "startTime" in q else None,
+            int(q["endTime"]) if "endTime" in q else None,
+            min(int(q.get("limit", 500)), 1000)
+        )
+        return web.json_response(rows)
+
+    @signed
+    async def account(request):
+        engine = exchange.engine
+        assets = sorted(set(engine.free) | set(engine.locked))
+        return web.json_response({
+            "canTrade": True,
+            "balances": [
+                {"asset": a, "free": f"{engine.free.get(a, 0.0):.8f}", "locked": f"{engine.locked.get(a, 0.0):.8f}"}
+                for a in assets
+            ]
+        })
+
+    def place(symbol: str, params) -> dict:
+        if params.get("type", "LIMIT") != "LIMIT":
+            return {"code": -1116, "msg": "Invalid orderType."}
+        client_id = params.get("newClientOrderId")
+        if client_id and (symbol, client_id) in client_ids:
+            return {"code": -2010, "msg": "Duplicate order sent."}
+        side = "buy" if params.get("side") == "BUY" else "sell"
+        order_id = exchange.place(symbol, side, params.get("quantity", 0), params.get("price", 0))
+        if order_id is None:
+            return {"code": 30004, "msg": "Insufficient position"}
+        placed[order_id] = exchange.engine.orders[symbol][order_id]
+        if client_id:
+            client_ids[symbol, client_id] = order_id
+        return {**_order_json(symbol, placed[order_id]), "transactTime": int(time.time() * 1000)}
+
+    @signed
+    async def new_order(request):
+        result = place(market(request), request.query)
+        return web.json_response(result, status=400 if "code" in result else 200)
+
+    @signed
+    async def batch_orders(request):
+        try:
+            batch = json.loads(request.query.get("batchOrders", "[]"))
+        except ValueError:
+            return error(400, -1102, "Malformed batchOrders.")
+        if len(batch) > 20:
+            return error(400, -1102, "Too many orders in batch.")
+        results = []
+        for item in batch:
+            if item.get("symbol") not in exchange.markets:
+                results.append({"code": -1121, "msg": "Invalid symbol."})
+            else:
+                results.append(place(item["symbol"], item))
+        return web.json_response(results)
+
+    @signed
+    async def query_order(request):
+        symbol = market(request)
+        order_id = request.query.get("orderId") or client_ids.get((symbol, request.query.get("origClientOrderId")))
+        order = placed.get(order_id)
+        if order is None:
+            return error(400, -2013, "Order does not exist.")
+        if order_id in exchange.engine.orders.get(symbol, {}):
+            status = "NEW"
+        elif any(t["order_id"] == order_id for t in exchange.engine.trades.get(symbol, [])):
+            status = "FILLED"
+        else:
+            status = "CANCELED"
+        return web.json_response(_order_json(symbol, order, status))
+
+    @signed
+    async def open_orders(request):
+        symbol = market(request)
+        return web.json_response([_order_json(symbol, o) for o in exchange.engine.orders.get(symbol, {}).values()])
+
+    @signed
+    async def cancel_order(request):
+        symbol = market(request)
+        order_id = request.query.get("orderId", "")
+        order = exchange.engine.orders.get(symbol, {}).get(order_id)
+        if random.random() < faults.reject_cancel:
+            stats["rejected_cancels"] += 1
+            return error(400, -2011, "Unknown order sent.")
+        if order is None or not exchange.cancel(symbol, order_id):
+            return error(400, -2011, "Unknown order sent.")
+        return web.json_response(_order_json(symbol, order, "CANCELED"))
+
+    @signed
+    async def cancel_open_orders(request):
+        symbol = market(request)
+        orders = list(exchange.engine.orders.get(symbol, {}).values())
+        for order in orders:
+            exchange.cancel(symbol, order["order_id"])
+        return web.json_response([_order_json(symbol, o, "CANCELED") for o in orders])
+
+    @signed
+    async def my_trades(request):
+        symbol = market(request)
+        q = request.query
+        trades = exchange.engine.my_trades(symbol, int(q["startTime"]) if "startTime" in q else None, min(int(q.get("limit", 100)), 100))
+        return web.json_response([
+            {
+                "symbol": symbol,
+                "id": t["id"],
+                "orderId": t["order_id"],
+                "price": f"{t['price']:.8f}",
+                "qty": f"{t['quantity']:.8f}",
+                "quoteQty": f"{t['price'] * t['quantity']:.8f}",
+                "time": t["timestamp"],
+                "isBuyer": t["side"] == "buy",
+                "isMaker": True,
+            }
+            for t in trades
+        ])
+
+    @signed
+    async def create_listen_key(request):
+        return web.json_response({"listenKey": exchange.new_listen_key()})
+
+    @signed
+    async def keepalive_listen_key(request):
+        key = request.query.get("listenKey")
+        if key not in exchange.listen_keys:
+            return error(400, 730001, "Listen key not found.")
+        return web.json_response({"listenKey": key})
+
+    @signed
+    async def close_listen_key(request):
+        key = request.query.get("listenKey")
+        exchange.listen_keys.discard(key)
+        return web.json_response({"listenKey": key})
+
+    async def websocket(request):
+        listen_key = request.query.get("listenKey")
+        if listen_key is not None and listen_key not in exchange.listen_keys:
+            return web.Response(status=401, text="Invalid listen key")
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        subscription = exchange.subscribe(listen_key)
+
+        async def pump():
+            while True:
+                await ws.send_str(json.dumps(await subscription.queue.get()))
+
+        sender = asyncio.create_task(pump())
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                method = data.get("method")
+                if method == "PING":
+                    await ws.send_json({"id": 0, "code": 0, "msg": "PONG"})
+                elif method == "SUBSCRIPTION":
+                    channels = data.get("params", [])
+                    private = [c for c in channels if c.startswith("spot@private") and listen_key is None]
+                    subscription.channels.update(c for c in channels if c not in private)
+                    await ws.send_json({"id": data.get("id", 0), "code": 0, "msg": ",".join(channels)})
+                elif method == "UNSUBSCRIPTION":
+                    subscription.channels.difference_update(data.get("params", []))
+                    await ws.send_json({"id": data.get("id", 0), "code": 0, "msg": ",".join(data.get("params", []))})
+        finally:
+            sender.cancel()
+            exchange.unsubscribe(subscription)
+        return ws
+
+    async def sim_stats(request):
+        return web.json_response({
+            **stats,
+            "subscribers": len(exchange.subscribers),
+            "prices": {s: m.price for s, m in exchange.markets.items()},
+            "balances": exchange.engine.balances(),
+            "open_orders": sum(len(o) for o in exchange.engine.orders.values()),
+            "fills": sum(len(t) for t in exchange.engine.trades.values()),
+        })
+
+    async def on_startup(app):
+        exchange.start()
+
+    async def on_cleanup(app):
+        await exchange.stop()
+
+    app = web.Application(middlewares=[simulate_network])
+    app.router.add_get("/api/v3/time", server_time)
+    app.router.add_get("/api/v3/klines", klines)
+    app.router.add_get("/api/v3/account", account)
+    app.router.add_post("/api/v3/order", new_order)
+    app.router.add_get("/api/v3/order", query_order)
+    app.router.add_delete("/api/v3/order", cancel_order)
+    app.router.add_post("/api/v3/batchOrders", batch_orders)
+    app.router.add_get("/api/v3/openOrders", open_orders)
+    app.router.add_delete("/api/v3/openOrders", cancel_open_orders)
+    app.router.add_get("/api/v3/myTrades", my_trades)
+    app.router.add_post("/api/v3/userDataStream", create_listen_key)
+    app.router.add_put("/api/v3/userDataStream", keepalive_listen_key)
+    app.router.add_delete("/api/v3/userDataStream", close_listen_key)
+    app.router.add_get("/ws", websocket)
+    app.router.add_get("/sim/stats", sim_stats)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
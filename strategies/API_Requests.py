@@ -1,43 +1,260 @@
-import aiohttp
+import asyncio
+import json
 import logging
+import uuid
+import aiohttp
 from config import Config
+from strategies.http_client import HttpClient
+from strategies.rate_limit import Priority, RequestShed
 
 logger = logging.getLogger(__name__)
 
-async def get_klines_http(config: Config):
-    """Fetch Klines via HTTP."""
-    try:
-        url = f"https://api.mexc.com/api/v3/klines?symbol={config.SYMBOL}&interval={config.INTERVAL}&limit=50"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    klines = await response.json()
-                    return {
-                        "timestamp": klines[0][0],
-                        "klines": [[k[0], k[1], k[2], k[3], k[4], k[5], k[6], config.SYMBOL] for k in klines]
-                    }
-                logger.error(f"HTTP Klines error: {response.status}")
-                return None
+TRADES_PAGE = 100  # max rows myTrades returns per request
+
+def never_sent(error: Exception) -> bool:
+    """True when a request failed before it could reach the exchange, so sending it again cannot duplicate it."""
+    return isinstance(error, (RequestShed, aiohttp.ClientConnectorError))
+
+async def get_klines_http(http: HttpClient, config: Config, start_time: int = None, limit: int = 50, symbol: str = None):
+    """Fetch Klines via HTTP (default symbol: config.SYMBOL), optionally starting at an open time (ms)."""
+    symbol = symbol or config.SYMBOL
+    try:
+        params = {"symbol": symbol, "interval": config.INTERVAL, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = start_time
+        status, klines = await http.get("/api/v3/klines", params=params, priority=Priority.MARKET_DATA, weight=1)
+        if status == 200 and klines:
+            return {
+                "timestamp": klines[0][0],
+                "klines": [[k[0], k[1], k[2], k[3], k[4], k[5], k[6], symbol] for k in klines]
+            }
+        if status == 200:
+            logger.warning(f"No Klines returned from {start_time}")
+        else:
+            logger.error(f"HTTP Klines error: {status}")
+        return None
     except Exception as e:
         logger.error(f"HTTP Klines exception: {e}")
         return None
 
-async def get_balance_http(config: Config):
-    """Fetch balances via HTTP (placeholder)."""
-    logger.warning("HTTP balance not implemented, using SDK")
-    return None
+async def get_balance_http(http: HttpClient, config: Config):
+    """Fetch balances via signed HTTP."""
+    try:
+        status, account = await http.signed_request("GET", "/api/v3/account", priority=Priority.ACCOUNT, weight=10)
+        if status == 200:
+            balances = account.get("balances", [])
+            return {asset["asset"]: float(asset["free"]) for asset in balances if float(asset["free"]) > 0}
+        logger.error(f"HTTP balance error: {status} {account}")
+        return None
+    except Exception as e:
+        logger.error(f"HTTP balance exception: {e}")
+        return None
+
+async def place_order_http(http: HttpClient, config: Config, symbol: str, side: str, quantity: float, price: float):
+    """Place a limit order via signed HTTP.
+
+    Returns the order id; False when the exchange rejected the order or its
+    outcome could not be established; None only when the request never
+    reached the exchange and may be sent another way. A placement that timed
+    out or failed server-side is looked up by its client order id, never
+    resent.
+    """
+    client_order_id = uuid.uuid4().hex
+    params = {
+        "symbol": symbol,
+        "side": "BUY" if side == "buy" else "SELL",
+        "type": "LIMIT",
+        "quantity": str(quantity),
+        "price": str(price),
+        "newClientOrderId": client_order_id
+    }
+    try:
+        status, order = await http.signed_request("POST", "/api/v3/order", params, priority=Priority.ORDER, weight=1)
+    except Exception as e:
+        if never_sent(e):
+            logger.error(f"HTTP order not sent: {e}")
+            return None
+        logger.error(f"HTTP order exception: {e}")
+        return await find_order_id_http(http, config, symbol, client_order_id)
+    if status == 200:
+        logger.info(f"Order placed: {order}")
+        return order.get("orderId")
+    if status >= 500:
+        # 5XX: the exchange may or may not have executed it
+        logger.error(f"HTTP order error: {status} {order}")
+        return await find_order_id_http(http, config, symbol, client_order_id)
+    logger.error(f"HTTP order rejected: {status} {order}")
+    return False
+
+async def find_order_id_http(http: HttpClient, config: Config, symbol: str, client_order_id: str):
+    """Resolve a placement of unknown outcome by its client order id; returns the order id, or False when none is found."""
+    try:
+        status, order = await http.signed_request(
+            "GET", "/api/v3/order", {"symbol": symbol, "origClientOrderId": client_order_id}, priority=Priority.ORDER, weight=2
+        )
+    except Exception as e:
+        logger.error(f"HTTP order lookup exception for {client_order_id}: {e}")
+        return False
+    if status == 200 and isinstance(order, dict) and order.get("orderId"):
+        logger.info(f"Order {client_order_id} was placed: {order}")
+        return order["orderId"]
+    logger.error(f"Order {client_order_id} not found: {status} {order}")
+    return False
+
+async def query_open_orders_http(http: HttpClient, config: Config, symbol: str):
+    """Query open orders via signed HTTP."""
+    try:
+        status, orders = await http.signed_request("GET", "/api/v3/openOrders", {"symbol": symbol}, priority=Priority.ACCOUNT, weight=3)
+        if status == 200:
+            return [
+                {
+                    "order_id": order["orderId"],
+                    "side": "buy" if order["side"] == "BUY" else "sell",
+                    "price": float(order["price"]),
+                    "quantity": float(order["origQty"])
+                }
+                for order in orders
+            ]
+        logger.error(f"HTTP open orders error: {status} {orders}")
+        return None
+    except Exception as e:
+        logger.error(f"HTTP open orders exception: {e}")
+        return None
+
+async def cancel_order_http(http: HttpClient, config: Config, symbol: str, order_id: str):
+    """Cancel an order via signed HTTP.
+
+    Returns True once the order is gone, False when the exchange refused
+    the cancel, or None when it is unknown whether the request arrived;
+    cancelling twice is harmless, so None may be retried another way.
+    """
+    try:
+        status, body = await http.signed_request("DELETE", "/api/v3/order", {"symbol": symbol, "orderId": order_id}, priority=Priority.CANCEL, weight=1)
+    except Exception as e:
+        logger.error(f"HTTP cancel exception: {e}")
+        return None
+    if status == 200:
+        return True
+    if isinstance(body, dict) and body.get("code") == -2011:
+        logger.info(f"Order {order_id} already canceled")
+        return True
+    logger.error(f"HTTP cancel error: {status} {body}")
+    return None if status >= 500 else False
+
+async def get_trades_http(http: HttpClient, config: Config, symbol: str, limit: int = 100, priority: Priority = Priority.CHART, start_time: int = None):
+    """Fetch recent account trades via signed HTTP, optionally from a time (ms) onwards.
 
-async def place_order_http(config: Config, symbol: str, side: str, quantity: float, price: float):
-    """Place order via HTTP (placeholder)."""
-    logger.warning("HTTP order placement not implemented, using SDK")
-    return None
+    Raises RequestShed when the scheduler drops the request, so callers can
+    tell shedding from failure and not retry shed work another way.
+    """
+    try:
+        params = {"symbol": symbol, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = start_time
+        status, trades = await http.signed_request("GET", "/api/v3/myTrades", params, priority=priority, weight=10)
+        if status == 200:
+            return [
+                {
+                    "id": trade["id"],
+                    "order_id": trade["orderId"],
+                    "price": float(trade["price"]),
+                    "side": "buy" if trade["isBuyer"] else "sell",
+                    "timestamp": trade["time"],
+                    "quantity": float(trade["qty"])
+                }
+                for trade in trades
+            ]
+        logger.error(f"HTTP trades error: {status} {trades}")
+        return None
+    except RequestShed:
+        raise
+    except Exception as e:
+        logger.error(f"HTTP trades exception: {e}")
+        return None
 
-async def query_open_orders_http(config: Config, symbol: str):
-    """Query open orders via HTTP (placeholder)."""
-    logger.warning("HTTP open orders not implemented, using SDK")
-    return None
+async def cancel_all_orders_http(http: HttpClient, config: Config, symbol: str):
+    """Cancel every open order on a symbol in one signed request.
 
-async def cancel_order_http(config: Config, symbol: str, order_id: str):
-    """Cancel order via HTTP (placeholder)."""
-    logger.warning("HTTP cancel order not implemented, using SDK")
-    return None
+    Returns the cancelled ids, False when the exchange refused, or None
+    when it is unknown whether the request arrived.
+    """
+    try:
+        status, body = await http.signed_request("DELETE", "/api/v3/openOrders", {"symbol": symbol}, priority=Priority.CANCEL, weight=1)
+    except Exception as e:
+        logger.error(f"HTTP cancel-all exception: {e}")
+        return None
+    if status == 200:
+        return [order["orderId"] for order in body]
+    logger.error(f"HTTP cancel-all error: {status} {body}")
+    return None if status >= 500 else False
+
+async def place_batch_orders_http(http: HttpClient, config: Config, symbol: str, orders: list):
+    """Place up to 20 limit orders in one signed request; returns one orderId (or None) per order.
+
+    Like place_order_http: False when the exchange rejected the whole batch,
+    None only when the request never reached it. After a timeout or 5XX
+    each order is looked up by its client order id.
+    """
+    batch = [
+        {
+            "symbol": symbol,
+            "side": "BUY" if o["side"] == "buy" else "SELL",
+            "type": "LIMIT",
+            "quantity": str(o["quantity"]),
+            "price": str(o["price"]),
+            "newClientOrderId": uuid.uuid4().hex
+        }
+        for o in orders
+    ]
+    try:
+        status, body = await http.signed_request(
+            "POST", "/api/v3/batchOrders", {"batchOrders": json.dumps(batch, separators=(",", ":"))}, priority=Priority.ORDER, weight=1
+        )
+    except Exception as e:
+        if never_sent(e):
+            logger.error(f"HTTP batch order not sent: {e}")
+            return None
+        logger.error(f"HTTP batch order exception: {e}")
+        status, body = None, None
+    if status == 200 and isinstance(body, list):
+        return [item.get("orderId") for item in body]
+    if status is None or status >= 500:
+        if status is not None:
+            logger.error(f"HTTP batch order error: {status} {body}")
+        found = await asyncio.gather(*(find_order_id_http(http, config, symbol, item["newClientOrderId"]) for item in batch))
+        return [order_id or None for order_id in found]
+    logger.error(f"HTTP batch order rejected: {status} {body}")
+    return False
+
+async def create_listen_key_http(http: HttpClient, config: Config):
+    """Open a user-data stream and return its listen key."""
+    try:
+        status, body = await http.signed_request("POST", "/api/v3/userDataStream", priority=Priority.ACCOUNT, weight=1)
+        if status == 200:
+            return body.get("listenKey")
+        logger.error(f"HTTP listen key error: {status} {body}")
+        return None
+    except Exception as e:
+        logger.error(f"HTTP listen key exception: {e}")
+        return None
+
+async def keepalive_listen_key_http(http: HttpClient, config: Config, listen_key: str):
+    """Extend a listen key's validity by 60 minutes."""
+    try:
+        status, body = await http.signed_request("PUT", "/api/v3/userDataStream", {"listenKey": listen_key}, priority=Priority.ACCOUNT, weight=1)
+        if status == 200:
+            return True
+        logger.error(f"HTTP listen key keepalive error: {status} {body}")
+        return False
+    except Exception as e:
+        logger.error(f"HTTP listen key keepalive exception: {e}")
+        return False
+
+async def close_listen_key_http(http: HttpClient, config: Config, listen_key: str):
+    """Close a user-data stream."""
+    try:
+        status, body = await http.signed_request("DELETE", "/api/v3/userDataStream", {"listenKey": listen_key}, priority=Priority.ACCOUNT, weight=1)
+        return status == 200
+    except Exception as e:
+        logger.error(f"HTTP listen key close exception: {e}")
+        return False
@@ -1,6 +1,8 @@
 import logging
-from mexc_sdk import Spot
+import uuid
 import pkg_resources
+from strategies.sdk_executor import SdkExecutor, SdkTimeout
+from strategies.rate_limit import Priority
 
 logger = logging.getLogger(__name__)
 
@@ -11,10 +13,10 @@ try:
 except Exception as e:
     logger.warning(f"Could not determine MEXC SDK version: {e}")
 
-async def get_klines_sdk(client: Spot, symbol: str, interval: str, limit: int = 50):
+async def get_klines_sdk(sdk: SdkExecutor, symbol: str, interval: str, limit: int = 50):
     """Fetch Klines using SDK."""
     try:
-        klines = client.klines(symbol=symbol, interval=interval, limit=limit)
+        klines = await sdk.call("klines", symbol=symbol, interval=interval, limit=limit, priority=Priority.MARKET_DATA, weight=1)
         logger.info(f"Fetched {len(klines)} klines for {symbol}")
         return {
             "timestamp": klines[0][0],
@@ -33,12 +35,12 @@ async def get_klines_sdk(client: Spot, symbol: str, interval: str, limit: int =
         logger.error(f"SDK Klines error: {e}")
         return None
 
-async def get_balance_sdk(client: Spot, retries: int = 3, delay: float = 2.0):
+async def get_balance_sdk(sdk: SdkExecutor, retries: int = 3, delay: float = 2.0):
     """Fetch account balances using SDK with retry logic."""
     import asyncio
     for attempt in range(retries):
         try:
-            account = client.account_info()
+            account = await sdk.call("account_info", priority=Priority.ACCOUNT, weight=10)
             balances = account.get("balances", [])
             return {asset["asset"]: float(asset["free"]) for asset in balances if float(asset["free"]) > 0}
         except Exception as e:
@@ -48,27 +50,56 @@ async def get_balance_sdk(client: Spot, retries: int = 3, delay: float = 2.0):
     logger.error("Failed to fetch balances after retries")
     return {}
 
-async def place_order_sdk(client: Spot, symbol: str, side: str, quantity: float, price: float):
-    """Place an order using SDK."""
+async def place_order_sdk(sdk: SdkExecutor, symbol: str, side: str, quantity: float, price: float):
+    """Place an order using SDK.
+
+    Returns the order id; None when the call timed out before a worker ran
+    it; False when the order could not be found by its client order id
+    after an error or a timeout mid-call, since the worker may still have
+    placed it.
+    """
+    client_order_id = uuid.uuid4().hex
     try:
         # Use correct keyword 'order_type' instead of 'type'
-        order = client.new_order(
+        order = await sdk.call(
+            "new_order",
             symbol=symbol,
             side="BUY" if side == "buy" else "SELL",
             order_type="LIMIT",
             quantity=str(quantity),
-            price=str(price)
+            price=str(price),
+            newClientOrderId=client_order_id,
+            priority=Priority.ORDER,
+            weight=1
         )
         logger.info(f"Order placed: {order}")
         return order.get("orderId")
+    except SdkTimeout as e:
+        if not e.started:
+            logger.error(f"SDK order not sent: {e}")
+            return None
+        logger.error(f"SDK order outcome unknown: {e}")
     except Exception as e:
         logger.error(f"SDK order error: {str(e)}")
-        return None
+    return await find_order_id_sdk(sdk, symbol, client_order_id)
+
+async def find_order_id_sdk(sdk: SdkExecutor, symbol: str, client_order_id: str):
+    """Resolve a placement of unknown outcome by its client order id; returns the order id, or False when none is found."""
+    try:
+        order = await sdk.call("query_order", symbol, origClientOrderId=client_order_id, priority=Priority.ORDER, weight=2)
+    except Exception as e:
+        logger.error(f"SDK order lookup error for {client_order_id}: {e}")
+        return False
+    if isinstance(order, dict) and order.get("orderId"):
+        logger.info(f"Order {client_order_id} was placed: {order}")
+        return order["orderId"]
+    logger.error(f"Order {client_order_id} not found: {order}")
+    return False
 
-async def query_open_orders_sdk(client: Spot, symbol: str):
-    """Query open orders using SDK."""
+async def query_open_orders_sdk(sdk: SdkExecutor, symbol: str):
+    """Query open orders using SDK; None on failure, which is not the same as no orders."""
     try:
-        orders = client.open_orders(symbol)
+        orders = await sdk.call("open_orders", symbol, priority=Priority.ACCOUNT, weight=3)
         return [
             {
                 "order_id": order["orderId"],
@@ -80,12 +111,12 @@ async def query_open_orders_sdk(client: Spot, symbol: str):
         ]
     except Exception as e:
         logger.error(f"SDK open orders error: {e}")
-        return []
+        return None
 
-async def cancel_order_sdk(client: Spot, symbol: str, order_id: str):
+async def cancel_order_sdk(sdk: SdkExecutor, symbol: str, order_id: str):
     """Cancel an order using SDK."""
     try:
-        client.cancel_order(symbol, order_id)
+        await sdk.call("cancel_order", symbol, order_id, priority=Priority.CANCEL, weight=1)
         return True
     except Exception as e:
         if "-2011" in str(e):
@@ -93,3 +124,31 @@ async def cancel_order_sdk(client: Spot, symbol: str, order_id: str):
             return True
         logger.error(f"SDK cancel error: {e}")
         return False
+
+async def get_trades_sdk(sdk: SdkExecutor, symbol: str, limit: int = 100, priority: Priority = Priority.CHART):
+    """Fetch recent account trades using SDK."""
+    try:
+        trades = await sdk.call("account_trade_list", symbol, limit=limit, priority=priority, weight=10)
+        return [
+            {
+                "id": trade["id"],
+                "order_id": trade["orderId"],
+                "price": float(trade["price"]),
+                "side": "buy" if trade["isBuyer"] else "sell",
+                "timestamp": trade["time"],
+                "quantity": float(trade["qty"])
+            }
+            for trade in trades
+        ]
+    except Exception as e:
+        logger.error(f"SDK trades error: {e}")
+        return []
+
+async def cancel_all_orders_sdk(sdk: SdkExecutor, symbol: str):
+    """Cancel every open order on a symbol using SDK."""
+    try:
+        orders = await sdk.call("cancel_open_orders", symbol, priority=Priority.CANCEL, weight=1)
+        return [order["orderId"] for order in orders]
+    except Exception as e:
+        logger.error(f"SDK cancel-all error: {e}")
+        return None
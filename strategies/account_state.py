@@ -0,0 +1,111 @@
+import time
+from collections import deque
+from strategies.fill_store import FillStore
+
+class AccountState:
+    """Local cache of balances, open orders and fills.
+
+    Filled from periodic REST snapshots and kept current between them by
+    the user-data stream and our own order acknowledgements, so reads
+    never touch the network.
+    """
+
+    def __init__(self, fill_dir: str = None):
+        self.fill_dir = fill_dir  # where fill stores persist; None keeps them in memory
+        self.free = {}  # asset -> free balance
+        self.locked = {}  # asset -> locked balance
+        self.orders = {}  # symbol -> {order_id: order dict}
+        self.fills = {}  # symbol -> FillStore
+        self.balances_synced = 0.0  # monotonic time of the last REST snapshot
+        self.orders_synced = {}
+        self.fills_synced = {}
+        # Orders the stream reported closed before our own ack arrived
+        self._closed = deque(maxlen=256)
+
+    # Reads
+
+    def balances(self) -> dict:
+        """Free balances above zero, in the shape get_balances returns."""
+        return {asset: free for asset, free in self.free.items() if free > 0}
+
+    def open_orders(self, symbol: str) -> list:
+        return [dict(o) for o in self.orders.get(symbol, {}).values()]
+
+    def committed_buys(self) -> float:
+        """Quote funds held by our open buys on every symbol."""
+        return sum(
+            float(o["price"]) * float(o["quantity"])
+            for book in self.orders.values() for o in book.values() if o["side"] == "buy"
+        )
+
+    def fill_store(self, symbol: str) -> FillStore:
+        if symbol not in self.fills:
+            self.fills[symbol] = FillStore(self.fill_dir, symbol)
+        return self.fills[symbol]
+
+    def recent_fills(self, symbol: str, limit: int = 100) -> list:
+        return self.fill_store(symbol).recent(limit)
+
+    def balances_age(self) -> float:
+        return time.monotonic() - self.balances_synced
+
+    def orders_age(self, symbol: str) -> float:
+        return time.monotonic() - self.orders_synced.get(symbol, 0.0)
+
+    def fills_age(self, symbol: str) -> float:
+        return time.monotonic() - self.fills_synced.get(symbol, 0.0)
+
+    # REST snapshots
+
+    def set_balances(self, balances: dict):
+        self.free = dict(balances)
+        self.balances_synced = time.monotonic()
+
+    def set_open_orders(self, symbol: str, orders: list):
+        self.orders[symbol] = {str(o["order_id"]): dict(o) for o in orders}
+        self.orders_synced[symbol] = time.monotonic()
+
+    def mark_fills_synced(self, symbol: str):
+        self.fills_synced[symbol] = time.monotonic()
+
+    # User-data stream events
+
+    def apply_balance(self, asset: str, free: float, locked: float):
+        self.free[asset] = free
+        self.locked[asset] = locked
+
+    def apply_order(self, symbol: str, order: dict, status: int):
+        """Upsert or drop an order (status 1 new, 2 filled, 3 partially filled, 4/5 cancelled)."""
+        book = self.orders.setdefault(symbol, {})
+        order_id = str(order["order_id"])
+        if status in (1, 3):
+            book[order_id] = order
+        else:
+            book.pop(order_id, None)
+            self._closed.append(order_id)
+
+    def apply_fill(self, symbol: str, fill: dict):
+        self.fill_store(symbol).add([fill])
+
+    # Our own acknowledgements
+
+    def on_placed(self, symbol: str, order: dict, quote_asset: str = None):
+        """Record an acknowledged placement; with quote_asset, also move its cost from free to locked."""
+        order_id = str(order["order_id"])
+        if order_id in self._closed:
+            return
+        price, quantity = float(order["price"]), float(order["quantity"])
+        self.orders.setdefault(symbol, {})[order_id] = {
+            "order_id": order["order_id"], "side": order["side"], "price": price, "quantity": quantity
+        }
+        if quote_asset and order["side"] == "buy":
+            self.free[quote_asset] = self.free.get(quote_asset, 0.0) - price * quantity
+            self.locked[quote_asset] = self.locked.get(quote_asset, 0.0) + price * quantity
+
+    def on_cancelled(self, symbol: str, order_id, quote_asset: str = None):
+        """Record an acknowledged cancel; with quote_asset, also release its funds."""
+        order = self.orders.get(symbol, {}).pop(str(order_id), None)
+        if order is not None and quote_asset and order["side"] == "buy":
+            cost = order["price"] * order["quantity"]
+            self.free[quote_asset] = self.free.get(quote_asset, 0.0) + cost
+            self.locked[quote_asset] = max(self.locked.get(quote_asset, 0.0) - cost, 0.0)
@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+from config import Config
+from strategies.kline_archive import KlineArchive
+from strategies.kline_store import KlineStore, COLUMNS
+from strategies.matching import MatchingEngine, split_symbol
+from strategies.order_pipeline import OrderPipeline
+from strategies.rate_limit import TokenBucket
+from strategies.scanner import Scanner
+from strategies.snapshot import MarketSnapshot
+
+logger = logging.getLogger(__name__)
+
+class SimulatedFeeder:
+    """Feeder stand-in backed by a MatchingEngine and replayed klines.
+
+    It answers the same calls strategies make on the real Feeder and routes
+    order refreshes through the real OrderPipeline, minus the rate limit.
+    """
+
+    def __init__(self, config: Config, engine: MatchingEngine):
+        self.config = config
+        self.engine = engine
+        self.klines = {symbol: KlineStore(symbol, config.KLINE_WINDOW) for symbol in config.SYMBOLS}
+        self.now = 0  # replay clock (ms)
+        self.orders = OrderPipeline(self, config)
+        self.orders.bucket = TokenBucket(math.inf, math.inf)
+
+    async def get_klines(self, symbol: str = None):
+        store = self.klines[symbol or self.config.SYMBOL]
+        return store.view() if len(store) else None
+
+    async def get_balances(self):
+        return self.engine.balances()
+
+    async def query_open_orders(self, symbol: str):
+        return self.engine.open_orders(symbol)
+
+    async def get_trades(self, symbol: str, limit: int = 100):
+        return self.engine.my_trades(symbol, limit=limit)
+
+    async def place_order(self, symbol: str, side: str, quantity, price):
+        return self.engine.place(symbol, side, quantity, price, self.now)
+
+    async def cancel_order(self, symbol: str, order_id):
+        return self.engine.cancel(symbol, order_id) or None
+
+    async def cancel_all_orders(self, symbol: str):
+        return self.engine.cancel_all(symbol)
+
+    async def place_batch_orders(self, symbol: str, orders: list):
+        return [self.engine.place(symbol, o["side"], o["quantity"], o["price"], self.now) for o in orders]
+
+    async def execute_orders(self, symbol: str, cancels: list, places: list, available, cancel_all: bool = False):
+        return await self.orders.execute(symbol, cancels, places, available, cancel_all)
+
+    async def get_snapshot(self, symbol: str = None):
+        symbol = symbol or self.config.SYMBOL
+        klines = await self.get_klines(symbol)
+        if klines is None:
+            return None
+        start = int(klines.open_time[0])
+        fills = [t for t in self.engine.trades.get(symbol, []) if t["timestamp"] >= start]
+        committed = sum(o["price"] * o["quantity"] for book in self.engine.orders.values() for o in book.values() if o["side"] == "buy")
+        return MarketSnapshot.build(symbol, self.now, klines, self.engine.balances(), self.engine.open_orders(symbol), fills, committed)
+
+async def replay(config: Config, records: dict, balances: dict, fee_rate: float = 0.0, dynamic_dir: Path = None) -> dict:
+    """Replay archived candles ({symbol: RECORD_DTYPE array}) through Scanner and strategies.
+
+    At each candle, resting orders are matched against its high/low first;
+    then the candle is appended and the symbol's strategy reacts to it, so
+    orders can only fill on later candles.
+    """
+    engine = MatchingEngine(balances, fee_rate)
+    feeder = SimulatedFeeder(config, engine)
+    scanners = {symbol: Scanner(config) for symbol in records}
+    for scanner in scanners.values():
+        await scanner.initialize_strategies()
+
+    # Merge every symbol's candles into one timeline
+    symbols = list(records)
+    times = np.concatenate([records[s]["open_time"] for s in symbols])
+    owner = np.concatenate([np.full(len(records[s]), i) for i, s in enumerate(symbols)])
+    row = np.concatenate([np.arange(len(records[s])) for s in symbols])
+    order = np.argsort(times, kind="stable")
+    columns = {s: {name: np.ascontiguousarray(records[s][name]) for name in COLUMNS} for s in symbols}
+
+    first_prices = {s: float(records[s]["open"][0]) for s in symbols if len(records[s])}
+    start_equity = engine.equity(first_prices)
+    switches = 0
+    selected = {}
+    tmp = None
+    if dynamic_dir is None:
+        # Strategies write their order log every tick; keep that off the disk when possible
+        tmp = tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+        dynamic_dir = Path(tmp.name)
+
+    started = time.perf_counter()
+    try:
+        for k in order:
+            symbol = symbols[owner[k]]
+            i = row[k]
+            cols = columns[symbol]
+            feeder.now = int(cols["close_time"][i])
+            engine.match(symbol, float(cols["low"][i]), float(cols["high"][i]), int(cols["open_time"][i]))
+            feeder.klines[symbol].update_columns({name: col[i:i + 1] for name, col in cols.items()})
+
+            snapshot = await feeder.get_snapshot(symbol)
+            strategy = await scanners[symbol].select_strategy(snapshot.klines)
+            if strategy is None:
+                continue
+            if selected.get(symbol) is not strategy:
+                switches += symbol in selected
+                selected[symbol] = strategy
+            await strategy.manage_orders(feeder, config, dynamic_dir, snapshot)
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+    elapsed = time.perf_counter() - started
+
+    last_prices = {s: float(records[s]["close"][-1]) for s in symbols if len(records[s])}
+    end_equity = engine.equity(last_prices)
+    fills = [t for s in symbols for t in engine.trades.get(s, [])]
+    return {
+        "symbols": symbols,
+        "events": len(order),
+        "elapsed_s": round(elapsed, 3),
+        "events_per_sec": round(len(order) / elapsed, 1) if elapsed else None,
+        "fills": len(fills),
+        "buys": sum(1 for t in fills if t["side"] == "buy"),
+        "sells": sum(1 for t in fills if t["side"] == "sell"),
+        "volume": round(sum(t["price"] * t["quantity"] for t in fills), 8),
+        "fees": round(engine.fees_paid, 8),
+        "strategy_switches": switches,
+        "open_orders": sum(len(engine.open_orders(s)) for s in symbols),
+        "start_equity": round(start_equity, 8),
+        "end_equity": round(end_equity, 8),
+        "pnl": round(end_equity - start_equity, 8),
+        "pnl_pct": round((end_equity / start_equity - 1) * 100, 4) if start_equity else None,
+        "balances": {a: round(engine.free.get(a, 0.0) + engine.locked.get(a, 0.0), 8) for a in set(engine.free) | set(engine.locked)},
+    }
+
+def load_records(config: Config, symbols: list, start: int = None, end: int = None) -> dict:
+    """Read each symbol's archived candles in [start, end)."""
+    records = {}
+    for symbol in symbols:
+        data = KlineArchive(config.ARCHIVE_DIR, symbol, config.INTERVAL, config.ARCHIVE_SEGMENT_ROWS).read(start, end)
+        if not len(data):
+            raise ValueError(f"No archived {config.INTERVAL} klines for {symbol} in {config.ARCHIVE_DIR}")
+        records[symbol] = data
+    return records
+
+def _run_job(job):
+    """Sweep worker: one replay with config overrides, in its own process."""
+    overrides, symbols, start, end, balances, fee_rate = job
+    logging.getLogger().setLevel(logging.WARNING)
+    config = Config()
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    config.SYMBOLS = symbols
+    records = load_records(config, symbols, start, end)
+    report = asyncio.run(replay(config, records, balances, fee_rate))
+    return overrides, report
+
+def sweep(grid: dict, symbols: list, start: int = None, end: int = None, balances: dict = None, fee_rate: float = 0.0, processes: int = None):
+    """Replay every combination of config overrides in grid ({name: [values]}) across processes.
+
+    Yields (overrides, report) as each run finishes.
+    """
+    names = list(grid)
+    jobs = [
+        (dict(zip(names, values)), symbols, start, end, balances, fee_rate)
+        for values in itertools.product(*(grid[n] for n in names))
+    ]
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(_run_job, jobs)
+
+def _parse_time(value: str):
+    if value is None:
+        return None
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+def _parse_value(value: str):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+if __name__ == "__main__":
+    config = Config()
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Replay archived klines through the Scanner and strategies")
+    parser.add_argument("--symbol", action="append", help="symbol to replay (repeatable; default: Config.SYMBOLS)")
+    parser.add_argument("--start", help="UTC start, e.g. 2025-01-01 or 2025-01-01T12:00")
+    parser.add_argument("--end", help="UTC end (exclusive)")
+    parser.add_argument("--balance", action="append", default=[], help="starting balance ASSET=AMOUNT (default USDT=1000)")
+    parser.add_argument("--fee", type=float, default=0.0, help="fee rate per fill, e.g. 0.001")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2", help="config override; several values make a sweep")
+    parser.add_argument("--processes", type=int, default=None, help="sweep worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    symbols = args.symbol or list(config.SYMBOLS)
+    balances = {"USDT": 1000.0}
+    for item in args.balance:
+        asset, amount = item.split("=", 1)
+        balances[asset] = float(amount)
+    for symbol in symbols:
+        balances.setdefault(split_symbol(symbol)[0], 0.0)
+    grid = {}
+    for item in args.set:
+        name, values = item.split("=", 1)
+        grid[name] = [_parse_value(v) for v in values.split(",")]
+    start, end = _parse_time(args.start), _parse_time(args.end)
+
+    if any(len(v) > 1 for v in grid.values()):
+        for overrides, report in sweep(grid, symbols, start, end, balances, args.fee, args.processes):
+            print(json.dumps({"overrides": overrides, **report}))
+    else:
+        for name, values in grid.items():
+            setattr(config, name, values[0])
+        config.SYMBOLS = symbols
+        report = asyncio.run(replay(config, load_records(config, symbols, start, end), balances, args.fee))
+        print(json.dumps(report, indent=2))
@@ -1,49 +1,238 @@
+import asyncio
 import logging
+import time
+from urllib.parse import urlparse
 from mexc_sdk import Spot
 from config import Config
-from strategies.API_Requests import get_klines_http, get_balance_http, place_order_http, query_open_orders_http, cancel_order_http
-from strategies.API_SDK_Tools import get_klines_sdk, get_balance_sdk, place_order_sdk, query_open_orders_sdk, cancel_order_sdk
+from strategies.API_Requests import get_balance_http, place_order_http, query_open_orders_http, cancel_order_http, cancel_all_orders_http, TRADES_PAGE, place_batch_orders_http
+from strategies.API_SDK_Tools import get_klines_sdk, get_balance_sdk, place_order_sdk, query_open_orders_sdk, cancel_order_sdk, get_trades_sdk, cancel_all_orders_sdk
+from strategies.http_client import HttpClient
+from strategies.sdk_executor import SdkExecutor
+from strategies.market_stream import KlineStream, backfill_klines
+from strategies.kline_store import KlineStore
+from strategies.snapshot import MarketSnapshot
+from strategies.order_pipeline import OrderPipeline
+from strategies.rate_limit import Priority, RequestShed, WeightScheduler
+from strategies.account_state import AccountState
+from strategies.fill_store import sync_fills
+from strategies.user_stream import UserDataStream
 
 logger = logging.getLogger(__name__)
 
+QUOTE_ASSET = "USDT"  # funds locked by our buy orders
+FILLS_PRIORITY = Priority.CHART  # fills only draw the chart; strategies size from balances and open orders
+PRODUCTION_HOST = "api.mexc.com"  # mexc_sdk always talks to this host, whatever BASE_URL says
+
 class Feeder:
     def __init__(self, config: Config):
         self.config = config
         self.client = Spot(api_key=config.API_KEY, api_secret=config.API_SECRET)
+        # One weight budget shared by every HTTP and SDK call
+        self.scheduler = WeightScheduler(config)
+        self.http = HttpClient(config, self.scheduler)
+        self.sdk = SdkExecutor(self.client, config, self.scheduler)
+        self.sdk_fallback = config.SDK_FALLBACK
+        if self.sdk_fallback is None:
+            self.sdk_fallback = urlparse(config.BASE_URL).hostname == PRODUCTION_HOST
+        if not self.sdk_fallback:
+            logger.info(f"SDK fallback disabled for {config.BASE_URL}")
+        self.symbols = list(config.SYMBOLS)
+        self.klines = {symbol: KlineStore(symbol, config.KLINE_WINDOW) for symbol in self.symbols}
+        self.stream = None
+        self.listeners = []  # callback(symbol) run on every stream push; symbol None means all
+        self._balances_task = None
+        self.account = AccountState(config.FILL_DIR)
+        self.user_stream = None
+        self.orders = OrderPipeline(self, config)
+
+    def start_stream(self):
+        """Switch Klines for every symbol to one WebSocket stream; REST stays the fallback."""
+        if self.stream is None:
+            self.stream = KlineStream(self.http, self.config, self.klines, on_update=self.notify)
+            self.stream.start()
+
+    def start_user_stream(self):
+        """Keep balances, open orders and fills current from the user-data stream."""
+        if self.user_stream is None:
+            self.user_stream = UserDataStream(self.http, self.config, self.account, on_connect=self.sync_account, on_update=self.notify)
+            self.user_stream.start()
+
+    def _sdk_allowed(self, what: str) -> bool:
+        """True when a failed HTTP call may be retried through the SDK; logs the skipped retry otherwise."""
+        if not self.sdk_fallback:
+            logger.warning(f"HTTP {what} failed, SDK fallback disabled")
+        return self.sdk_fallback
+
+    def notify(self, symbol: str = None):
+        """Tell listeners a stream changed a symbol's data (None: account-wide)."""
+        for listener in self.listeners:
+            listener(symbol)
+
+    def is_streaming(self, symbol: str) -> bool:
+        """True while the kline stream keeps the symbol current."""
+        return self.stream is not None and self.stream.is_fresh(symbol)
 
-    async def get_klines(self):
-        """Fetch Klines, preferring HTTP."""
-        result = await get_klines_http(self.config)
-        return result if result else await get_klines_sdk(self.client, self.config.SYMBOL, self.config.INTERVAL)
+    async def sync_account(self):
+        """Reconcile the account cache with a REST snapshot."""
+        await asyncio.gather(
+            self._fetch_balances(),
+            *(self._fetch_open_orders(symbol) for symbol in self.symbols),
+            *(self._fetch_trades(symbol) for symbol in self.symbols)
+        )
+
+    def _account_live(self, age: float) -> bool:
+        """True when the stream keeps the cache current and its last REST snapshot is recent enough."""
+        return (
+            self.user_stream is not None
+            and self.user_stream.connected
+            and age < self.config.ACCOUNT_RECONCILE_INTERVAL
+        )
+
+    def _quote_asset(self):
+        # Without the stream we account for our own order acks; with it, pushed balances are authoritative
+        return None if self.user_stream is not None and self.user_stream.connected else QUOTE_ASSET
+
+    async def close(self):
+        """Stop streams and release pooled HTTP connections and the SDK thread pool."""
+        if self.stream is not None:
+            await self.stream.stop()
+        if self.user_stream is not None:
+            await self.user_stream.stop()
+        await self.http.close()
+        self.sdk.shutdown()
+
+    async def get_klines(self, symbol: str = None):
+        """Refresh a symbol's kline store, preferring the live stream, then HTTP; return a view."""
+        symbol = symbol or self.config.SYMBOL
+        store = self.klines[symbol]
+        if not self.is_streaming(symbol):
+            if await backfill_klines(self.http, self.config, store) is None and self._sdk_allowed("klines"):
+                result = await get_klines_sdk(self.sdk, symbol, self.config.INTERVAL, min(self.config.KLINE_WINDOW, 1000))
+                if result:
+                    store.update(result["klines"])
+        return store.view() if len(store) else None
 
     async def get_balances(self):
+        """Return free balances from the account cache, fetching them when it is not live.
+
+        Balances are account-wide, so symbols asking at the same time share
+        one request.
+        """
+        if self._account_live(self.account.balances_age()):
+            return self.account.balances()
+        if self._balances_task is None or self._balances_task.done():
+            self._balances_task = asyncio.ensure_future(self._fetch_balances())
+        # Shielded so one symbol timing out does not cancel the others' fetch
+        return dict(await asyncio.shield(self._balances_task))
+
+    async def _fetch_balances(self):
         """Fetch balances, preferring HTTP."""
-        result = await get_balance_http(self.config)
+        result = await get_balance_http(self.http, self.config)
         if result is None:
+            if not self._sdk_allowed("balances"):
+                return {}
             try:
-                result = await get_balance_sdk(self.client)
+                result = await get_balance_sdk(self.sdk)
             except Exception as e:
                 logger.error(f"Failed to fetch balances: {e}")
-                result = {}
+                return {}
+        self.account.set_balances(result)
         return result
 
     async def place_order(self, symbol: str, side: str, quantity: float, price: float):
-        """Place order, preferring HTTP."""
-        result = await place_order_http(self.config, symbol, side, quantity, price)
-        return result if result else await place_order_sdk(self.client, symbol, side, quantity, price)
+        """Place order, preferring HTTP; the SDK only sends orders the HTTP request never delivered."""
+        result = await place_order_http(self.http, self.config, symbol, side, quantity, price)
+        if result is None and self._sdk_allowed("order"):
+            result = await place_order_sdk(self.sdk, symbol, side, quantity, price)
+        return result
 
     async def query_open_orders(self, symbol: str):
-        """Query open orders, preferring HTTP."""
-        result = await query_open_orders_http(self.config, symbol)
+        """Return open orders from the account cache, fetching them when it is not live; None if that fetch failed."""
+        if self._account_live(self.account.orders_age(symbol)):
+            return self.account.open_orders(symbol)
+        return await self._fetch_open_orders(symbol)
+
+    async def _fetch_open_orders(self, symbol: str):
+        """Query open orders, preferring HTTP; None when neither route answered, and the cache keeps its last book."""
+        result = await query_open_orders_http(self.http, self.config, symbol)
         if result is None:
+            if not self._sdk_allowed("open orders"):
+                return None
             try:
-                result = await query_open_orders_sdk(self.client, symbol)
+                result = await query_open_orders_sdk(self.sdk, symbol)
             except Exception as e:
                 logger.error(f"Failed to query open orders: {e}")
-                result = []
+                return None
+            if result is None:
+                return None
+        self.account.set_open_orders(symbol, result)
         return result
 
     async def cancel_order(self, symbol: str, order_id: str):
-        """Cancel order, preferring HTTP."""
-        result = await cancel_order_http(self.config, symbol, order_id)
-        return result if result else await cancel_order_sdk(self.client, symbol, order_id)
+        """Cancel order, preferring HTTP; a cancel the exchange refused is not retried."""
+        result = await cancel_order_http(self.http, self.config, symbol, order_id)
+        if result is None and self._sdk_allowed("cancel"):
+            result = await cancel_order_sdk(self.sdk, symbol, order_id)
+        return result
+
+    async def cancel_all_orders(self, symbol: str):
+        """Cancel all open orders on a symbol, preferring HTTP; returns cancelled ids, or None/False on failure."""
+        result = await cancel_all_orders_http(self.http, self.config, symbol)
+        if result is None and self._sdk_allowed("cancel-all"):
+            result = await cancel_all_orders_sdk(self.sdk, symbol)
+        return result
+
+    async def place_batch_orders(self, symbol: str, orders: list):
+        """Place several orders in one request; None when it was never sent (the SDK has no batch call), False when rejected."""
+        return await place_batch_orders_http(self.http, self.config, symbol, orders)
+
+    async def execute_orders(self, symbol: str, cancels: list, places: list, available, cancel_all: bool = False):
+        """Run an order refresh through the concurrent pipeline and return its OrderReport."""
+        report = await self.orders.execute(symbol, cancels, places, available, cancel_all)
+        quote = self._quote_asset()
+        for order_id in report.cancelled:
+            self.account.on_cancelled(symbol, order_id, quote)
+        for order in report.placed:
+            self.account.on_placed(symbol, order, quote)
+        return report
+
+    async def get_trades(self, symbol: str, limit: int = 100):
+        """Return recent account trades from the fill store, syncing its delta when due."""
+        age = self.account.fills_age(symbol)
+        if not self._account_live(age) and age >= self.config.FILL_SYNC_INTERVAL:
+            await self._fetch_trades(symbol)
+        return self.account.recent_fills(symbol, limit)
+
+    async def _fetch_trades(self, symbol: str):
+        """Pull fills newer than the store's cursor, preferring HTTP; a shed sync waits for the next tick."""
+        store = self.account.fill_store(symbol)
+        try:
+            synced = await sync_fills(self.http, self.config, store, priority=FILLS_PRIORITY)
+        except RequestShed as e:
+            logger.info(f"{symbol} fill sync shed: {e}")
+            return
+        if synced is None and self._sdk_allowed("trades"):
+            store.add(await get_trades_sdk(self.sdk, symbol, TRADES_PAGE, FILLS_PRIORITY))
+        self.account.mark_fills_synced(symbol)
+
+    async def get_snapshot(self, symbol: str = None):
+        """Fetch Klines, balances, open orders and fills concurrently into one snapshot.
+
+        Fills are the stored ones inside the kline window, however old.
+        None when klines or open orders are unavailable: an empty book would
+        look like no resting orders and invite duplicates.
+        """
+        symbol = symbol or self.config.SYMBOL
+        klines, balances, open_orders, _ = await asyncio.gather(
+            self.get_klines(symbol),
+            self.get_balances(),
+            self.query_open_orders(symbol),
+            self.get_trades(symbol)
+        )
+        if klines is None:
+            return None
+        if open_orders is None:
+            logger.error(f"{symbol} open orders unavailable, no snapshot")
+            return None
+        fills = self.account.fill_store(symbol).between(int(klines.open_time[0]))
+        return MarketSnapshot.build(symbol, int(time.time() * 1000), klines, balances, open_orders, fills, self.account.committed_buys())
@@ -0,0 +1,129 @@
+import logging
+import os
+import time
+from pathlib import Path
+import numpy as np
+from config import Config
+from strategies.http_client import HttpClient
+from strategies.API_Requests import get_trades_http, TRADES_PAGE
+from strategies.market_stream import INTERVALS
+from strategies.rate_limit import Priority
+
+logger = logging.getLogger(__name__)
+
+# One fixed-width little-endian record per fill (118 bytes); MEXC trade and order ids are strings
+FILL_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("price", "<f8"),
+    ("quantity", "<f8"),
+    ("is_buy", "?"),
+    ("id", "S40"),
+    ("order_id", "S53"),
+])
+
+class FillStore:
+    """Account fills for one symbol, ordered by time and indexed for range lookups.
+
+    Fills are kept in memory and, when a root directory is given, persisted
+    to <root>/<symbol>.bin: new fills are appended, and the file is only
+    rewritten when a late fill lands before the newest stored one.
+    """
+
+    def __init__(self, root: str = None, symbol: str = ""):
+        self.symbol = symbol
+        self.path = Path(root) / f"{symbol}.bin" if root else None
+        self.records = np.empty(0, dtype=FILL_DTYPE)
+        if self.path is not None and self.path.exists():
+            self.records = np.fromfile(self.path, dtype=FILL_DTYPE)
+        self.ids = set(self.records["id"].tolist())
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def cursor(self):
+        """Time (ms) of the newest stored fill, where the next sync resumes; None when empty."""
+        return int(self.records["timestamp"][-1]) if len(self.records) else None
+
+    def add(self, fills) -> int:
+        """Store fill dicts not seen before; returns how many were new."""
+        new = {str(f["id"]): f for f in fills if str(f["id"]).encode() not in self.ids}.values()
+        if not new:
+            return 0
+        records = np.array(
+            [(int(f["timestamp"]), float(f["price"]), float(f["quantity"]), f["side"] == "buy", str(f["id"]), str(f["order_id"])) for f in new],
+            dtype=FILL_DTYPE
+        )
+        records = records[np.argsort(records["timestamp"], kind="stable")]
+        in_order = not len(self.records) or records["timestamp"][0] >= self.records["timestamp"][-1]
+        if in_order:
+            self.records = np.concatenate([self.records, records])
+        else:
+            merged = np.concatenate([self.records, records])
+            self.records = merged[np.argsort(merged["timestamp"], kind="stable")]
+        self.ids.update(records["id"].tolist())
+        if self.path is not None:
+            self._persist(records if in_order else None)
+        return len(records)
+
+    def _persist(self, appended):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if appended is not None:
+            with self.path.open("ab") as f:
+                f.write(appended.tobytes())
+            return
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_bytes(self.records.tobytes())
+        os.replace(tmp, self.path)
+
+    def between(self, start: int = None, end: int = None) -> list:
+        """Fills with start <= timestamp < end, oldest first."""
+        times = self.records["timestamp"]
+        lo = 0 if start is None else np.searchsorted(times, start, side="left")
+        hi = len(times) if end is None else np.searchsorted(times, end, side="left")
+        return _as_dicts(self.records[lo:hi])
+
+    def recent(self, limit: int = 100) -> list:
+        """The newest `limit` fills, oldest first."""
+        return _as_dicts(self.records[-limit:]) if limit else []
+
+def _as_dicts(records: np.ndarray) -> list:
+    """Fill records in the dict shape the trade endpoints return."""
+    return [
+        {
+            "id": r["id"].decode(),
+            "order_id": r["order_id"].decode(),
+            "price": float(r["price"]),
+            "side": "buy" if r["is_buy"] else "sell",
+            "timestamp": int(r["timestamp"]),
+            "quantity": float(r["quantity"])
+        }
+        for r in records
+    ]
+
+async def sync_fills(http: HttpClient, config: Config, store: FillStore, max_pages: int = 10, priority: Priority = Priority.CHART):
+    """Fetch fills newer than the store's cursor page by page; returns rows added or None on failure.
+
+    Raises RequestShed when the scheduler drops a page at this priority.
+
+    An empty store starts at the beginning of the kline window: without a
+    start time the exchange returns only its newest page. The cursor page is
+    re-requested from its own timestamp, so fills sharing that millisecond
+    are not missed; ids already stored are skipped. A sync that runs out of
+    pages resumes from the cursor next time.
+    """
+    added = 0
+    start = store.cursor
+    if start is None:
+        start = int(time.time() * 1000) - config.KLINE_WINDOW * INTERVALS[config.INTERVAL][1]
+    for _ in range(max_pages):
+        page = await get_trades_http(http, config, store.symbol, TRADES_PAGE, priority, start_time=start)
+        if page is None:
+            return added or None
+        added += store.add(page)
+        if len(page) < TRADES_PAGE:
+            break
+        newest = max(int(f["timestamp"]) for f in page)
+        # A full page inside one millisecond cannot advance the cursor; step past it
+        start = newest + 1 if newest == start else newest
+    return added
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+import aiohttp
+from yarl import URL
+from config import Config
+from strategies.signing import RequestSigner
+from strategies.rate_limit import Priority, WeightScheduler
+from strategies.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+class HttpClient:
+    """Long-lived pooled aiohttp client shared by all HTTP helpers."""
+
+    def __init__(self, config: Config, scheduler: WeightScheduler = None):
+        self.config = config
+        self.scheduler = scheduler
+        self.base_url = config.BASE_URL.rstrip("/")
+        self.timeout = aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT)
+        self._session = None
+        self._lock = asyncio.Lock()
+        self.signer = RequestSigner(config.API_KEY, config.API_SECRET)
+        self.recv_window = config.RECV_WINDOW
+        self.time_sync_interval = config.TIME_SYNC_INTERVAL
+        self.time_offset = 0  # server time minus local time, ms
+        self._next_sync = 0.0  # monotonic time the offset is next refreshed
+        self._sync_backoff = 1.0  # seconds before retrying a failed sync; doubles up to time_sync_interval
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use inside the running loop."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.config.HTTP_POOL_SIZE,
+                    limit_per_host=self.config.HTTP_POOL_SIZE,
+                    ttl_dns_cache=self.config.HTTP_DNS_TTL,
+                    keepalive_timeout=self.config.HTTP_KEEPALIVE,
+                )
+                self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+                logger.info(f"HTTP session opened for {self.base_url}")
+        return self._session
+
+    async def request(self, method: str, path: str, params=None, headers=None, timeout: float = None, query: str = None,
+                      priority: Priority = Priority.MARKET_DATA, weight: int = 1):
+        """Send a request on the pooled session and return (status, decoded JSON body)."""
+        if self.scheduler is not None:
+            await self.scheduler.acquire(priority, weight)
+        session = await self.get_session()
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        # Signed queries must reach the server byte-for-byte as they were signed
+        url = URL(f"{self.base_url}{path}?{query}", encoded=True) if query else f"{self.base_url}{path}"
+        started = time.perf_counter()
+        try:
+            async with session.request(method, url, params=params, headers=headers, timeout=request_timeout) as response:
+                if self.scheduler is not None:
+                    self.scheduler.update_from_headers(response.headers)
+                    if response.status in (418, 429):
+                        self.scheduler.back_off(float(response.headers.get("Retry-After", 10)))
+                try:
+                    body = await response.json(content_type=None)
+                except ValueError:
+                    body = await response.text()
+        except Exception as e:
+            METRICS.inc("api_errors_total", endpoint=path, status=type(e).__name__)
+            raise
+        finally:
+            METRICS.observe("api_request_seconds", time.perf_counter() - started, method=method, endpoint=path)
+        if response.status >= 400:
+            METRICS.inc("api_errors_total", endpoint=path, status=str(response.status))
+        return response.status, body
+
+    async def get(self, path: str, params=None, timeout: float = None, priority: Priority = Priority.MARKET_DATA, weight: int = 1):
+        """GET shortcut for public endpoints."""
+        return await self.request("GET", path, params=params, timeout=timeout, priority=priority, weight=weight)
+
+    async def sync_time(self):
+        """Measure the offset between exchange server time and the local clock.
+
+        A failed sync keeps the previous offset and is retried after a
+        backoff, so signed requests never wait on it more than once per
+        backoff period.
+        """
+        sent = time.time() * 1000
+        try:
+            status, body = await self.get("/api/v3/time")
+        except Exception as e:
+            status, body = None, e
+        received = time.time() * 1000
+        if status != 200 or not isinstance(body, dict) or "serverTime" not in body:
+            logger.error(f"Server time sync failed, retrying in {self._sync_backoff:.0f}s: {status} {body}")
+            self._next_sync = time.monotonic() + self._sync_backoff
+            self._sync_backoff = min(self._sync_backoff * 2, self.time_sync_interval)
+            return
+        self.time_offset = int(body["serverTime"] - (sent + received) / 2)
+        self._next_sync = time.monotonic() + self.time_sync_interval
+        self._sync_backoff = 1.0
+        logger.info(f"Server time offset: {self.time_offset} ms")
+
+    async def signed_request(self, method: str, path: str, params: dict = None, timeout: float = None,
+                             priority: Priority = Priority.ACCOUNT, weight: int = 1):
+        """Send an HMAC-signed request with timestamp and recvWindow."""
+        if time.monotonic() >= self._next_sync:
+            await self.sync_time()
+        for attempt in range(2):
+            signed = dict(params or {})
+            signed["recvWindow"] = self.recv_window
+            signed["timestamp"] = int(time.time() * 1000) + self.time_offset
+            query = self.signer.signed_query(signed)
+            status, body = await self.request(method, path, headers=self.signer.headers(), timeout=timeout, query=query,
+                                              priority=priority, weight=weight)
+            # 700003: timestamp outside recvWindow, clock drifted since last sync
+            if attempt == 0 and isinstance(body, dict) and body.get("code") == 700003:
+                logger.warning("Request outside recvWindow, resyncing server time")
+                await self.sync_time()
+                continue
+            return status, body
+
+    async def close(self):
+        """Close the session and release pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            # Give the connector a moment to close SSL transports cleanly
+            await asyncio.sleep(0.25)
+            logger.info("HTTP session closed")
+        self._session = None
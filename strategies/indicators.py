@@ -0,0 +1,112 @@
+import math
+import numpy as np
+from config import Config
+from strategies.kline_store import KlineView
+
+class IndicatorEngine:
+    """Rolling indicators over closed candles, advanced one candle at a time.
+
+    Each new closed candle updates Wilder ATR, EWMA volatility of log
+    returns, an EWMA of the candle range, and a rolling VWAP from running
+    sums, all in O(1). Range percentiles come from a sorted copy of the
+    window's ranges kept with one searchsorted insert and delete per
+    candle. The still-open candle is ignored, so values only move when a
+    candle closes.
+    """
+
+    def __init__(self, config: Config):
+        self.window = config.INDICATOR_WINDOW
+        self.atr_period = config.ATR_PERIOD
+        self.ewma_lambda = config.EWMA_LAMBDA
+        self.count = 0
+        self.last_open_time = None
+        self.atr = math.nan
+        self.variance = 0.0
+        self.range_ewma = math.nan
+        self.range_last = math.nan
+        self._prev_close = None
+        # Ring buffers of the window's per-candle range, price*volume and volume
+        self._ranges = np.zeros(self.window)
+        self._pv = np.zeros(self.window)
+        self._vol = np.zeros(self.window)
+        self._sorted = np.empty(0)  # the window's ranges, ascending
+        self._pv_sum = 0.0
+        self._vol_sum = 0.0
+
+    def update(self, klines: KlineView) -> int:
+        """Feed candles that closed since the last call; returns how many were added."""
+        if klines is None or not len(klines):
+            return 0
+        # Only the newest candle can still be open; the exchange's clock, not ours, decides when it closes
+        closed = np.arange(len(klines)) < len(klines) - 1
+        if self.last_open_time is not None:
+            closed &= klines.open_time > self.last_open_time
+        indices = np.flatnonzero(closed)
+        for i in indices:
+            self._add(float(klines.high[i]), float(klines.low[i]), float(klines.close[i]), float(klines.volume[i]))
+        if len(indices):
+            self.last_open_time = int(klines.open_time[indices[-1]])
+        return len(indices)
+
+    def _add(self, high: float, low: float, close: float, volume: float):
+        slot = self.count % self.window
+        rng = (high - low) / low * 100 if low else 0.0
+
+        # True range needs the previous close; the first candle uses its own range
+        prev = self._prev_close
+        tr = high - low if prev is None else max(high - low, abs(high - prev), abs(low - prev))
+        if self.count < self.atr_period:
+            self.atr = tr if self.count == 0 else self.atr + (tr - self.atr) / (self.count + 1)
+        else:
+            self.atr += (tr - self.atr) / self.atr_period
+        if prev:
+            r = math.log(close / prev)
+            self.variance = self.ewma_lambda * self.variance + (1 - self.ewma_lambda) * r * r
+        self.range_ewma = rng if self.count == 0 else self.ewma_lambda * self.range_ewma + (1 - self.ewma_lambda) * rng
+        self.range_last = rng
+
+        typical = (high + low + close) / 3
+        if self.count >= self.window:
+            # Evict the candle leaving the window
+            old = self._ranges[slot]
+            self._sorted = np.delete(self._sorted, np.searchsorted(self._sorted, old))
+            self._pv_sum -= self._pv[slot]
+            self._vol_sum -= self._vol[slot]
+        self._ranges[slot] = rng
+        self._pv[slot] = typical * volume
+        self._vol[slot] = volume
+        self._sorted = np.insert(self._sorted, np.searchsorted(self._sorted, rng), rng)
+        self._pv_sum += typical * volume
+        self._vol_sum += volume
+        self._prev_close = close
+        self.count += 1
+
+    def range_percentile(self, q: float) -> float:
+        """Candle range (%) at percentile q (0-100) of the rolling window."""
+        if not len(self._sorted):
+            return math.nan
+        return float(self._sorted[min(int(q / 100 * len(self._sorted)), len(self._sorted) - 1)])
+
+    @property
+    def volatility(self) -> float:
+        """EWMA standard deviation of per-candle log returns."""
+        return math.sqrt(self.variance)
+
+    @property
+    def vwap(self) -> float:
+        return float(self._pv_sum / self._vol_sum) if self._vol_sum else math.nan
+
+    def values(self) -> dict:
+        """Current indicator values by name."""
+        close = self._prev_close
+        return {
+            "count": self.count,
+            "range_last": self.range_last,
+            "range_ewma": self.range_ewma,
+            "range_p50": self.range_percentile(50),
+            "range_p90": self.range_percentile(90),
+            "atr": self.atr,
+            "atr_pct": self.atr / close * 100 if close else math.nan,
+            "volatility": self.volatility,
+            "vwap": self.vwap,
+        }
@@ -0,0 +1,262 @@
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# One fixed-width little-endian record per candle (56 bytes)
+RECORD_DTYPE = np.dtype([
+    ("open_time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+    ("close_time", "<i8"),
+])
+CURRENT = "CURRENT"  # names the live generation directory once the archive has been compacted
+
+class KlineArchive:
+    """Append-only binary kline archive for one symbol and interval.
+
+    Candles are stored once each, ordered by open time, in fixed-size
+    segment files under <root>/<symbol>/<interval>/ that are read back
+    through numpy.memmap. Compaction writes a new generation directory
+    beside the live one and switches the CURRENT file to it, so readers
+    only ever see one complete generation.
+    """
+
+    def __init__(self, root: str, symbol: str, interval: str, segment_rows: int = 10080):
+        self.directory = Path(root) / symbol / interval
+        self.symbol = symbol
+        self.interval = interval
+        self.segment_rows = segment_rows
+        self._remove_leftovers()
+
+    @property
+    def live(self) -> Path:
+        """Directory of the live segments: the generation CURRENT names, or the archive directory before any compaction."""
+        try:
+            return self.directory / (self.directory / CURRENT).read_text().strip()
+        except FileNotFoundError:
+            return self.directory
+
+    def segments(self):
+        """Segment files in open-time order."""
+        live = self.live
+        if not live.exists():
+            return []
+        return sorted(live.glob("seg_*.bin"))
+
+    def _map(self, path: Path):
+        rows = path.stat().st_size // RECORD_DTYPE.itemsize
+        if not rows:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(rows,))
+
+    def __len__(self):
+        return sum(p.stat().st_size // RECORD_DTYPE.itemsize for p in self.segments())
+
+    @property
+    def last_open_time(self):
+        for path in reversed(self.segments()):
+            records = self._map(path)
+            if len(records):
+                return int(records["open_time"][-1])
+        return None
+
+    def append(self, records: np.ndarray) -> int:
+        """Append candles newer than the archive's last open time; returns rows written."""
+        if not len(records):
+            return 0
+        records = _latest_per_open_time(records)
+        last = self.last_open_time
+        if last is not None:
+            records = records[records["open_time"] > last]
+        if not len(records):
+            return 0
+        live = self.live
+        live.mkdir(parents=True, exist_ok=True)
+        segments = self.segments()
+        written = 0
+        while written < len(records):
+            if segments and segments[-1].stat().st_size // RECORD_DTYPE.itemsize < self.segment_rows:
+                path = segments[-1]
+            else:
+                path = live / f"seg_{len(segments):06d}.bin"
+                segments.append(path)
+            room = self.segment_rows - path.stat().st_size // RECORD_DTYPE.itemsize if path.exists() else self.segment_rows
+            chunk = records[written:written + room]
+            with path.open("ab") as f:
+                f.write(chunk.tobytes())
+            written += len(chunk)
+        return written
+
+    def merge(self, records: np.ndarray) -> int:
+        """Add candles missing from the archive at any open time; returns rows added.
+
+        Candles the archive already holds are kept as they are. When some
+        new ones fall before its last open time, the archive is rewritten
+        as a new generation, the same way compact() switches generations.
+        """
+        if not len(records):
+            return 0
+        records = _latest_per_open_time(records)
+        last = self.last_open_time
+        if last is None or records["open_time"][0] > last:
+            return self.append(records)
+        existing = self.read()
+        records = records[~np.isin(records["open_time"], existing["open_time"])]
+        if not len(records):
+            return 0
+        merged = np.concatenate([existing, records])
+        self._write_generation(merged[np.argsort(merged["open_time"], kind="stable")])
+        return len(records)
+
+    def append_rows(self, rows) -> int:
+        """Append raw [time, open, high, low, close, volume, closeTime, ...] rows."""
+        return self.append(rows_to_records(rows))
+
+    def read(self, start: int = None, end: int = None) -> np.ndarray:
+        """Return candles with start <= open_time < end (copied out of the memmaps)."""
+        parts = []
+        for path in self.segments():
+            records = self._map(path)
+            if not len(records):
+                continue
+            times = records["open_time"]
+            if end is not None and times[0] >= end:
+                break
+            if start is not None and times[-1] < start:
+                continue
+            lo = 0 if start is None else np.searchsorted(times, start, side="left")
+            hi = len(times) if end is None else np.searchsorted(times, end, side="left")
+            parts.append(np.array(records[lo:hi]))
+        if not parts:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate(parts)
+
+    def compact(self, retention_days: float = None) -> int:
+        """Drop candles past retention and repack segments to full size; returns rows kept."""
+        records = self.read()
+        if retention_days is not None and len(records):
+            cutoff = int((time.time() - retention_days * 86400) * 1000)
+            records = records[records["open_time"] >= cutoff]
+        old = self.segments()
+        self._write_generation(records)
+        logger.info(f"Compacted {self.symbol} {self.interval}: {len(old)} segments -> {len(self.segments())}, {len(records)} rows")
+        return len(records)
+
+    def _write_generation(self, records: np.ndarray):
+        """Write records as full segments in a new generation and make it the live one."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        generation = f"gen_{time.time_ns()}"
+        tmp = Path(tempfile.mkdtemp(prefix=f"{generation}.", suffix=".tmp", dir=self.directory))
+        for i in range(0, len(records), self.segment_rows):
+            with (tmp / f"seg_{i // self.segment_rows:06d}.bin").open("wb") as f:
+                f.write(records[i:i + self.segment_rows].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, self.directory / generation)
+        # Replacing CURRENT is the one atomic step: a crash before it keeps the old generation, after it the new one
+        pointer = self.directory / f"{CURRENT}.tmp"
+        with pointer.open("w") as f:
+            f.write(generation)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(pointer, self.directory / CURRENT)
+        _fsync_dir(self.directory)
+        self._remove_leftovers()
+
+    def _remove_leftovers(self):
+        """Delete what an interrupted or finished compaction left: temp output, stale generations and replaced segments."""
+        if not self.directory.exists():
+            return
+        live = self.live
+        for path in self.directory.iterdir():
+            if path == live or path.name == CURRENT:
+                continue
+            if path.is_dir() and (path.name.startswith("gen_") or path.name.endswith(".tmp")):
+                shutil.rmtree(path)
+            elif path.name == f"{CURRENT}.tmp" or (live != self.directory and path.match("seg_*.bin")):
+                path.unlink()
+
+def _fsync_dir(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _latest_per_open_time(records) -> np.ndarray:
+    """Sort records by open time, keeping the last occurrence of each."""
+    records = np.asarray(records, dtype=RECORD_DTYPE)
+    _, first = np.unique(records["open_time"][::-1], return_index=True)
+    return records[::-1][first]
+
+def rows_to_records(rows) -> np.ndarray:
+    """Convert raw kline rows into archive records."""
+    records = np.empty(len(rows), dtype=RECORD_DTYPE)
+    for i, r in enumerate(rows):
+        records[i] = (int(r[0]), float(r[1]), float(r[2]), float(r[3]), float(r[4]), float(r[5]), int(r[6]))
+    return records
+
+def import_snapshots(source: str, root: str, interval: str, segment_rows: int = 10080, delete: bool = False):
+    """One-shot import of legacy Klines_* CSV snapshots; later files win on duplicate candles.
+
+    Candles already in the archive are kept. With delete, a snapshot file
+    is removed only once every candle in it is found in the archive.
+    """
+    files = sorted(Path(source).glob("Klines_*"))
+    by_symbol = {}
+    file_times = {}  # path -> {symbol: open times in that file}
+    for path in files:
+        times = file_times.setdefault(path, {})
+        with path.open() as f:
+            for line in f:
+                parts = line.strip().split(",")
+                if len(parts) < 8:
+                    continue
+                by_symbol.setdefault(parts[7], []).append(parts)
+                times.setdefault(parts[7], []).append(int(parts[0]))
+    imported = {}
+    archived = {}
+    for symbol, rows in by_symbol.items():
+        archive = KlineArchive(root, symbol, interval, segment_rows)
+        # Rows are in file order, so merge() keeps each candle from the newest snapshot
+        imported[symbol] = archive.merge(rows_to_records(rows))
+        archived[symbol] = archive.read()["open_time"]
+        logger.info(f"Imported {imported[symbol]} {symbol} klines from {len(rows)} snapshot rows")
+    if delete:
+        deleted = 0
+        for path, times in file_times.items():
+            if all(np.isin(t, archived[symbol]).all() for symbol, t in times.items()):
+                path.unlink()
+                deleted += 1
+            else:
+                logger.warning(f"Keeping {path}: some of its klines are not in the archive")
+        logger.info(f"Deleted {deleted} of {len(files)} snapshot files")
+    return imported
+
+if __name__ == "__main__":
+    from config import Config
+    config = Config()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Kline archive maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="import legacy Klines_* snapshot files")
+    imp.add_argument("source", nargs="?", default="strategies/klines")
+    imp.add_argument("--delete", action="store_true", help="delete snapshot files once all their klines are archived")
+    comp = sub.add_parser("compact", help="apply retention and repack segments")
+    comp.add_argument("--days", type=float, default=config.ARCHIVE_RETENTION_DAYS)
+    args = parser.parse_args()
+    if args.command == "import":
+        import_snapshots(args.source, config.ARCHIVE_DIR, config.INTERVAL, config.ARCHIVE_SEGMENT_ROWS, args.delete)
+    else:
+        for symbol in config.SYMBOLS:
+            KlineArchive(config.ARCHIVE_DIR, symbol, config.INTERVAL, config.ARCHIVE_SEGMENT_ROWS).compact(args.days)
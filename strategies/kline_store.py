@@ -0,0 +1,176 @@
+import numpy as np
+
+COLUMNS = {
+    "open_time": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "close_time": np.int64,
+}
+
+class KlineView:
+    """Read-only columnar view of the candles in a KlineStore, oldest first.
+
+    The arrays share memory with the store, so they reflect later updates
+    to the same slots; copy them if they have to outlive the next update.
+    """
+
+    def __init__(self, symbol: str, columns: dict):
+        self.symbol = symbol
+        self.open_time = columns["open_time"]
+        self.open = columns["open"]
+        self.high = columns["high"]
+        self.low = columns["low"]
+        self.close = columns["close"]
+        self.volume = columns["volume"]
+        self.close_time = columns["close_time"]
+
+    def __len__(self):
+        return len(self.open_time)
+
+    @property
+    def timestamp(self) -> int:
+        """Open time of the oldest candle, as the old klines dict reported it."""
+        return int(self.open_time[0])
+
+    def copy(self) -> "KlineView":
+        """Detached read-only copy that later store updates can't change."""
+        columns = {}
+        for name in COLUMNS:
+            arr = getattr(self, name).copy()
+            arr.flags.writeable = False
+            columns[name] = arr
+        return KlineView(self.symbol, columns)
+
+    def rows(self):
+        """Materialise [time, open, high, low, close, volume, closeTime, symbol] rows."""
+        return [
+            [int(t), o, h, l, c, v, int(ct), self.symbol]
+            for t, o, h, l, c, v, ct in zip(
+                self.open_time, self.open.tolist(), self.high.tolist(), self.low.tolist(),
+                self.close.tolist(), self.volume.tolist(), self.close_time
+            )
+        ]
+
+class KlineStore:
+    """Fixed-capacity columnar ring buffer of candles keyed by open time.
+
+    Every slot is written twice, at i and i + capacity, so the live window
+    is always one contiguous slice and views never need a copy.
+    """
+
+    def __init__(self, symbol: str, capacity: int):
+        self.symbol = symbol
+        self.capacity = capacity
+        self._cols = {name: np.zeros(2 * capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self._start = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def last_open_time(self):
+        if not self._count:
+            return None
+        return int(self._cols["open_time"][self._start + self._count - 1])
+
+    def view(self) -> KlineView:
+        """Zero-copy read-only view of the current window."""
+        columns = {}
+        for name, arr in self._cols.items():
+            v = arr[self._start:self._start + self._count]
+            v.flags.writeable = False
+            columns[name] = v
+        return KlineView(self.symbol, columns)
+
+    def update(self, rows):
+        """Upsert raw kline rows ([time, open, high, low, close, volume, closeTime, ...]).
+
+        Rows newer than the last candle are appended, a row for the last
+        candle overwrites it in place, and older rows replace their slot or
+        fill a gap.
+        """
+        if not rows:
+            return
+        block = {
+            "open_time": np.array([int(r[0]) for r in rows], dtype=np.int64),
+            "open": np.array([r[1] for r in rows], dtype=np.float64),
+            "high": np.array([r[2] for r in rows], dtype=np.float64),
+            "low": np.array([r[3] for r in rows], dtype=np.float64),
+            "close": np.array([r[4] for r in rows], dtype=np.float64),
+            "volume": np.array([r[5] for r in rows], dtype=np.float64),
+            "close_time": np.array([int(r[6]) for r in rows], dtype=np.int64),
+        }
+        self.update_columns(block)
+
+    def update_columns(self, block: dict):
+        """Upsert candles given as column arrays sorted by open time."""
+        times = block["open_time"]
+        last = self.last_open_time
+        if last is None or times[0] > last:
+            self._append(block)
+            return
+        if times[0] < last:
+            # Rows behind the newest candle: rare (late backfill), so rebuild
+            self._merge(block)
+            return
+        # times[0] == last: overwrite the current candle, append the rest
+        self._write(self._count - 1, {name: col[:1] for name, col in block.items()})
+        if len(times) > 1:
+            self._append({name: col[1:] for name, col in block.items()})
+
+    def update_last(self, price: float, volume: float = 0.0):
+        """Apply a trade to the current candle without touching the others."""
+        if not self._count:
+            return
+        i = self._start + self._count - 1
+        p = (i % self.capacity, i % self.capacity + self.capacity)
+        close, high, low, vol = self._cols["close"], self._cols["high"], self._cols["low"], self._cols["volume"]
+        for j in p:
+            close[j] = price
+            high[j] = max(high[j], price)
+            low[j] = min(low[j], price)
+            vol[j] += volume
+
+    def _append(self, block: dict):
+        n = len(block["open_time"])
+        if n >= self.capacity:
+            self._start, self._count = 0, self.capacity
+            self._write(0, {name: col[-self.capacity:] for name, col in block.items()})
+            return
+        first = self._count
+        total = self._count + n
+        if total > self.capacity:
+            # Evicting the oldest rows leaves every physical slot where it was
+            first -= total - self.capacity
+            self._start = (self._start + total - self.capacity) % self.capacity
+            self._count = self.capacity
+        else:
+            self._count = total
+        self._write(first, block)
+
+    def _write(self, logical: int, block: dict):
+        """Write rows at logical positions, mirroring each into both halves."""
+        n = len(block["open_time"])
+        slots = (self._start + logical + np.arange(n)) % self.capacity
+        for name, col in block.items():
+            arr = self._cols[name]
+            arr[slots] = col
+            arr[slots + self.capacity] = col
+
+    def _merge(self, block: dict):
+        current = self.view()
+        times = np.concatenate([block["open_time"], current.open_time])
+        # Stable sort keeps new rows first, so unique() picks them over stale ones
+        order = np.argsort(times, kind="stable")
+        _, first = np.unique(times[order], return_index=True)
+        keep = order[first]
+        merged = {
+            name: np.concatenate([block[name], getattr(current, name)])[keep]
+            for name in COLUMNS
+        }
+        self._start, self._count = 0, 0
+        self._append(merged)
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import logging
+import time
+import aiohttp
+from config import Config
+from strategies.http_client import HttpClient
+from strategies.API_Requests import get_klines_http
+from strategies.kline_store import KlineStore
+
+logger = logging.getLogger(__name__)
+
+# REST interval -> (WebSocket interval name, interval length in ms)
+INTERVALS = {
+    "1m": ("Min1", 60_000),
+    "5m": ("Min5", 300_000),
+    "15m": ("Min15", 900_000),
+    "30m": ("Min30", 1_800_000),
+    "60m": ("Min60", 3_600_000),
+    "4h": ("Hour4", 14_400_000),
+    "1d": ("Day1", 86_400_000),
+}
+
+async def backfill_klines(http: HttpClient, config: Config, store: KlineStore, start_time: int = None):
+    """Fetch candles from start_time (default: the store's last open time) into the store.
+
+    Only the current candle and anything newer is requested, so a warm store
+    costs one small request; an empty or stale store reloads its full capacity.
+    """
+    interval_ms = INTERVALS[config.INTERVAL][1]
+    if start_time is None:
+        start_time = store.last_open_time
+    if start_time is None or time.time() * 1000 - start_time > store.capacity * interval_ms:
+        start_time = int(time.time() * 1000) - store.capacity * interval_ms
+    fetched = 0
+    while True:
+        result = await get_klines_http(http, config, start_time=start_time, limit=1000, symbol=store.symbol)
+        if not result:
+            return fetched or None
+        store.update(result["klines"])
+        fetched += len(result["klines"])
+        if len(result["klines"]) < 1000:
+            return fetched
+        start_time = result["klines"][-1][0] + interval_ms
+
+class KlineStream:
+    """Keep kline windows current from the public kline and trade WebSocket channels.
+
+    One connection carries every symbol's channels; pushes are routed to
+    each symbol's store by the symbol they carry.
+    """
+
+    def __init__(self, http: HttpClient, config: Config, stores: dict, on_update=None):
+        self.http = http
+        self.config = config
+        self.stores = stores  # symbol -> KlineStore
+        self.on_update = on_update  # callback(symbol) after each applied push
+        self.ws_interval, self.interval_ms = INTERVALS[config.INTERVAL]
+        self.connected = False
+        self.last_message = {}  # symbol -> monotonic time of its last push
+        self._task = None
+        self._backfills = set()  # gap backfills in flight; referenced so they are not collected mid-run
+
+    @property
+    def channels(self):
+        channels = []
+        for symbol in self.stores:
+            channels.append(f"spot@public.kline.v3.api@{symbol}@{self.ws_interval}")
+            channels.append(f"spot@public.deals.v3.api@{symbol}")
+        return channels
+
+    def is_fresh(self, symbol: str) -> bool:
+        """True when the stream is connected and has pushed data for the symbol recently."""
+        return (
+            self.connected
+            and len(self.stores[symbol]) > 0
+            and time.monotonic() - self.last_message.get(symbol, 0.0) < self.config.STREAM_STALE_AFTER
+        )
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._backfills):
+            task.cancel()
+        self.connected = False
+
+    async def _run(self):
+        """Connect, subscribe and consume messages, reconnecting with backoff."""
+        delay = 1.0
+        while True:
+            try:
+                session = await self.http.get_session()
+                async with session.ws_connect(self.config.WS_URL, heartbeat=None) as ws:
+                    await ws.send_json({"method": "SUBSCRIPTION", "params": self.channels})
+                    # Anything pushed while we were disconnected is recovered over REST
+                    await asyncio.gather(*(self.backfill(symbol) for symbol in self.stores))
+                    self.connected = True
+                    delay = 1.0
+                    logger.info(f"Kline stream connected for {', '.join(self.stores)}")
+                    ping = asyncio.create_task(self._ping(ws))
+                    try:
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                self.handle_message(json.loads(msg.data))
+                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                    finally:
+                        ping.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Kline stream error: {e}")
+            self.connected = False
+            logger.warning(f"Kline stream disconnected, reconnecting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def _ping(self, ws):
+        """The exchange drops idle connections, so keep them alive."""
+        while True:
+            await asyncio.sleep(self.config.STREAM_PING_INTERVAL)
+            await ws.send_json({"method": "PING"})
+
+    async def backfill(self, symbol: str, start_time: int = None):
+        """Recover a symbol's candles missed while disconnected or across a gap."""
+        await backfill_klines(self.http, self.config, self.stores[symbol], start_time)
+
+    def handle_message(self, data: dict):
+        """Route a pushed message to the kline or trade handler of its symbol."""
+        channel = data.get("c", "")
+        payload = data.get("d", {})
+        parts = channel.split("@")
+        symbol = data.get("s") or (parts[2] if len(parts) > 2 else None)
+        if symbol not in self.stores:
+            return
+        self.last_message[symbol] = time.monotonic()
+        if channel.startswith("spot@public.kline"):
+            k = payload["k"]
+            # Stream times are seconds; REST rows use ms with an inclusive close time
+            self.apply(symbol, [k["t"] * 1000, k["o"], k["h"], k["l"], k["c"], k["v"], k["T"] * 1000 - 1])
+        elif channel.startswith("spot@public.deals"):
+            for deal in payload.get("deals", []):
+                self.apply_trade(symbol, float(deal["p"]), int(deal["t"]))
+        if self.on_update:
+            self.on_update(symbol)
+
+    def apply(self, symbol: str, row: list):
+        """Upsert a candle by open time, scheduling a backfill on gaps."""
+        store = self.stores[symbol]
+        last_open = store.last_open_time
+        if last_open is not None and row[0] > last_open + self.interval_ms and self.connected:
+            logger.warning(f"{symbol} kline gap detected after {last_open}, backfilling")
+            task = asyncio.create_task(self.backfill(symbol, last_open))
+            self._backfills.add(task)
+            task.add_done_callback(self._backfill_done)
+        store.update([row])
+
+    def _backfill_done(self, task: asyncio.Task):
+        self._backfills.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Kline backfill error: {task.exception()}")
+
+    def apply_trade(self, symbol: str, price: float, trade_time: int):
+        """Move the current candle's close/high/low ahead of the next kline push."""
+        store = self.stores[symbol]
+        last_open = store.last_open_time
+        if last_open is None or trade_time < last_open:
+            return
+        if trade_time >= last_open + self.interval_ms:
+            # First trade of a new candle; the kline channel fills in volume
+            open_time = trade_time - trade_time % self.interval_ms
+            self.apply(symbol, [open_time, price, price, price, price, 0.0, open_time + self.interval_ms - 1])
+            return
+        store.update_last(price)
@@ -0,0 +1,137 @@
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUOTE_ASSETS = ("USDT", "USDC", "USD1", "BTC", "ETH")
+
+def split_symbol(symbol: str):
+    """Split a pair like USD1USDT into (base, quote)."""
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)], quote
+    raise ValueError(f"Unknown quote asset in {symbol}")
+
+class MatchingEngine:
+    """In-memory limit-order book for one account, filling orders against market prices.
+
+    Placing an order locks its funds (quote for buys, base for sells).
+    A buy fills in full at its limit price once the market trades at or
+    below it, a sell once it trades at or above it. A trade-through fill at
+    the limit is the conservative assumption when there is no order book.
+    """
+
+    def __init__(self, balances: dict, fee_rate: float = 0.0):
+        self.free = {asset: float(amount) for asset, amount in balances.items()}
+        self.locked = {asset: 0.0 for asset in balances}
+        self.fee_rate = fee_rate
+        self.orders = {}  # symbol -> {order_id: order dict}
+        self.trades = {}  # symbol -> list of fills, oldest first
+        self.last_price = {}
+        self.fees_paid = 0.0
+        self._ids = itertools.count(1)
+
+    def balances(self) -> dict:
+        """Free balances above zero, like the account endpoint reports them."""
+        return {asset: free for asset, free in self.free.items() if free > 0}
+
+    def open_orders(self, symbol: str) -> list:
+        return [
+            {"order_id": o["order_id"], "side": o["side"], "price": o["price"], "quantity": o["quantity"]}
+            for o in self.orders.get(symbol, {}).values()
+        ]
+
+    def my_trades(self, symbol: str, start_time: int = None, limit: int = 100) -> list:
+        trades = self.trades.get(symbol, [])
+        if start_time is not None:
+            trades = [t for t in trades if t["timestamp"] >= start_time]
+            return trades[:limit]
+        return trades[-limit:]
+
+    def place(self, symbol: str, side: str, quantity, price, timestamp: int = 0):
+        """Lock funds and rest a limit order; returns its id, or None when unfunded or invalid."""
+        quantity, price = float(quantity), float(price)
+        if quantity <= 0 or price <= 0:
+            return None
+        base, quote = split_symbol(symbol)
+        asset, amount = (quote, quantity * price) if side == "buy" else (base, quantity)
+        # Tolerate float dust from the caller's Decimal arithmetic
+        if self.free.get(asset, 0.0) < amount - 1e-9:
+            return None
+        self.free[asset] = self.free.get(asset, 0.0) - amount
+        self.locked[asset] = self.locked.get(asset, 0.0) + amount
+        order_id = f"SIM{next(self._ids)}"
+        self.orders.setdefault(symbol, {})[order_id] = {
+            "order_id": order_id, "side": side, "price": price, "quantity": quantity, "time": timestamp
+        }
+        return order_id
+
+    def cancel(self, symbol: str, order_id) -> bool:
+        """Cancel an open order and release its funds; False if it is not open."""
+        order = self.orders.get(symbol, {}).pop(str(order_id), None)
+        if order is None:
+            return False
+        self._release(symbol, order)
+        return True
+
+    def cancel_all(self, symbol: str) -> list:
+        ids = list(self.orders.get(symbol, {}))
+        for order_id in ids:
+            self.cancel(symbol, order_id)
+        return ids
+
+    def _release(self, symbol: str, order: dict):
+        base, quote = split_symbol(symbol)
+        asset, amount = (quote, order["quantity"] * order["price"]) if order["side"] == "buy" else (base, order["quantity"])
+        self.locked[asset] -= amount
+        self.free[asset] += amount
+
+    def match(self, symbol: str, low: float, high: float, timestamp: int) -> list:
+        """Fill every resting order the price range [low, high] trades through; returns the fills."""
+        book = self.orders.get(symbol)
+        fills = []
+        if book:
+            for order_id, order in list(book.items()):
+                if (order["side"] == "buy" and low <= order["price"]) or (order["side"] == "sell" and high >= order["price"]):
+                    del book[order_id]
+                    fills.append(self._fill(symbol, order, timestamp))
+        self.last_price[symbol] = (low + high) / 2
+        return fills
+
+    def _fill(self, symbol: str, order: dict, timestamp: int) -> dict:
+        base, quote = split_symbol(symbol)
+        quantity, price = order["quantity"], order["price"]
+        cost = quantity * price
+        if order["side"] == "buy":
+            fee = quantity * self.fee_rate
+            self.locked[quote] -= cost
+            self.free[base] = self.free.get(base, 0.0) + quantity - fee
+            self.fees_paid += fee * price
+        else:
+            fee = cost * self.fee_rate
+            self.locked[base] -= quantity
+            self.free[quote] = self.free.get(quote, 0.0) + cost - fee
+            self.fees_paid += fee
+        fill = {
+            "id": f"T{order['order_id']}",
+            "order_id": order["order_id"],
+            "price": price,
+            "side": order["side"],
+            "timestamp": timestamp,
+            "quantity": quantity
+        }
+        self.trades.setdefault(symbol, []).append(fill)
+        return fill
+
+    def equity(self, prices: dict, quote: str = "USDT") -> float:
+        """Account value in the quote asset, free plus locked, at the given symbol prices."""
+        total = 0.0
+        assets = set(self.free) | set(self.locked)
+        price_of = {split_symbol(s)[0]: p for s, p in prices.items()}
+        for asset in assets:
+            amount = self.free.get(asset, 0.0) + self.locked.get(asset, 0.0)
+            if asset == quote:
+                total += amount
+            elif asset in price_of:
+                total += amount * price_of[asset]
+        return total
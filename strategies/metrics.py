@@ -0,0 +1,268 @@
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "tradebot_"
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RENDER_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RATE_WINDOW = 60.0  # seconds covered by the per-minute rates
+
+# name -> (type, help, histogram buckets)
+DEFINITIONS = {
+    "tick_stage_seconds": ("histogram", "Main loop stage latency per symbol", LATENCY_BUCKETS),
+    "ticks_total": ("counter", "Ticks per symbol by outcome", None),
+    "api_request_seconds": ("histogram", "Exchange call latency per endpoint (SDK calls by method)", LATENCY_BUCKETS),
+    "api_errors_total": ("counter", "Exchange calls answered with an error status or raising", None),
+    "order_actions_total": ("counter", "Order placements and cancels per symbol by outcome", None),
+    "render_seconds": ("histogram", "Chart render duration in the render worker", RENDER_BUCKETS),
+    "render_frames_total": ("counter", "Chart frames by outcome", None),
+    "notifications_total": ("counter", "Telegram notifications by kind and outcome", None),
+    "event_loop_lag_seconds": ("histogram", "Event loop scheduling delay", LATENCY_BUCKETS),
+    "event_loop_lag_last_seconds": ("gauge", "Most recent event loop scheduling delay", None),
+}
+RATED = {"order_actions_total"}  # counters also reported as events in the last minute
+
+class Histogram:
+    """Fixed-bucket latency histogram; observe() is one bisect and three adds."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf past the last bucket)."""
+        if not self.count:
+            return float("nan")
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+class _Timer:
+    """Observes the duration of its with-block into a histogram."""
+
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started)
+
+class Metrics:
+    """Process-wide counters, gauges and latency histograms for the hot path.
+
+    Series are keyed by metric name and label values and created on first
+    use. Updates run on the event loop without locking; the web server
+    thread reads them through prometheus() and snapshot(), which copy under
+    a lock. When disabled every update returns at once and no loop
+    monitor runs.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started = time.time()
+        self._series = {name: {} for name in DEFINITIONS}  # name -> {labels tuple: value or Histogram}
+        self._recent = {name: deque() for name in RATED}  # name -> (monotonic time, labels, amount)
+        self._lock = threading.Lock()
+        self._monitor = None
+
+    def configure(self, config: Config):
+        self.enabled = config.METRICS_ENABLED
+        if not self.enabled:
+            logger.info("Metrics disabled")
+
+    def _get(self, name: str, labels: dict, factory):
+        key = tuple(sorted(labels.items()))
+        series = self._series[name]
+        value = series.get(key)
+        if value is None:
+            with self._lock:
+                value = series.setdefault(key, factory())
+        return value
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        if not self.enabled or not amount:
+            return
+        key = tuple(sorted(labels.items()))
+        series = self._series[name]
+        if key not in series:
+            with self._lock:
+                series.setdefault(key, 0)
+        series[key] += amount
+        if name in RATED:
+            now = time.monotonic()
+            recent = self._recent[name]
+            recent.append((now, key, amount))
+            while recent[0][0] < now - RATE_WINDOW:
+                recent.popleft()
+
+    def set(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        series = self._series[name]
+        if key not in series:
+            with self._lock:
+                series[key] = value
+        else:
+            series[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        histogram = self._get(name, labels, lambda: Histogram(DEFINITIONS[name][2]))
+        histogram.observe(value)
+
+    def timer(self, name: str, **labels):
+        """Context manager observing its block's duration; a shared no-op when disabled."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self._get(name, labels, lambda: Histogram(DEFINITIONS[name][2])))
+
+    # Event loop lag
+
+    def start_loop_monitor(self, interval: float):
+        """Sample event loop lag every interval seconds; no-op when disabled."""
+        if self.enabled and self._monitor is None:
+            self._monitor = asyncio.create_task(self._watch_loop(interval))
+
+    async def stop_loop_monitor(self):
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+
+    async def _watch_loop(self, interval: float):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(time.perf_counter() - started - interval, 0.0)
+            self.observe("event_loop_lag_seconds", lag)
+            self.set("event_loop_lag_last_seconds", lag)
+
+    # Export
+
+    def _copy(self) -> dict:
+        """Consistent-enough copy of every series for export."""
+        with self._lock:
+            copied = {}
+            for name, series in self._series.items():
+                if DEFINITIONS[name][0] == "histogram":
+                    copied[name] = {k: (h.buckets, list(h.counts), h.sum, h.count) for k, h in series.items()}
+                else:
+                    copied[name] = dict(series)
+            return copied
+
+    def rates(self) -> dict:
+        """Events in the last RATE_WINDOW seconds for each rated counter, by labels."""
+        cutoff = time.monotonic() - RATE_WINDOW
+        rates = {}
+        for name, recent in self._recent.items():
+            # Only the updating thread trims the deque; readers work on a copy
+            per_labels = {}
+            for at, key, amount in list(recent):
+                if at >= cutoff:
+                    per_labels[key] = per_labels.get(key, 0) + amount
+            rates[name] = per_labels
+        return rates
+
+    def prometheus(self) -> str:
+        """All series in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+        for name, series in self._copy().items():
+            kind, text, _ = DEFINITIONS[name]
+            full = PREFIX + name
+            lines.append(f"# HELP {full} {text}")
+            lines.append(f"# TYPE {full} {kind}")
+            for key, value in sorted(series.items()):
+                if kind != "histogram":
+                    lines.append(f"{full}{_labels(key)} {_number(value)}")
+                    continue
+                buckets, counts, total, count = value
+                cumulative = 0
+                for bound, n in zip(buckets + (float("inf"),), counts):
+                    cumulative += n
+                    lines.append(f"{full}_bucket{_labels(key + (('le', _number(bound)),))} {cumulative}")
+                lines.append(f"{full}_sum{_labels(key)} {_number(total)}")
+                lines.append(f"{full}_count{_labels(key)} {count}")
+        for name, per_labels in self.rates().items():
+            full = f"{PREFIX}{name[:-len('_total')]}_per_minute"
+            lines.append(f"# HELP {full} {DEFINITIONS[name][1]} in the last minute")
+            lines.append(f"# TYPE {full} gauge")
+            for key, value in sorted(per_labels.items()):
+                lines.append(f"{full}{_labels(key)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        """JSON-friendly view: counters and gauges as values, histograms summarised."""
+        result = {"enabled": self.enabled, "uptime_s": round(time.time() - self.started, 1)}
+        for name, series in self._copy().items():
+            kind = DEFINITIONS[name][0]
+            entries = []
+            for key, value in sorted(series.items()):
+                entry = {"labels": dict(key)}
+                if kind == "histogram":
+                    buckets, counts, total, count = value
+                    histogram = Histogram(buckets)
+                    histogram.counts, histogram.sum, histogram.count = counts, total, count
+                    entry.update({
+                        "count": count,
+                        "mean_ms": round(total / count * 1000, 3) if count else None,
+                        "p50_ms": _ms(histogram.quantile(0.5)),
+                        "p90_ms": _ms(histogram.quantile(0.9)),
+                        "p99_ms": _ms(histogram.quantile(0.99)),
+                    })
+                else:
+                    entry["value"] = value
+                entries.append(entry)
+            result[name] = entries
+        for name, per_labels in self.rates().items():
+            result[f"{name[:-len('_total')]}_per_minute"] = [{"labels": dict(k), "value": v} for k, v in sorted(per_labels.items())]
+        return result
+
+_NULL_TIMER = nullcontext()
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(key: tuple) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _ms(seconds: float):
+    """Bucket bound in ms for JSON; None where it is unbounded or unknown."""
+    return round(seconds * 1000, 3) if seconds == seconds and seconds != float("inf") else None
+
+METRICS = Metrics()
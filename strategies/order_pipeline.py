@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import List
+from config import Config
+from strategies.rate_limit import TokenBucket
+from strategies.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+BATCH_LIMIT = 20  # max orders per batchOrders request
+
+@dataclass
+class OrderReport:
+    """Outcome of one order refresh."""
+
+    cancelled: List[str] = field(default_factory=list)
+    cancel_failed: List[dict] = field(default_factory=list)
+    placed: List[dict] = field(default_factory=list)
+    place_failed: List[dict] = field(default_factory=list)
+    skipped: List[dict] = field(default_factory=list)
+    requests: int = 0
+    elapsed_ms: float = 0.0
+
+    def __str__(self):
+        return (
+            f"cancelled={len(self.cancelled)} cancel_failed={len(self.cancel_failed)} "
+            f"placed={len(self.placed)} place_failed={len(self.place_failed)} skipped={len(self.skipped)} "
+            f"requests={self.requests} in {self.elapsed_ms:.0f} ms"
+        )
+
+class OrderPipeline:
+    """Send cancels and placements concurrently within an order-weight budget."""
+
+    def __init__(self, feeder, config: Config):
+        self.feeder = feeder
+        self.bucket = TokenBucket(config.ORDER_WEIGHT_PER_SEC, config.ORDER_WEIGHT_BURST)
+
+    async def execute(self, symbol: str, cancels: list, places: list, available: Decimal, cancel_all: bool = False) -> OrderReport:
+        """Cancel and place orders (dicts with order_id/side/price/quantity).
+
+        Placements the current balance already funds go out together with
+        the cancels; the rest wait for the cancels that free their funds.
+        Only quote funds are tracked, so sells wait whenever sells are being
+        cancelled: an amended sell needs the base its old order still locks.
+        cancel_all uses one request to clear every open order on the symbol;
+        it would also cancel placements already in flight, so with cancel_all
+        every placement waits for the cancels.
+        """
+        report = OrderReport()
+        started = time.perf_counter()
+        now, later, sells_later = [], [], []
+        cancelling_sells = any(o["side"] != "buy" for o in cancels)
+        for order in places:
+            cost = Decimal(str(order["price"])) * Decimal(str(order["quantity"]))
+            if order["side"] != "buy":
+                (sells_later if cancelling_sells else now).append(order)
+            elif cost <= available:
+                available -= cost
+                now.append(order)
+            else:
+                later.append((order, cost))
+        freed = sum(
+            (Decimal(str(o["price"])) * Decimal(str(o["quantity"])) for o in cancels if o["side"] == "buy"),
+            Decimal(0)
+        )
+
+        if cancel_all:
+            await self._cancel(symbol, cancels, cancel_all, report)
+            await self._place(symbol, now, report)
+        else:
+            await asyncio.gather(self._cancel(symbol, cancels, cancel_all, report), self._place(symbol, now, report))
+
+        # Funds from failed cancels stay locked
+        freed -= sum(
+            (Decimal(str(o["price"])) * Decimal(str(o["quantity"])) for o in report.cancel_failed if o["side"] == "buy"),
+            Decimal(0)
+        )
+        available += freed
+        second = list(sells_later)
+        for order, cost in later:
+            if cost <= available:
+                available -= cost
+                second.append(order)
+            else:
+                logger.warning(f"Skipping order: quantity {order['quantity']} invalid or insufficient balance {available}")
+                report.skipped.append(order)
+        if second:
+            await self._place(symbol, second, report)
+
+        report.elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Order refresh: {report}")
+        METRICS.inc("order_actions_total", len(report.placed), symbol=symbol, action="place")
+        METRICS.inc("order_actions_total", len(report.place_failed), symbol=symbol, action="place_failed")
+        METRICS.inc("order_actions_total", len(report.cancelled), symbol=symbol, action="cancel")
+        METRICS.inc("order_actions_total", len(report.cancel_failed), symbol=symbol, action="cancel_failed")
+        METRICS.inc("order_actions_total", len(report.skipped), symbol=symbol, action="skipped")
+        return report
+
+    async def _cancel(self, symbol: str, cancels: list, cancel_all: bool, report: OrderReport):
+        if not cancels:
+            return
+        if cancel_all and len(cancels) > 1:
+            await self.bucket.acquire(1)
+            report.requests += 1
+            cancelled = await self.feeder.cancel_all_orders(symbol)
+            if isinstance(cancelled, list):
+                report.cancelled.extend(str(order_id) for order_id in cancelled)
+                return
+            logger.warning("Cancel-all failed, cancelling orders one by one")
+
+        async def cancel(order):
+            await self.bucket.acquire(1)
+            report.requests += 1
+            if await self.feeder.cancel_order(symbol, order["order_id"]):
+                report.cancelled.append(str(order["order_id"]))
+            else:
+                report.cancel_failed.append(order)
+
+        await asyncio.gather(*(cancel(o) for o in cancels))
+
+    async def _place(self, symbol: str, orders: list, report: OrderReport):
+        if not orders:
+            return
+        if len(orders) == 1:
+            await self._place_one(symbol, orders[0], report)
+            return
+        batches = [orders[i:i + BATCH_LIMIT] for i in range(0, len(orders), BATCH_LIMIT)]
+        await asyncio.gather(*(self._place_batch(symbol, batch, report) for batch in batches))
+
+    async def _place_batch(self, symbol: str, batch: list, report: OrderReport):
+        await self.bucket.acquire(1)
+        report.requests += 1
+        order_ids = await self.feeder.place_batch_orders(symbol, batch)
+        if order_ids is None:
+            # The batch never reached the exchange, so single orders cannot duplicate it
+            await asyncio.gather(*(self._place_one(symbol, o, report) for o in batch))
+            return
+        if order_ids is False:
+            order_ids = [None] * len(batch)
+        for order, order_id in zip(batch, order_ids):
+            self._record_place(order, order_id, report)
+
+    async def _place_one(self, symbol: str, order: dict, report: OrderReport):
+        await self.bucket.acquire(1)
+        report.requests += 1
+        order_id = await self.feeder.place_order(symbol, order["side"], order["quantity"], order["price"])
+        self._record_place(order, order_id, report)
+
+    def _record_place(self, order: dict, order_id, report: OrderReport):
+        if order_id:
+            placed = dict(order, order_id=order_id)
+            report.placed.append(placed)
+            logger.info(f"Placed order: {placed}")
+        else:
+            report.place_failed.append(order)
+            logger.warning(f"Failed to place order: {order}")
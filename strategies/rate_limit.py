@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from enum import IntEnum
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Request-weight budget that refills continuously up to a burst capacity."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # weight per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, weight: float = 1):
+        """Wait until `weight` tokens are available and take them."""
+        async with self._lock:
+            self._refill()
+            while self.tokens < weight:
+                await asyncio.sleep((weight - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= weight
+
+class Priority(IntEnum):
+    """Lower value wins when weight is scarce."""
+
+    CANCEL = 0
+    ORDER = 1
+    ACCOUNT = 2
+    MARKET_DATA = 3
+    CHART = 4
+
+# Share of the window's weight each priority may use; the rest is kept for higher priorities
+SHARES = {
+    Priority.CANCEL: 1.0,
+    Priority.ORDER: 0.95,
+    Priority.ACCOUNT: 0.85,
+    Priority.MARKET_DATA: 0.8,
+    Priority.CHART: 0.5,
+}
+
+class RequestShed(Exception):
+    """Raised instead of waiting when low-priority work is dropped under pressure."""
+
+class WeightScheduler:
+    """Sliding-window request-weight budget shared by every exchange call.
+
+    Each priority may spend up to its share of the window's limit and
+    yields to any higher-priority caller that is waiting. Chart traffic is
+    shed rather than queued once it reaches its share. Weight reported by
+    the exchange in response headers, and any Retry-After, override the
+    local estimate.
+    """
+
+    def __init__(self, config: Config):
+        self.limit = config.API_WEIGHT_LIMIT
+        self.window = config.API_WEIGHT_WINDOW
+        self.shed_priority = Priority.CHART
+        self._spent = deque()  # (monotonic time, weight)
+        self._used = 0
+        self._server_used = 0
+        self._server_seen = 0.0
+        self._blocked_until = 0.0
+        self._waiting = [0] * len(Priority)
+        self.shed = 0
+
+    @property
+    def used(self) -> int:
+        """Weight used in the current window, local or server-reported, whichever is higher."""
+        now = time.monotonic()
+        self._expire(now)
+        server = self._server_used if now - self._server_seen < self.window else 0
+        return max(self._used, server)
+
+    def _expire(self, now: float):
+        while self._spent and now - self._spent[0][0] >= self.window:
+            self._used -= self._spent.popleft()[1]
+
+    async def acquire(self, priority: Priority, weight: int = 1):
+        """Wait for budget at this priority and spend it; raises RequestShed for sheddable work."""
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                if priority >= self.shed_priority:
+                    self.shed += 1
+                    raise RequestShed(f"rate limited for {self._blocked_until - now:.1f}s")
+                wait = self._blocked_until - now
+            else:
+                higher_waiting = any(self._waiting[p] for p in range(priority))
+                if not higher_waiting and self.used + weight <= self.limit * SHARES[priority]:
+                    self._spent.append((now, weight))
+                    self._used += weight
+                    return
+                if priority >= self.shed_priority:
+                    self.shed += 1
+                    raise RequestShed(f"weight {self.used}/{self.limit} too high for {priority.name}")
+                wait = self._spent[0][0] + self.window - now if self._spent and not higher_waiting else 0.01
+            self._waiting[priority] += 1
+            try:
+                await asyncio.sleep(max(wait, 0.01))
+            finally:
+                self._waiting[priority] -= 1
+
+    def update_from_headers(self, headers):
+        """Adopt the exchange's own used-weight figure when a response carries one."""
+        for name, value in headers.items():
+            if "used-weight" in name.lower():
+                try:
+                    self._server_used = int(value)
+                    self._server_seen = time.monotonic()
+                except ValueError:
+                    pass
+                return
+
+    def back_off(self, retry_after: float):
+        """Stop all traffic for retry_after seconds after a 429."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        logger.warning(f"Rate limited, pausing requests for {retry_after:.1f}s")
@@ -0,0 +1,103 @@
+import logging
+from collections import namedtuple
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
+from typing import List, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# price and quantity are Decimals on the exchange grid; order_id is None for desired orders
+OrderSpec = namedtuple("OrderSpec", "side price quantity order_id", defaults=(None,))
+
+class SymbolFilters:
+    """Exchange price tick and lot step for one symbol."""
+
+    def __init__(self, price_tick, qty_step):
+        self.price_tick = Decimal(str(price_tick))
+        self.qty_step = Decimal(str(qty_step))
+
+    @classmethod
+    def from_config(cls, config: Config, symbol: str = None):
+        """Per-symbol overrides from SYMBOL_FILTERS, else the PRICE_TICK/QTY_STEP defaults."""
+        return cls(*config.SYMBOL_FILTERS.get(symbol, (config.PRICE_TICK, config.QTY_STEP)))
+
+    def price(self, value) -> Decimal:
+        """Snap a price to the nearest tick."""
+        return (Decimal(str(value)) / self.price_tick).quantize(Decimal(1), rounding=ROUND_HALF_UP) * self.price_tick
+
+    def quantity(self, value, rounding=ROUND_DOWN) -> Decimal:
+        """Round a quantity to the lot step, down by default so it never exceeds what we can fund."""
+        return (Decimal(str(value)) / self.qty_step).quantize(Decimal(1), rounding=rounding) * self.qty_step
+
+    def spec(self, order) -> OrderSpec:
+        """Normalise a live order dict or a desired order onto the exchange grid."""
+        if isinstance(order, OrderSpec):
+            return OrderSpec(order.side, self.price(order.price), self.quantity(order.quantity), order.order_id)
+        # Live orders already sit on the grid; snap to nearest to absorb float noise
+        return OrderSpec(order["side"], self.price(order["price"]), self.quantity(order["quantity"], ROUND_HALF_UP), order.get("order_id"))
+
+@dataclass
+class OrderDiff:
+    """Minimal set of actions turning the live orders into the desired ones."""
+
+    keep: List[OrderSpec] = field(default_factory=list)
+    amend: List[Tuple[OrderSpec, OrderSpec]] = field(default_factory=list)  # (live, desired)
+    cancel: List[OrderSpec] = field(default_factory=list)
+    place: List[OrderSpec] = field(default_factory=list)
+
+    @property
+    def is_noop(self) -> bool:
+        return not (self.amend or self.cancel or self.place)
+
+    def __str__(self):
+        return f"keep={len(self.keep)} amend={len(self.amend)} cancel={len(self.cancel)} place={len(self.place)}"
+
+def reconcile(desired, live, filters: SymbolFilters) -> OrderDiff:
+    """Diff desired orders against live ones on the exchange grid.
+
+    Exact (side, price, quantity) matches are kept, so they hold their
+    queue position. Orders left over at the same side and price become
+    amends, and everything else is cancelled or placed.
+    """
+    diff = OrderDiff()
+    wanted = [filters.spec(d) for d in desired]
+    wanted = [d for d in wanted if d.quantity > 0]
+    remaining = [filters.spec(o) for o in live]
+
+    unmatched = []
+    for d in wanted:
+        match = next((o for o in remaining if (o.side, o.price, o.quantity) == (d.side, d.price, d.quantity)), None)
+        if match is None:
+            unmatched.append(d)
+        else:
+            remaining.remove(match)
+            diff.keep.append(match)
+
+    for d in unmatched:
+        match = next((o for o in remaining if (o.side, o.price) == (d.side, d.price)), None)
+        if match is None:
+            diff.place.append(d)
+        else:
+            remaining.remove(match)
+            diff.amend.append((match, d))
+
+    diff.cancel.extend(remaining)
+    return diff
+
+async def apply_diff(feeder, symbol: str, diff: OrderDiff, available):
+    """Send only the actions in the diff through the order pipeline.
+
+    MEXC has no amend endpoint, so an amend is a cancel followed by a place.
+    `available` is the free quote balance the tick started with; funds
+    freed by cancels are added without re-fetching balances. Returns the
+    resulting open orders as dicts.
+    """
+    cancels = [_as_dict(o) for o in diff.cancel] + [_as_dict(live) for live, _ in diff.amend]
+    places = [_as_dict(desired) for _, desired in diff.amend] + [_as_dict(o) for o in diff.place]
+    # Nothing to keep means every live order goes, which one cancel-all request covers
+    report = await feeder.execute_orders(symbol, cancels, places, Decimal(str(available)), cancel_all=not diff.keep)
+    return [_as_dict(o) for o in diff.keep] + report.cancel_failed + report.placed
+
+def _as_dict(order: OrderSpec) -> dict:
+    return {"order_id": order.order_id, "side": order.side, "quantity": order.quantity, "price": order.price}
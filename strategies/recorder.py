@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+import numpy as np
+from config import Config
+from strategies.kline_store import KlineView
+from strategies.kline_archive import KlineArchive
+
+logger = logging.getLogger(__name__)
+
+class KlineRecorder:
+    """Record closed candles to the kline archive in batches, off the trading loop."""
+
+    def __init__(self, config: Config, symbol: str = None):
+        self.archive = KlineArchive(config.ARCHIVE_DIR, symbol or config.SYMBOL, config.INTERVAL, config.ARCHIVE_SEGMENT_ROWS)
+        self.retention_days = config.ARCHIVE_RETENTION_DAYS
+        self.last_compacted = time.monotonic()
+        self.flush_interval = config.RECORD_FLUSH_INTERVAL
+        self.queue = asyncio.Queue(maxsize=config.RECORD_QUEUE_SIZE)
+        self.last_recorded = None
+        self._task = None
+
+    def record(self, klines: KlineView):
+        """Queue candles that closed since the last call; never blocks."""
+        # Only the newest candle can still be open; the exchange's clock, not ours, decides when it closes
+        closed = np.arange(len(klines)) < len(klines) - 1
+        if self.last_recorded is not None:
+            closed &= klines.open_time > self.last_recorded
+        if not closed.any():
+            return
+        rows = [
+            [int(t), o, h, l, c, v, int(ct), klines.symbol]
+            for t, o, h, l, c, v, ct in zip(
+                klines.open_time[closed], klines.open[closed].tolist(), klines.high[closed].tolist(),
+                klines.low[closed].tolist(), klines.close[closed].tolist(), klines.volume[closed].tolist(),
+                klines.close_time[closed]
+            )
+        ]
+        try:
+            self.queue.put_nowait(rows)
+            self.last_recorded = rows[-1][0]
+        except asyncio.QueueFull:
+            logger.warning(f"Recorder queue full, dropping {len(rows)} klines")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush whatever is queued and stop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if time.monotonic() - self.last_compacted > 86400:
+                self.last_compacted = time.monotonic()
+                try:
+                    await asyncio.to_thread(self.archive.compact, self.retention_days)
+                except Exception as e:
+                    logger.error(f"Kline archive compaction error: {e}")
+
+    async def flush(self):
+        """Drain the queue and append it to the archive in a worker thread."""
+        rows = []
+        while not self.queue.empty():
+            rows.extend(self.queue.get_nowait())
+        if rows:
+            try:
+                await asyncio.to_thread(self._write, rows)
+            except Exception as e:
+                logger.error(f"Kline recorder write error: {e}")
+
+    def _write(self, rows):
+        written = self.archive.append_rows(rows)
+        logger.info(f"Recorded {written} klines to {self.archive.directory}")
@@ -0,0 +1,95 @@
+import importlib
+import json
+import logging
+from pathlib import Path
+import numpy as np
+from config import Config
+from strategies.template import TemplateStrategy
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_DIR = Path(__file__).parent
+
+class StrategyRegistry:
+    """Strategies declared as data in strategies/*/strategy.json.
+
+    A spec names the strategy, its priority (lower wins), its selection
+    predicate and its order template:
+
+        {"name": "high_spread_004", "priority": 0, "max_orders": 3,
+         "when": {"range_ewma": {"min": 0.5, "exit_min": 0.4}},
+         "orders": [{"side": "buy", "price": 1.0, "fraction": 0.5}]}
+
+    Each condition bounds one indicator with min/max; exit_min/exit_max
+    replace them while the strategy is the selected one, which gives
+    hysteresis. All predicates are compiled into bound matrices and
+    evaluated together in one NumPy pass. A spec with "module" and "class"
+    uses that class instead of the template; it is imported only when the
+    strategy is first selected.
+    """
+
+    def __init__(self, config: Config, specs: list):
+        self.config = config
+        self.specs = sorted(specs, key=lambda s: s.get("priority", 0))
+        self.names = [s["name"] for s in self.specs]
+        self.metrics = sorted({m for s in self.specs for m in s.get("when", {})})
+        shape = (len(self.specs), len(self.metrics))
+        self.lo = np.full(shape, -np.inf)
+        self.hi = np.full(shape, np.inf)
+        self.exit_lo = np.full(shape, -np.inf)
+        self.exit_hi = np.full(shape, np.inf)
+        for i, spec in enumerate(self.specs):
+            for metric, bounds in spec.get("when", {}).items():
+                j = self.metrics.index(metric)
+                self.lo[i, j] = bounds.get("min", -np.inf)
+                self.hi[i, j] = bounds.get("max", np.inf)
+                self.exit_lo[i, j] = bounds.get("exit_min", self.lo[i, j])
+                self.exit_hi[i, j] = bounds.get("exit_max", self.hi[i, j])
+        self._loaded = {}
+
+    @classmethod
+    def discover(cls, config: Config, root: Path = STRATEGY_DIR):
+        """Read every strategy.json under root without importing any strategy code."""
+        specs = []
+        for path in sorted(Path(root).glob("*/strategy.json")):
+            try:
+                spec = json.loads(path.read_text())
+                spec.setdefault("name", path.parent.name)
+                specs.append(spec)
+            except (OSError, ValueError) as e:
+                logger.error(f"Skipping strategy spec {path}: {e}")
+        logger.info(f"Discovered strategies: {', '.join(s['name'] for s in specs)}")
+        return cls(config, specs)
+
+    def __len__(self):
+        return len(self.specs)
+
+    def evaluate(self, indicators: dict, current: int = None) -> np.ndarray:
+        """Boolean mask of strategies whose predicate holds; `current` uses its exit bounds.
+
+        A missing or NaN indicator fails every bound placed on it.
+        """
+        x = np.array([indicators.get(m, np.nan) for m in self.metrics], dtype=np.float64)
+        lo, hi = self.lo, self.hi
+        if current is not None:
+            lo, hi = lo.copy(), hi.copy()
+            lo[current], hi[current] = self.exit_lo[current], self.exit_hi[current]
+        unbounded = np.isneginf(lo) & np.isposinf(hi)
+        return (unbounded | ((x >= lo) & (x <= hi))).all(axis=1)
+
+    def select(self, indicators: dict, current: int = None):
+        """Index of the highest-priority matching strategy, or None."""
+        matches = np.flatnonzero(self.evaluate(indicators, current))
+        return int(matches[0]) if len(matches) else None
+
+    def get(self, index: int):
+        """Strategy instance for a spec, built (and its module imported) on first use."""
+        if index not in self._loaded:
+            spec = self.specs[index]
+            if "module" in spec:
+                module = importlib.import_module(spec["module"])
+                self._loaded[index] = getattr(module, spec["class"])(self.config)
+            else:
+                self._loaded[index] = TemplateStrategy(self.config, spec)
+            logger.info(f"Loaded strategy {spec['name']}")
+        return self._loaded[index]
@@ -1,46 +1,47 @@
 import logging
-from pathlib import Path
 from config import Config
-from strategies.high_spread_004 import HighSpreadStrategy
-from strategies.low_spread_001 import LowSpreadStrategy
+from strategies.kline_store import KlineView
+from strategies.indicators import IndicatorEngine
+from strategies.registry import StrategyRegistry
 
 logger = logging.getLogger(__name__)
 
 class Scanner:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, registry: StrategyRegistry = None):
         self.config = config
-        self.strategies = []
+        self.registry = registry
+        self.indicators = IndicatorEngine(config)
+        self.current = None  # index of the selected strategy in the registry
 
     async def initialize_strategies(self):
-        """Initialize trading strategies."""
+        """Discover strategy specs; their code is loaded on first selection."""
         try:
-            self.strategies = [HighSpreadStrategy(self.config), LowSpreadStrategy(self.config)]
-            logger.info("Strategies initialized: high_spread_004, low_spread_001")
+            if self.registry is None:
+                self.registry = StrategyRegistry.discover(self.config)
         except Exception as e:
             logger.error(f"Error initializing strategies: {e}")
 
-    async def select_strategy(self, klines_file: str):
-        """Select strategy based on spread."""
+    async def select_strategy(self, klines: KlineView):
+        """Select the highest-priority strategy whose predicate holds on the current indicators."""
         try:
-            with open(klines_file, "r") as f:
-                klines = [line.strip().split(",") for line in f.readlines()]
-
-            if not klines:
+            if klines is None or not len(klines):
                 logger.warning("No Klines data available")
                 return None
 
-            latest_kline = klines[-1]
-            high, low = float(latest_kline[2]), float(latest_kline[3])
-            spread = (high - low) / low * 100
+            self.indicators.update(klines)
+            values = self.indicators.values()
+            high, low = klines.high[-1], klines.low[-1]
+            values["range_current"] = (high - low) / low * 100 if low else float("nan")
 
-            if spread > 0.5:
-                logger.info("High spread detected, selecting high_spread_004")
-                return self.strategies[0]  # HighSpreadStrategy
-            elif spread <= 0.5:
-                logger.info("Low spread detected, selecting low_spread_001")
-                return self.strategies[1]  # LowSpreadStrategy
-            logger.info("No suitable strategy found")
-            return None
+            selected = self.registry.select(values, self.current)
+            if selected != self.current:
+                name = self.registry.names[selected] if selected is not None else None
+                logger.info(f"Strategy switch: {name} (range_ewma {values['range_ewma']:.3f}%)")
+                self.current = selected
+            if selected is None:
+                logger.info("No suitable strategy found")
+                return None
+            return self.registry.get(selected)
         except Exception as e:
             logger.error(f"Error selecting strategy: {e}")
             return None
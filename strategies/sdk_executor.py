@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from strategies.rate_limit import Priority, WeightScheduler
+from strategies.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+class SdkTimeout(asyncio.TimeoutError):
+    """An SDK call timed out; started says whether a worker had begun it, so it may still complete."""
+
+    def __init__(self, method: str, timeout: float, started: bool):
+        super().__init__(f"SDK {method} timed out after {timeout}s")
+        self.started = started
+
+class SdkExecutor:
+    """Run blocking mexc_sdk Spot calls in a bounded thread pool."""
+
+    def __init__(self, client, config: Config, scheduler: WeightScheduler = None):
+        self.client = client
+        self.scheduler = scheduler
+        self.timeout = config.SDK_TIMEOUT
+        self.max_workers = config.SDK_MAX_WORKERS
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mexc-sdk")
+        self._slots = asyncio.Semaphore(config.SDK_MAX_PENDING)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._stats = {}
+
+    async def call(self, method: str, *args, timeout: float = None, priority: Priority = Priority.MARKET_DATA, weight: int = 1, **kwargs):
+        """Call client.<method>(*args, **kwargs) off the event loop with a timeout."""
+        if self.scheduler is not None:
+            await self.scheduler.acquire(priority, weight)
+        loop = asyncio.get_running_loop()
+        fn = getattr(self.client, method)
+        submitted = time.perf_counter()
+        state = {"started": None, "abandoned": False}
+
+        def run():
+            with self._lock:
+                if state["abandoned"]:
+                    return None
+                state["started"] = time.perf_counter()
+                self._queued -= 1
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        async with self._slots:
+            with self._lock:
+                self._queued += 1
+            future = loop.run_in_executor(self._pool, run)
+            ok = False
+            try:
+                result = await asyncio.wait_for(future, timeout or self.timeout)
+                ok = True
+                return result
+            except asyncio.TimeoutError:
+                logger.error(f"SDK {method} timed out after {timeout or self.timeout}s")
+                with self._lock:
+                    started = state["started"] is not None
+                    if not started:
+                        state["abandoned"] = True
+                        self._queued -= 1
+                raise SdkTimeout(method, timeout or self.timeout, started) from None
+            finally:
+                with self._lock:
+                    if state["started"] is None and not state["abandoned"]:
+                        # Timed out or cancelled before a worker picked it up
+                        state["abandoned"] = True
+                        self._queued -= 1
+                self._record(method, submitted, state["started"], ok)
+
+    def _record(self, method: str, submitted: float, started, ok: bool):
+        """Accumulate queue wait and call latency per SDK method."""
+        now = time.perf_counter()
+        stats = self._stats.setdefault(method, {"calls": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0, "wait_s": 0.0})
+        stats["calls"] += 1
+        stats["errors"] += 0 if ok else 1
+        elapsed = now - submitted
+        stats["total_s"] += elapsed
+        stats["max_s"] = max(stats["max_s"], elapsed)
+        stats["wait_s"] += (started or now) - submitted
+        METRICS.observe("api_request_seconds", elapsed, method="SDK", endpoint=method)
+        if not ok:
+            METRICS.inc("api_errors_total", endpoint=method, status="SDK")
+
+    def stats(self) -> dict:
+        """Return queue depth and per-method latency figures."""
+        methods = {
+            name: {
+                "calls": s["calls"],
+                "errors": s["errors"],
+                "avg_ms": s["total_s"] / s["calls"] * 1000,
+                "max_ms": s["max_s"] * 1000,
+                "avg_wait_ms": s["wait_s"] / s["calls"] * 1000,
+            }
+            for name, s in self._stats.items()
+        }
+        return {"queued": self._queued, "running": self._running, "workers": self.max_workers, "methods": methods}
+
+    def shutdown(self):
+        """Stop accepting work; running SDK calls finish in the background."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,34 @@
+import hashlib
+import hmac
+from urllib.parse import urlencode
+
+class RequestSigner:
+    """HMAC-SHA256 signer for MEXC signed endpoints with a precomputed key state."""
+
+    def __init__(self, api_key: str, api_secret: str):
+        self.api_key = api_key
+        # Keying HMAC once and copying it per request skips re-hashing the secret
+        self._mac = hmac.new(api_secret.encode(), digestmod=hashlib.sha256)
+
+    def sign(self, query: str) -> str:
+        """Return the hex signature for an encoded query string."""
+        mac = self._mac.copy()
+        mac.update(query.encode())
+        return mac.hexdigest()
+
+    def signed_query(self, params: dict) -> str:
+        """Encode params and append the signature parameter."""
+        query = urlencode([(k, v) for k, v in params.items() if v is not None])
+        return f"{query}&signature={self.sign(query)}"
+
+    def headers(self) -> dict:
+        """Headers required on every signed request."""
+        return {"X-MEXC-APIKEY": self.api_key, "Content-Type": "application/json"}
+
+def verify_signature(api_secret: str, query: str) -> bool:
+    """Check a received query string's signature, for local stand-in servers."""
+    payload, sep, signature = query.rpartition("&signature=")
+    if not sep:
+        return False
+    expected = hmac.new(api_secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
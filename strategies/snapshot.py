@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
+from strategies.kline_store import KlineView
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Everything one tick decides and draws from, fetched once and never mutated."""
+
+    symbol: str
+    timestamp: int  # ms, when the snapshot was built
+    klines: KlineView
+    balances: Mapping[str, float]
+    open_orders: Tuple[Mapping, ...]
+    fills: Tuple[Mapping, ...]
+    committed_buys: float = 0.0  # quote funds held by open buys on every symbol, not just this one
+
+    @classmethod
+    def build(cls, symbol: str, timestamp: int, klines: KlineView, balances: dict, open_orders: list, fills: list,
+              committed_buys: float = 0.0):
+        """Freeze freshly fetched data into a snapshot."""
+        return cls(
+            symbol=symbol,
+            timestamp=timestamp,
+            klines=klines.copy(),
+            balances=MappingProxyType(dict(balances or {})),
+            open_orders=tuple(MappingProxyType(dict(o)) for o in open_orders or []),
+            fills=tuple(MappingProxyType(dict(f)) for f in fills or []),
+            committed_buys=committed_buys,
+        )
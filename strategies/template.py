@@ -0,0 +1,72 @@
+import logging
+from pathlib import Path
+import json
+from config import Config
+from strategies.snapshot import MarketSnapshot
+from strategies.reconciler import OrderSpec, SymbolFilters, reconcile, apply_diff
+
+logger = logging.getLogger(__name__)
+
+def capital_share(config: Config, symbol: str) -> float:
+    """Share of the quote funds a symbol trades with: its SYMBOL_ALLOCATION entry, else an equal part of what is unallocated."""
+    allocation = config.SYMBOL_ALLOCATION
+    if symbol in allocation:
+        return allocation[symbol]
+    unlisted = [s for s in config.SYMBOLS if s not in allocation]
+    return max(1.0 - sum(allocation.values()), 0.0) / len(unlisted) if unlisted else 0.0
+
+class TemplateStrategy:
+    """Strategy whose orders come from the template in its strategy.json.
+
+    Each template order is {"side", "price", "fraction"}: a buy for
+    `fraction` of the symbol's capital at `price`. The capital is the
+    symbol's capital_share of the quote funds (free plus committed to open
+    buys on every symbol), and new buys only spend what is left of it, so
+    symbols never compete for the shared balance. At most `max_orders` are
+    kept.
+    """
+
+    def __init__(self, config: Config, spec: dict):
+        self.config = config
+        self.name = spec["name"]
+        self.max_orders = spec.get("max_orders", len(spec.get("orders", [])))
+        self.template = spec.get("orders", [])
+
+    def desired_orders(self, total_usdt: float) -> list:
+        return [
+            OrderSpec(o["side"], o["price"], total_usdt * o["fraction"] / o["price"])
+            for o in self.template[:self.max_orders]
+        ]
+
+    async def manage_orders(self, feeder, config: Config, dynamic_dir: Path, snapshot: MarketSnapshot):
+        """Reconcile open orders with the template."""
+        try:
+            open_orders = [dict(o) for o in snapshot.open_orders]
+            balances = snapshot.balances
+            available_usdt = balances.get("USDT", 0)
+
+            if not balances:
+                logger.warning("Balances not available, skipping order management")
+                return False
+
+            open_value = sum(float(o["quantity"]) * float(o["price"]) for o in open_orders if o["side"] == "buy")
+            committed = max(snapshot.committed_buys, open_value)
+            total_usdt = (available_usdt + committed) * capital_share(config, snapshot.symbol)
+            available_usdt = min(available_usdt, max(total_usdt - open_value, 0.0))
+
+            diff = reconcile(self.desired_orders(total_usdt), open_orders, SymbolFilters.from_config(config, snapshot.symbol))
+            if diff.is_noop:
+                logger.info(f"{self.name}: orders up to date ({len(diff.keep)} kept)")
+            else:
+                logger.info(f"{self.name}: reconciling orders: {diff}")
+                open_orders = await apply_diff(feeder, snapshot.symbol, diff, available_usdt)
+
+            order_log = dynamic_dir / "order_log.json"
+            order_log.parent.mkdir(parents=True, exist_ok=True)
+            with order_log.open("w") as f:
+                json.dump({"open_orders": open_orders}, f, indent=2, default=float)
+            logger.info(f"Order log saved: {order_log}")
+            return True
+        except Exception as e:
+            logger.error(f"{self.name}: Error in manage_orders: {e}")
+            return False
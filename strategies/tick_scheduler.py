@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from config import Config
+from strategies.snapshot import MarketSnapshot
+
+logger = logging.getLogger(__name__)
+
+class TickScheduler:
+    """Decide when one symbol's strategy should run.
+
+    Streams wake the scheduler on pushes; without them it polls at
+    CHECK_INTERVAL on a fixed-rate clock. Either way a tick only reaches
+    the strategy when its inputs changed: a new candle, a price or spread
+    move beyond the thresholds, a fill, or a balance or open-order change.
+    A heartbeat forces a tick every TICK_HEARTBEAT seconds regardless.
+    Failed ticks back off exponentially, up to the heartbeat, so an
+    unreachable exchange is not polled in a tight loop.
+    """
+
+    def __init__(self, config: Config, symbol: str, streaming=None):
+        self.symbol = symbol
+        self.poll_interval = config.CHECK_INTERVAL
+        self.heartbeat = config.TICK_HEARTBEAT
+        self.debounce = config.TICK_DEBOUNCE
+        self.min_interval = config.TICK_MIN_INTERVAL
+        self.price_threshold = config.TICK_PRICE_THRESHOLD
+        self.spread_threshold = config.TICK_SPREAD_THRESHOLD
+        self.streaming = streaming or (lambda: False)  # True while pushes keep the inputs current
+        self.evaluated = 0
+        self.skipped = 0
+        self._wake = asyncio.Event()
+        self._next_poll = time.monotonic() - self.poll_interval  # first wait returns at once
+        self._last_run = 0.0
+        self._last_wake = 0.0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._last = None  # inputs of the last evaluated tick
+
+    def notify(self):
+        """Wake the scheduler; called from stream callbacks."""
+        self._wake.set()
+
+    def failed(self):
+        """Back off after a tick that produced no snapshot."""
+        self._failures += 1
+        self._retry_at = time.monotonic() + min(self.poll_interval * 2 ** (self._failures - 1), self.heartbeat)
+
+    async def wait(self):
+        """Sleep until a push arrives, or until the next poll when nothing is streaming."""
+        # Pushes do not cut a back-off short
+        await asyncio.sleep(max(self._retry_at - time.monotonic(), 0))
+        now = time.monotonic()
+        if self.streaming():
+            timeout = self._last_run + self.heartbeat - now
+        else:
+            # Fixed-rate polling: work time does not stretch the cadence
+            self._next_poll = max(self._next_poll + self.poll_interval, now)
+            timeout = self._next_poll - now
+        try:
+            await asyncio.wait_for(self._wake.wait(), max(timeout, 0))
+        except asyncio.TimeoutError:
+            pass
+        if self._wake.is_set():
+            # Let a burst of pushes land, and cap how often pushes can trigger a snapshot
+            await asyncio.sleep(max(self.debounce, self._last_wake + self.min_interval - time.monotonic()))
+        self._wake.clear()
+        self._last_wake = time.monotonic()
+
+    def should_run(self, snapshot: MarketSnapshot):
+        """Return why this snapshot needs a strategy tick, or None to skip it."""
+        self._failures = 0  # a snapshot arrived, so the exchange is reachable again
+        klines = snapshot.klines
+        close, high, low = float(klines.close[-1]), float(klines.high[-1]), float(klines.low[-1])
+        inputs = {
+            "candle": int(klines.open_time[-1]),
+            "close": close,
+            "spread": (high - low) / low * 100 if low else 0.0,
+            "fill": snapshot.fills[-1]["id"] if snapshot.fills else None,
+            "balance": tuple(sorted(snapshot.balances.items())),
+            "orders": tuple(sorted((str(o["order_id"]), o["side"], o["price"], o["quantity"]) for o in snapshot.open_orders)),
+        }
+        reason = self._changed(inputs)
+        if reason is None and time.monotonic() - self._last_run >= self.heartbeat:
+            reason = "heartbeat"
+        if reason is None:
+            self.skipped += 1
+            return None
+        self._last = inputs
+        self._last_run = time.monotonic()
+        self.evaluated += 1
+        return reason
+
+    def _changed(self, inputs: dict):
+        last = self._last
+        if last is None:
+            return "start"
+        if inputs["candle"] != last["candle"]:
+            return "candle"
+        if last["close"] and abs(inputs["close"] - last["close"]) / last["close"] >= self.price_threshold:
+            return "price"
+        if abs(inputs["spread"] - last["spread"]) >= self.spread_threshold:
+            return "spread"
+        for key in ("fill", "balance", "orders"):
+            if inputs[key] != last[key]:
+                return key
+        return None
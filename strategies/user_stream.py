@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+import aiohttp
+from config import Config
+from strategies.http_client import HttpClient
+from strategies.API_Requests import create_listen_key_http, keepalive_listen_key_http, close_listen_key_http
+from strategies.account_state import AccountState
+
+logger = logging.getLogger(__name__)
+
+LISTEN_KEY_KEEPALIVE = 30 * 60  # seconds; keys expire after 60 minutes without one
+
+CHANNELS = [
+    "spot@private.account.v3.api",
+    "spot@private.orders.v3.api",
+    "spot@private.deals.v3.api",
+]
+
+# Order status codes pushed on the private orders channel
+ORDER_STATUS = {1: "new", 2: "filled", 3: "partially_filled", 4: "canceled", 5: "partially_canceled"}
+
+class UserDataStream:
+    """Keep an AccountState current from the private account, orders and deals channels."""
+
+    def __init__(self, http: HttpClient, config: Config, state: AccountState, on_connect=None, on_update=None):
+        self.http = http
+        self.config = config
+        self.state = state
+        self.on_connect = on_connect  # async callback run after each (re)connect to resync over REST
+        self.on_update = on_update  # callback(symbol) after each event; symbol is None for balances
+        self.connected = False
+        self.listen_key = None
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+        if self.listen_key:
+            await close_listen_key_http(self.http, self.config, self.listen_key)
+            self.listen_key = None
+
+    async def _run(self):
+        """Connect with a fresh listen key and consume messages, reconnecting with backoff."""
+        delay = 1.0
+        while True:
+            try:
+                if self.listen_key is None:
+                    self.listen_key = await create_listen_key_http(self.http, self.config)
+                if self.listen_key is None:
+                    raise RuntimeError("no listen key")
+                session = await self.http.get_session()
+                async with session.ws_connect(f"{self.config.WS_URL}?listenKey={self.listen_key}", heartbeat=None) as ws:
+                    await ws.send_json({"method": "SUBSCRIPTION", "params": CHANNELS})
+                    self.connected = True
+                    delay = 1.0
+                    logger.info("User data stream connected")
+                    # Events missed while disconnected are recovered from a REST snapshot
+                    if self.on_connect:
+                        await self.on_connect()
+                    keepalive = asyncio.create_task(self._keepalive(ws))
+                    try:
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                self.handle_message(json.loads(msg.data))
+                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                    finally:
+                        keepalive.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"User data stream error: {e}")
+                # The key may have expired; the next attempt opens a new one
+                self.listen_key = None
+            self.connected = False
+            logger.warning(f"User data stream disconnected, reconnecting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
+    async def _keepalive(self, ws):
+        """Ping the socket and renew the listen key; a rejected renewal forces a new key."""
+        elapsed = 0.0
+        while True:
+            await asyncio.sleep(self.config.STREAM_PING_INTERVAL)
+            await ws.send_json({"method": "PING"})
+            elapsed += self.config.STREAM_PING_INTERVAL
+            if elapsed >= LISTEN_KEY_KEEPALIVE:
+                elapsed = 0.0
+                if not await keepalive_listen_key_http(self.http, self.config, self.listen_key):
+                    self.listen_key = None
+                    await ws.close()
+                    return
+
+    def handle_message(self, data: dict):
+        """Apply a pushed balance, order or fill update to the account state."""
+        channel = data.get("c", "")
+        payload = data.get("d", {})
+        symbol = data.get("s")
+        if channel.startswith("spot@private.account"):
+            self.state.apply_balance(payload["a"], float(payload["f"]), float(payload["l"]))
+        elif channel.startswith("spot@private.orders"):
+            order = {
+                "order_id": payload["i"],
+                "side": "buy" if payload["S"] == 1 else "sell",
+                "price": float(payload["p"]),
+                "quantity": float(payload["v"])
+            }
+            self.state.apply_order(symbol, order, payload["s"])
+            logger.info(f"Order {order['order_id']} {ORDER_STATUS.get(payload['s'], payload['s'])}")
+        elif channel.startswith("spot@private.deals"):
+            self.state.apply_fill(symbol, {
+                "id": payload["t"],
+                "order_id": payload["i"],
+                "price": float(payload["p"]),
+                "side": "buy" if payload["S"] == 1 else "sell",
+                "timestamp": payload["T"],
+                "quantity": float(payload["v"])
+            })
+        else:
+            return
+        if self.on_update:
+            self.on_update(symbol)
@@ -0,0 +1,70 @@
+import asyncio
+import contextlib
+import importlib.machinery
+import importlib.util
+import sys
+import tempfile
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Tests run on the template defaults, never on a local config.py that may hold real keys
+_loader = importlib.machinery.SourceFileLoader("config", str(ROOT / "config.py.template"))
+_config = importlib.util.module_from_spec(importlib.util.spec_from_loader("config", _loader))
+_loader.exec_module(_config)
+sys.modules["config"] = _config
+
+from aiohttp import web
+from config import Config
+from simulator import SimExchange, create_app
+
+SYMBOL = "USD1USDT"
+
+class Simulated:
+    """A running simulator plus a Config pointing every HTTP and WebSocket call at it."""
+
+    def __init__(self, exchange: SimExchange, config: Config):
+        self.exchange = exchange
+        self.config = config
+
+@contextlib.asynccontextmanager
+async def _simulator(symbols=(SYMBOL,), balances=None, faults=None, recv_window_check=True, history=100):
+    """Serve a SimExchange on a free local port; the clock only moves on exchange.advance()."""
+    config = Config()
+    config.SYMBOLS = list(symbols)
+    config.API_KEY = "test-key"
+    config.API_SECRET = "test-secret"
+    balances = {"USDT": 1000.0, "USD1": 1000.0} if balances is None else balances
+    exchange = SimExchange(config.SYMBOLS, balances, config.INTERVAL, speed=0, history=history, seed=1)
+    runner = web.AppRunner(create_app(exchange, config.API_KEY, config.API_SECRET, faults, recv_window_check), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    config.BASE_URL = f"http://{host}:{port}"
+    config.WS_URL = f"ws://{host}:{port}/ws"
+    with tempfile.TemporaryDirectory() as tmp:
+        config.FILL_DIR = str(Path(tmp) / "fills")
+        try:
+            yield Simulated(exchange, config)
+        finally:
+            await runner.cleanup()
+
+@pytest.fixture
+def simulator():
+    """Factory for `async with simulator(...) as sim:` blocks."""
+    return _simulator
+
+@pytest.fixture
+def wait_until():
+    return _wait_until
+
+async def _wait_until(predicate, timeout: float = 3.0):
+    """Poll predicate until it holds; fails the test on timeout."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            pytest.fail("condition not met in time")
+        await asyncio.sleep(0.01)
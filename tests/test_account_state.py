@@ -0,0 +1,39 @@
+import asyncio
+from strategies import feeder as feeder_module
+from strategies.account_state import AccountState
+from strategies.feeder import Feeder
+
+SYMBOL = "USD1USDT"
+
+def test_acks_and_stream_events_keep_the_cache_current():
+    account = AccountState()
+    account.set_balances({"USDT": 100.0})
+    account.set_open_orders(SYMBOL, [])
+    account.on_placed(SYMBOL, {"order_id": 1, "side": "buy", "price": 0.5, "quantity": 100}, "USDT")
+    assert account.balances() == {"USDT": 50.0} and account.locked["USDT"] == 50.0
+    assert account.committed_buys() == 50.0
+    account.on_cancelled(SYMBOL, 1, "USDT")
+    assert account.balances() == {"USDT": 100.0} and account.open_orders(SYMBOL) == []
+    # A stream close that beats our own ack keeps the order out of the book
+    account.apply_order(SYMBOL, {"order_id": 2, "side": "sell", "price": 1.1, "quantity": 5.0}, 2)
+    account.on_placed(SYMBOL, {"order_id": 2, "side": "sell", "price": 1.1, "quantity": 5.0})
+    assert account.open_orders(SYMBOL) == []
+
+def test_failed_open_orders_fetch_is_not_an_empty_book(simulator, monkeypatch):
+    async def fail(*args, **kwargs):
+        return None
+
+    async def scenario():
+        async with simulator() as sim:
+            feeder = Feeder(sim.config)
+            try:
+                order_id = await feeder.place_order(SYMBOL, "buy", 10, 0.5)
+                assert [o["order_id"] for o in await feeder.query_open_orders(SYMBOL)] == [order_id]
+                monkeypatch.setattr(feeder_module, "query_open_orders_http", fail)
+                assert await feeder.query_open_orders(SYMBOL) is None
+                # The cache keeps its last good book, and no snapshot is built without one
+                assert [o["order_id"] for o in feeder.account.open_orders(SYMBOL)] == [order_id]
+                assert await feeder.get_snapshot(SYMBOL) is None
+            finally:
+                await feeder.close()
+    asyncio.run(scenario())
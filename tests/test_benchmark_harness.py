@@ -0,0 +1,16 @@
+from benchmarks.harness import compare, machine, same_machine
+
+def _baseline(**medians):
+    return {"results": {name: {"median_ms": ms} for name, ms in medians.items()}}
+
+def test_compare_needs_both_ratio_and_delta():
+    results = {"slow": {"median_ms": 20.0}, "noisy": {"median_ms": 0.5}, "fast": {"median_ms": 5.0}, "new": {"median_ms": 1.0}}
+    rows = compare(results, _baseline(slow=10.0, noisy=0.2, fast=10.0), tolerance=0.25, min_delta_ms=1.0)
+    assert {row["case"]: row["status"] for row in rows} == {"slow": "REGRESSED", "noisy": "ok", "fast": "improved"}
+
+def test_same_machine_ignores_kernel_and_patch_version():
+    here = machine()
+    python = here["python"].rsplit(".", 1)[0]
+    assert same_machine(dict(here, platform="some other kernel", python=python + ".99"))
+    assert not same_machine(dict(here, node=here["node"] + "-ci"))
+    assert not same_machine(dict(here, cpus=(here["cpus"] or 1) + 1))
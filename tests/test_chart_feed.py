@@ -0,0 +1,56 @@
+from strategies.kline_store import KlineStore
+from strategies.snapshot import MarketSnapshot
+from web_server.chart_feed import ChartFeed
+
+SYMBOL = "USD1USDT"
+MINUTE = 60_000
+
+def _row(i, close=1.0):
+    return [i * MINUTE, 1.0, max(close, 1.0), min(close, 1.0), close, 1.0, (i + 1) * MINUTE - 1]
+
+def _snapshot(store, orders=()):
+    return MarketSnapshot.build(SYMBOL, 0, store.view(), {}, list(orders), [])
+
+def _events(feed):
+    events = []
+    while not feed._queue.empty():
+        events.append(feed._queue.get_nowait())
+    return events
+
+def test_first_publish_is_a_snapshot_then_deltas():
+    feed = ChartFeed(socketio=None)
+    store = KlineStore(SYMBOL, 5)
+    store.update([_row(i) for i in range(3)])
+    feed.publish(_snapshot(store))
+    [(event, data)] = _events(feed)
+    assert event == "chart_snapshot" and [c[0] for c in data["candles"]] == [0, MINUTE, 2 * MINUTE]
+
+    # Nothing changed: nothing sent
+    feed.publish(_snapshot(store))
+    assert _events(feed) == []
+
+    store.update([_row(2, close=1.1), _row(3)])
+    order = {"order_id": 7, "side": "buy", "price": 0.9, "quantity": 10.0}
+    feed.publish(_snapshot(store, [order]))
+    [(event, data)] = _events(feed)
+    assert event == "chart_update" and data["seq"] == 2
+    assert [c[0] for c in data["candles"]] == [2 * MINUTE, 3 * MINUTE]
+    assert data["orders_added"] == [{"id": "7", "side": "buy", "price": 0.9, "quantity": 10.0}]
+
+    feed.publish(_snapshot(store))
+    [(event, data)] = _events(feed)
+    assert data["orders_removed"] == ["7"] and "candles" not in data
+
+def test_backfilled_older_candles_resend_the_chart():
+    feed = ChartFeed(socketio=None)
+    store = KlineStore(SYMBOL, 10)
+    store.update([_row(0), _row(1), _row(4)])
+    feed.publish(_snapshot(store))
+    _events(feed)
+    # A gap backfill fills in candles 2 and 3 behind the newest one
+    store.update([_row(2), _row(3)])
+    feed.publish(_snapshot(store))
+    [(event, data)] = _events(feed)
+    assert event == "chart_snapshot"
+    assert [c[0] // MINUTE for c in data["candles"]] == [0, 1, 2, 3, 4]
+    assert feed.snapshot() == data
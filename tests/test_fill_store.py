@@ -0,0 +1,48 @@
+import asyncio
+import time
+from strategies import fill_store
+from strategies.fill_store import FillStore, sync_fills
+from strategies.http_client import HttpClient
+
+SYMBOL = "USD1USDT"
+
+def _fill(fill_id, timestamp, side="buy"):
+    return {"id": fill_id, "order_id": f"O{fill_id}", "price": 1.0, "side": side, "timestamp": timestamp, "quantity": 2.0}
+
+def test_add_dedupes_orders_and_persists(tmp_path):
+    store = FillStore(str(tmp_path), SYMBOL)
+    assert store.add([_fill(1, 100), _fill(2, 200)]) == 2
+    assert store.add([_fill(2, 200)]) == 0
+    # A late fill lands in time order
+    assert store.add([_fill(3, 150, "sell")]) == 1
+    assert [f["id"] for f in store.recent()] == ["1", "3", "2"]
+    assert store.cursor == 200
+    assert [f["id"] for f in store.between(150, 200)] == ["3"]
+    reopened = FillStore(str(tmp_path), SYMBOL)
+    assert reopened.recent() == store.recent()
+    assert reopened.add([_fill(1, 100)]) == 0
+
+def test_first_sync_pages_from_the_window_start(simulator, monkeypatch):
+    monkeypatch.setattr(fill_store, "TRADES_PAGE", 2)
+
+    async def scenario():
+        async with simulator() as sim:
+            engine = sim.exchange.engine
+            now = int(time.time() * 1000)
+            # Five fills inside the kline window, one minute apart
+            for i in range(5):
+                engine.place(SYMBOL, "buy", 1, 0.5)
+                engine.match(SYMBOL, 0.4, 0.6, now - (5 - i) * 60_000)
+            http = HttpClient(sim.config)
+            store = FillStore(None, SYMBOL)
+            try:
+                assert await sync_fills(http, sim.config, store) == 5
+                engine.place(SYMBOL, "buy", 1, 0.5)
+                engine.match(SYMBOL, 0.4, 0.6, now)
+                # Later syncs resume from the cursor
+                assert await sync_fills(http, sim.config, store) == 1
+            finally:
+                await http.close()
+            return [f["timestamp"] for f in store.recent()], [t["timestamp"] for t in engine.my_trades(SYMBOL, 0, 100)]
+    stored, traded = asyncio.run(scenario())
+    assert stored == traded and len(stored) == 6
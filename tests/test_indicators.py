@@ -0,0 +1,89 @@
+import asyncio
+import math
+import time
+import numpy as np
+import pytest
+from config import Config
+from strategies.indicators import IndicatorEngine
+from strategies.kline_store import KlineStore
+from strategies.registry import StrategyRegistry
+from strategies.scanner import Scanner
+
+SYMBOL = "USD1USDT"
+MINUTE = 60_000
+
+def _store(start, count, capacity=100):
+    store = KlineStore(SYMBOL, capacity)
+    store.update([[(start + i) * MINUTE, 1.0, 1.02, 0.98, 1.0, 10.0, (start + i + 1) * MINUTE - 1] for i in range(count)])
+    return store
+
+def test_newest_candle_counts_as_open_whatever_the_local_clock():
+    # A fast simulator clock puts every candle in the local future
+    future = int(time.time() * 1000) // MINUTE + 1000
+    store = _store(future, 10)
+    engine = IndicatorEngine(Config())
+    assert engine.update(store.view()) == 9
+    assert engine.last_open_time == (future + 8) * MINUTE
+    assert engine.update(store.view()) == 0
+    store.update([[(future + 10) * MINUTE, 1.0, 1.0, 1.0, 1.0, 1.0, (future + 11) * MINUTE - 1]])
+    assert engine.update(store.view()) == 1
+
+def _candles(count, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 1.0 + np.cumsum(rng.normal(0, 0.002, count))
+    high = close * (1 + rng.uniform(0, 0.01, count))
+    low = close * (1 - rng.uniform(0, 0.01, count))
+    volume = rng.uniform(1, 100, count)
+    return [[i * MINUTE, close[i], high[i], low[i], close[i], volume[i], (i + 1) * MINUTE - 1] for i in range(count)]
+
+def test_rolling_values_match_a_full_recompute():
+    config = Config()
+    config.INDICATOR_WINDOW, config.ATR_PERIOD, config.EWMA_LAMBDA = 5, 3, 0.9
+    rows = _candles(13)
+    store = KlineStore(SYMBOL, 20)
+    engine = IndicatorEngine(config)
+    # Candles arrive a few at a time; the last one stays open
+    for end in (4, 9, 13):
+        store.update(rows[:end])
+        engine.update(store.view())
+    closed = np.array(rows[:12], dtype=float)
+    high, low, close, volume = closed[:, 2], closed[:, 3], closed[:, 4], closed[:, 5]
+    ranges = (high - low) / low * 100
+
+    atr = high[0] - low[0]
+    ewma = ranges[0]
+    variance = 0.0
+    for i in range(1, 12):
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        atr = atr + (tr - atr) / min(i + 1, 3)
+        ewma = 0.9 * ewma + 0.1 * ranges[i]
+        variance = 0.9 * variance + 0.1 * math.log(close[i] / close[i - 1]) ** 2
+    window = slice(7, 12)  # the evicted candles no longer count
+    typical = (high + low + close) / 3
+    values = engine.values()
+    assert values["count"] == 12
+    assert values["atr"] == pytest.approx(atr)
+    assert values["range_ewma"] == pytest.approx(ewma)
+    assert values["range_last"] == pytest.approx(ranges[11])
+    assert values["volatility"] == pytest.approx(math.sqrt(variance))
+    assert values["vwap"] == pytest.approx((typical[window] * volume[window]).sum() / volume[window].sum())
+    assert values["range_p50"] == pytest.approx(np.sort(ranges[window])[2])
+    assert values["range_p90"] == pytest.approx(np.sort(ranges[window])[4])
+
+def test_empty_engine_reports_nan():
+    values = IndicatorEngine(Config()).values()
+    assert values["count"] == 0
+    assert all(math.isnan(values[k]) for k in ("atr", "range_ewma", "range_p50", "vwap"))
+
+def test_scanner_holds_a_strategy_until_its_exit_bound():
+    scanner = Scanner(Config(), StrategyRegistry.discover(Config()))
+
+    # A single open candle adds nothing, so range_ewma stays where the test puts it
+    async def select(range_ewma):
+        scanner.indicators.range_ewma = range_ewma
+        await scanner.select_strategy(_store(0, 1).view())
+        return scanner.current
+    assert asyncio.run(select(0.45)) == 1
+    assert asyncio.run(select(0.6)) == 0
+    assert asyncio.run(select(0.45)) == 0  # above exit_min 0.4
+    assert asyncio.run(select(0.3)) == 1
@@ -0,0 +1,62 @@
+import numpy as np
+from strategies.kline_archive import CURRENT, KlineArchive, import_snapshots
+
+SYMBOL = "USD1USDT"
+MINUTE = 60_000
+
+def _rows(start, count, close=1.0):
+    return [[(start + i) * MINUTE, close, close, close, close, 1.0, (start + i + 1) * MINUTE - 1, SYMBOL] for i in range(count)]
+
+def _write_snapshot(path, rows):
+    path.write_text("".join(",".join(str(v) for v in row) + "\n" for row in rows))
+
+def test_append_splits_segments_and_reads_ranges(tmp_path):
+    archive = KlineArchive(str(tmp_path), SYMBOL, "1m", segment_rows=4)
+    assert archive.append_rows(_rows(0, 10)) == 10
+    # Candles at or before the last open time are not appended again
+    assert archive.append_rows(_rows(8, 4)) == 2
+    assert len(archive.segments()) == 3 and len(archive) == 12
+    assert archive.last_open_time == 11 * MINUTE
+    assert list(archive.read(3 * MINUTE, 6 * MINUTE)["open_time"]) == [3 * MINUTE, 4 * MINUTE, 5 * MINUTE]
+
+def test_compact_switches_generations(tmp_path):
+    archive = KlineArchive(str(tmp_path), SYMBOL, "1m", segment_rows=4)
+    for i in range(5):
+        archive.append_rows(_rows(i * 2, 2))
+    before = archive.read()
+    assert archive.compact() == 10
+    assert (archive.directory / CURRENT).exists() and archive.live != archive.directory
+    assert [p.name for p in archive.directory.iterdir() if p.name != CURRENT] == [archive.live.name]
+    assert np.array_equal(archive.read(), before)
+    # Appends after a compaction go to the live generation
+    archive.append_rows(_rows(10, 1))
+    assert KlineArchive(str(tmp_path), SYMBOL, "1m", segment_rows=4).last_open_time == 10 * MINUTE
+
+def test_merge_keeps_older_candles(tmp_path):
+    archive = KlineArchive(str(tmp_path), SYMBOL, "1m")
+    archive.append_rows(_rows(5, 5, close=2.0))
+    # Older candles are added; ones the archive holds keep their archived values
+    assert archive.merge(np.array([tuple(r[:7]) for r in _rows(0, 7)], dtype=archive.read().dtype)) == 5
+    records = archive.read()
+    assert list(records["open_time"]) == [i * MINUTE for i in range(10)]
+    assert list(records["close"][5:]) == [2.0] * 5
+
+def test_import_merges_history_and_deletes_only_archived_files(tmp_path):
+    source = tmp_path / "klines"
+    source.mkdir()
+    root = str(tmp_path / "archive")
+    KlineArchive(root, SYMBOL, "1m").append_rows(_rows(10, 5))
+    _write_snapshot(source / "Klines_1", _rows(0, 12))
+    _write_snapshot(source / "Klines_2", _rows(12, 5))
+    assert import_snapshots(str(source), root, "1m", delete=True) == {SYMBOL: 12}
+    times = KlineArchive(root, SYMBOL, "1m").read()["open_time"]
+    assert list(times) == [i * MINUTE for i in range(17)]
+    assert list(source.iterdir()) == []
+
+def test_import_keeps_files_it_could_not_archive(tmp_path, monkeypatch):
+    source = tmp_path / "klines"
+    source.mkdir()
+    _write_snapshot(source / "Klines_1", _rows(0, 3))
+    monkeypatch.setattr(KlineArchive, "merge", lambda self, records: 0)
+    import_snapshots(str(source), str(tmp_path / "archive"), "1m", delete=True)
+    assert [p.name for p in source.iterdir()] == ["Klines_1"]
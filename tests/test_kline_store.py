@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from strategies.kline_store import KlineStore
+
+SYMBOL = "USD1USDT"
+MINUTE = 60_000
+
+def _row(i, close=1.0, volume=1.0):
+    return [i * MINUTE, close, close, close, close, volume, (i + 1) * MINUTE - 1, SYMBOL]
+
+def test_append_evicts_oldest_and_views_stay_contiguous():
+    store = KlineStore(SYMBOL, 4)
+    store.update([_row(i) for i in range(3)])
+    store.update([_row(3), _row(4), _row(5)])
+    view = store.view()
+    assert len(store) == 4 and store.last_open_time == 5 * MINUTE
+    assert list(view.open_time // MINUTE) == [2, 3, 4, 5]
+    assert view.timestamp == 2 * MINUTE
+    with pytest.raises(ValueError):
+        view.close[0] = 2.0
+
+def test_update_overwrites_current_candle_and_merges_late_rows():
+    store = KlineStore(SYMBOL, 10)
+    store.update([_row(0), _row(1), _row(4)])
+    store.update([_row(4, close=1.5), _row(5)])
+    # A late backfill fills the gap and replaces stale rows
+    store.update([_row(1, close=0.9), _row(2), _row(3)])
+    view = store.view()
+    assert list(view.open_time // MINUTE) == [0, 1, 2, 3, 4, 5]
+    assert list(view.close) == [1.0, 0.9, 1.0, 1.0, 1.5, 1.0]
+
+def test_update_last_moves_only_the_current_candle():
+    store = KlineStore(SYMBOL, 3)
+    store.update([_row(i) for i in range(5)])  # wraps the ring
+    store.update_last(1.2, volume=2.0)
+    store.update_last(0.8)
+    view = store.view()
+    assert list(view.close) == [1.0, 1.0, 0.8]
+    assert (view.high[-1], view.low[-1], view.volume[-1]) == (1.2, 0.8, 3.0)
+    assert np.all(view.high[:-1] == 1.0)
+
+def test_copy_is_detached_from_later_updates():
+    store = KlineStore(SYMBOL, 3)
+    store.update([_row(0), _row(1)])
+    frozen = store.view().copy()
+    store.update_last(2.0)
+    store.update([_row(2), _row(3)])
+    assert list(frozen.open_time // MINUTE) == [0, 1] and list(frozen.close) == [1.0, 1.0]
+    assert frozen.rows()[0] == [0, 1.0, 1.0, 1.0, 1.0, 1.0, MINUTE - 1, SYMBOL]
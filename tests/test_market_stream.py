@@ -0,0 +1,73 @@
+import asyncio
+import numpy as np
+from strategies.http_client import HttpClient
+from strategies.kline_store import KlineStore
+from strategies.market_stream import KlineStream, backfill_klines
+
+SYMBOL = "USD1USDT"
+
+def test_backfill_loads_window_then_only_new_candles(simulator):
+    async def scenario():
+        async with simulator(history=100) as sim:
+            http = HttpClient(sim.config)
+            store = KlineStore(SYMBOL, 50)
+            market = sim.exchange.markets[SYMBOL]
+            try:
+                assert await backfill_klines(http, sim.config, store) > 0
+                assert len(store) == 50
+                assert store.last_open_time == market.open_time(market.cursor)
+                sim.exchange.advance()
+                # A warm store asks only for its current candle onwards
+                assert await backfill_klines(http, sim.config, store) == 2
+                assert store.last_open_time == market.open_time(market.cursor)
+            finally:
+                await http.close()
+    asyncio.run(scenario())
+
+def test_stream_applies_pushed_klines(simulator, wait_until):
+    async def scenario():
+        async with simulator() as sim:
+            http = HttpClient(sim.config)
+            store = KlineStore(SYMBOL, 50)
+            updates = []
+            stream = KlineStream(http, sim.config, {SYMBOL: store}, on_update=updates.append)
+            market = sim.exchange.markets[SYMBOL]
+            stream.start()
+            try:
+                await wait_until(lambda: stream.connected and any(s.channels for s in sim.exchange.subscribers))
+                for _ in range(3):
+                    sim.exchange.advance()
+                await wait_until(lambda: store.last_open_time == market.open_time(market.cursor))
+                view = store.view()
+                assert float(view.close[-1]) == float(market.candles[market.cursor, 3])
+                assert updates and set(updates) == {SYMBOL}
+                assert stream.is_fresh(SYMBOL)
+            finally:
+                await stream.stop()
+                await http.close()
+    asyncio.run(scenario())
+
+def test_gap_triggers_backfill(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            http = HttpClient(sim.config)
+            store = KlineStore(SYMBOL, 50)
+            stream = KlineStream(http, sim.config, {SYMBOL: store})
+            market = sim.exchange.markets[SYMBOL]
+            try:
+                await backfill_klines(http, sim.config, store)
+                for _ in range(3):
+                    sim.exchange.advance()
+                stream.connected = True
+                latest = market.klines(market.open_time(market.cursor))[0]
+                # A push three candles ahead of the store leaves a gap the stream must fill over REST
+                stream.apply(SYMBOL, latest)
+                await asyncio.gather(*stream._backfills)
+                assert not stream._backfills
+                times = store.view().open_time
+                assert np.all(np.diff(times) == stream.interval_ms)
+                assert int(times[-1]) == market.open_time(market.cursor)
+            finally:
+                stream.connected = False
+                await http.close()
+    asyncio.run(scenario())
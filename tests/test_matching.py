@@ -0,0 +1,50 @@
+import pytest
+from strategies.matching import MatchingEngine, split_symbol
+
+SYMBOL = "USD1USDT"
+
+def test_split_symbol():
+    assert split_symbol("USD1USDT") == ("USD1", "USDT")
+    assert split_symbol("BTCUSDC") == ("BTC", "USDC")
+    with pytest.raises(ValueError):
+        split_symbol("USDT")
+
+def test_place_locks_funds_and_rejects_unfunded():
+    engine = MatchingEngine({"USDT": 100.0, "USD1": 10.0})
+    buy = engine.place(SYMBOL, "buy", 100, 0.5)
+    sell = engine.place(SYMBOL, "sell", 10, 1.1)
+    assert engine.free == {"USDT": 50.0, "USD1": 0.0}
+    assert engine.locked == {"USDT": 50.0, "USD1": 10.0}
+    assert engine.place(SYMBOL, "buy", 200, 0.5) is None
+    assert engine.place(SYMBOL, "sell", 1, 1.1) is None
+    assert engine.place(SYMBOL, "buy", 0, 0.5) is None
+    assert {o["order_id"] for o in engine.open_orders(SYMBOL)} == {buy, sell}
+
+def test_cancel_releases_funds():
+    engine = MatchingEngine({"USDT": 100.0})
+    order_id = engine.place(SYMBOL, "buy", 100, 0.5)
+    assert engine.cancel(SYMBOL, order_id)
+    assert not engine.cancel(SYMBOL, order_id)
+    assert engine.free["USDT"] == 100.0 and engine.locked["USDT"] == 0.0
+
+def test_fills_when_range_trades_through():
+    engine = MatchingEngine({"USDT": 100.0, "USD1": 10.0}, fee_rate=0.001)
+    buy = engine.place(SYMBOL, "buy", 100, 0.5)
+    sell = engine.place(SYMBOL, "sell", 10, 1.1)
+    # Range touches neither limit
+    assert engine.match(SYMBOL, 0.51, 1.09, 1) == []
+    fills = engine.match(SYMBOL, 0.5, 1.0, 2)
+    assert [(f["order_id"], f["price"], f["timestamp"]) for f in fills] == [(buy, 0.5, 2)]
+    assert engine.free["USD1"] == pytest.approx(100 - 0.1)  # buy fee comes out of the base asset
+    assert engine.locked["USDT"] == 0.0
+    fills = engine.match(SYMBOL, 1.0, 1.1, 3)
+    assert [f["order_id"] for f in fills] == [sell]
+    assert engine.free["USDT"] == pytest.approx(50 + 11 * 0.999)
+    assert engine.open_orders(SYMBOL) == []
+    assert [f["order_id"] for f in engine.my_trades(SYMBOL)] == [buy, sell]
+    assert [f["order_id"] for f in engine.my_trades(SYMBOL, start_time=3)] == [sell]
+
+def test_equity_values_base_at_price():
+    engine = MatchingEngine({"USDT": 100.0, "USD1": 10.0})
+    engine.place(SYMBOL, "buy", 100, 0.5)
+    assert engine.equity({SYMBOL: 2.0}) == pytest.approx(120.0)
@@ -0,0 +1,38 @@
+import asyncio
+from decimal import Decimal
+from strategies.feeder import Feeder
+
+SYMBOL = "USD1USDT"
+
+def test_refresh_with_cancel_all_keeps_new_orders(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            feeder = Feeder(sim.config)
+            try:
+                first = [{"side": "buy", "price": 0.5, "quantity": 10, "order_id": None} for _ in range(3)]
+                report = await feeder.execute_orders(SYMBOL, [], first, Decimal(1000))
+                assert len(report.placed) == 3 and report.requests == 1  # one batch
+                second = [{"side": "buy", "price": 0.6, "quantity": 10, "order_id": None} for _ in range(2)]
+                report = await feeder.execute_orders(SYMBOL, report.placed, second, Decimal(985), cancel_all=True)
+                assert len(report.cancelled) == 3
+                assert sorted(o["order_id"] for o in report.placed) == sorted(sim.exchange.engine.orders[SYMBOL])
+                assert {o["price"] for o in sim.exchange.engine.orders[SYMBOL].values()} == {0.6}
+            finally:
+                await feeder.close()
+    asyncio.run(scenario())
+
+def test_sell_amend_waits_for_its_cancel(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            feeder = Feeder(sim.config)
+            engine = sim.exchange.engine
+            try:
+                old = await feeder.place_order(SYMBOL, "sell", 800, 1.1)
+                # The bigger sell only fits once the old one releases its locked base
+                amend = [{"side": "sell", "price": 1.1, "quantity": 900, "order_id": None}]
+                report = await feeder.execute_orders(SYMBOL, [{"side": "sell", "price": 1.1, "quantity": 800, "order_id": old}], amend, Decimal(1000))
+                assert report.cancelled == [old] and report.place_failed == []
+                assert [o["quantity"] for o in engine.orders[SYMBOL].values()] == [900]
+            finally:
+                await feeder.close()
+    asyncio.run(scenario())
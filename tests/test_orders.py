@@ -0,0 +1,89 @@
+import asyncio
+from simulator import FaultProfile
+from strategies.API_Requests import find_order_id_http, place_order_http
+from strategies.feeder import Feeder
+
+SYMBOL = "USD1USDT"
+
+def _no_sdk(feeder: Feeder, calls: list):
+    """Record any SDK fallback instead of running it."""
+    async def fallback(*args, **kwargs):
+        calls.append(args)
+    feeder.sdk.call = fallback
+
+def test_place_and_cancel(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            feeder = Feeder(sim.config)
+            try:
+                order_id = await feeder.place_order(SYMBOL, "buy", 100, 0.5)
+                assert order_id in sim.exchange.engine.orders[SYMBOL]
+                assert sim.exchange.engine.locked["USDT"] == 50.0
+                assert await feeder.cancel_order(SYMBOL, order_id) is True
+                assert sim.exchange.engine.orders[SYMBOL] == {}
+                assert sim.exchange.engine.free["USDT"] == 1000.0
+            finally:
+                await feeder.close()
+    asyncio.run(scenario())
+
+def test_rejections_are_final(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            feeder = Feeder(sim.config)
+            calls = []
+            _no_sdk(feeder, calls)
+            try:
+                assert feeder.sdk_fallback is False
+                # Exchange refuses an unfunded order: no retry anywhere
+                assert await feeder.place_order(SYMBOL, "buy", 10_000, 0.5) is False
+                assert await place_order_http(feeder.http, sim.config, SYMBOL, "buy", 10_000, 0.5) is False
+                # Cancelling an order that is already gone counts as done; any other refusal is final
+                assert await feeder.cancel_order(SYMBOL, "SIM999") is True
+                assert await feeder.cancel_order("NOPEUSDT", "SIM1") is False
+            finally:
+                await feeder.close()
+            assert calls == []
+            assert sim.exchange.engine.orders.get(SYMBOL, {}) == {}
+    asyncio.run(scenario())
+
+def test_unreachable_exchange_is_not_an_order(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            sim.config.BASE_URL = "http://127.0.0.1:1"
+            feeder = Feeder(sim.config)
+            try:
+                # Never sent: None tells the caller another route is safe
+                return await place_order_http(feeder.http, sim.config, SYMBOL, "buy", 1, 0.5)
+            finally:
+                await feeder.close()
+    assert asyncio.run(scenario()) is None
+
+def test_lookup_by_client_order_id(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            feeder = Feeder(sim.config)
+            try:
+                params = {"symbol": SYMBOL, "side": "BUY", "type": "LIMIT", "quantity": "10", "price": "0.5", "newClientOrderId": "abc"}
+                status, order = await feeder.http.signed_request("POST", "/api/v3/order", params)
+                assert status == 200
+                assert await find_order_id_http(feeder.http, sim.config, SYMBOL, "abc") == order["orderId"]
+                assert await find_order_id_http(feeder.http, sim.config, SYMBOL, "missing") is False
+                # The exchange refuses a reused client order id, so a resend cannot duplicate
+                status, body = await feeder.http.signed_request("POST", "/api/v3/order", params)
+                assert status == 400 and body["code"] == -2010
+            finally:
+                await feeder.close()
+    asyncio.run(scenario())
+
+def test_cancel_of_unknown_order_counts_as_done(simulator):
+    async def scenario():
+        async with simulator(faults=FaultProfile(reject_cancel=1.0)) as sim:
+            feeder = Feeder(sim.config)
+            try:
+                order_id = await feeder.place_order(SYMBOL, "buy", 10, 0.5)
+                # -2011 reads as already cancelled on MEXC, so the pipeline trusts it
+                assert await feeder.cancel_order(SYMBOL, order_id) is True
+                assert order_id in sim.exchange.engine.orders[SYMBOL]
+            finally:
+                await feeder.close()
+    asyncio.run(scenario())
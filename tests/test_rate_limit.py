@@ -0,0 +1,66 @@
+import asyncio
+import time
+import pytest
+from config import Config
+from strategies.rate_limit import Priority, RequestShed, TokenBucket, WeightScheduler
+
+def _scheduler(limit=100, window=0.2):
+    config = Config()
+    config.API_WEIGHT_LIMIT = limit
+    config.API_WEIGHT_WINDOW = window
+    return WeightScheduler(config)
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate=100, capacity=2)
+
+    async def scenario():
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire(1)
+        return time.monotonic() - start
+    # Two from the burst, then two refilled at 100/s
+    assert 0.015 <= asyncio.run(scenario()) < 0.5
+
+def test_chart_traffic_is_shed_at_its_share():
+    scheduler = _scheduler()
+
+    async def scenario():
+        await scheduler.acquire(Priority.CHART, 50)
+        with pytest.raises(RequestShed):
+            await scheduler.acquire(Priority.CHART, 1)
+        # Higher priorities still have their share of the window
+        await scheduler.acquire(Priority.ORDER, 45)
+    asyncio.run(scenario())
+    assert scheduler.shed == 1 and scheduler.used == 95
+
+def test_budget_frees_as_the_window_slides():
+    scheduler = _scheduler(window=0.1)
+
+    async def scenario():
+        await scheduler.acquire(Priority.CANCEL, 100)
+        start = time.monotonic()
+        await scheduler.acquire(Priority.ACCOUNT, 10)
+        return time.monotonic() - start
+    assert asyncio.run(scenario()) >= 0.05
+
+def test_server_weight_and_retry_after_override_the_local_count():
+    scheduler = _scheduler(window=10)
+    scheduler.update_from_headers({"x-mbx-used-weight-1m": "90"})
+    assert scheduler.used == 90
+
+    async def scenario():
+        with pytest.raises(RequestShed):
+            await scheduler.acquire(Priority.CHART, 1)
+        await scheduler.acquire(Priority.ORDER, 5)
+    asyncio.run(scenario())
+
+    scheduler = _scheduler()
+    scheduler.back_off(0.05)
+
+    async def blocked():
+        with pytest.raises(RequestShed):
+            await scheduler.acquire(Priority.CHART, 1)
+        start = time.monotonic()
+        await scheduler.acquire(Priority.ORDER, 1)
+        return time.monotonic() - start
+    assert asyncio.run(blocked()) >= 0.04
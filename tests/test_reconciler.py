@@ -0,0 +1,49 @@
+import asyncio
+from decimal import Decimal
+from strategies.feeder import Feeder
+from strategies.reconciler import OrderSpec, SymbolFilters, apply_diff, reconcile
+
+SYMBOL = "USD1USDT"
+FILTERS = SymbolFilters("0.0001", "0.01")
+
+def test_reconcile_keeps_amends_cancels_and_places():
+    live = [
+        {"order_id": "1", "side": "buy", "price": 0.9, "quantity": 10.0},
+        {"order_id": "2", "side": "buy", "price": 0.8, "quantity": 10.0},
+        {"order_id": "3", "side": "sell", "price": 1.2, "quantity": 5.0},
+    ]
+    desired = [
+        OrderSpec("buy", 0.90001, 10.004),  # same order once snapped to the grid
+        OrderSpec("buy", 0.8, 20),
+        OrderSpec("buy", 0.7, 5),
+    ]
+    diff = reconcile(desired, live, FILTERS)
+    assert [o.order_id for o in diff.keep] == ["1"]
+    assert [(live.order_id, want.quantity) for live, want in diff.amend] == [("2", Decimal("20.00"))]
+    assert [o.order_id for o in diff.cancel] == ["3"]
+    assert [(o.price, o.quantity) for o in diff.place] == [(Decimal("0.7000"), Decimal("5.00"))]
+
+def test_reconcile_matching_book_is_noop():
+    live = [{"order_id": "1", "side": "buy", "price": 0.9, "quantity": 10.0}]
+    assert reconcile([OrderSpec("buy", 0.9, 10)], live, FILTERS).is_noop
+
+def test_apply_diff_against_simulator(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            feeder = Feeder(sim.config)
+            engine = sim.exchange.engine
+            try:
+                kept = await feeder.place_order(SYMBOL, "buy", 10, 0.9)
+                stale = await feeder.place_order(SYMBOL, "buy", 10, 0.8)
+                live = await feeder.query_open_orders(SYMBOL)
+                desired = [OrderSpec("buy", 0.9, 10), OrderSpec("buy", 0.7, 10)]
+                diff = reconcile(desired, live, FILTERS)
+                open_orders = await apply_diff(feeder, SYMBOL, diff, engine.free["USDT"])
+                assert kept in engine.orders[SYMBOL] and stale not in engine.orders[SYMBOL]
+                assert sorted(str(o["order_id"]) for o in open_orders) == sorted(engine.orders[SYMBOL])
+                assert sorted(o["price"] for o in engine.orders[SYMBOL].values()) == [0.7, 0.9]
+                # The book now matches: the next tick sends nothing
+                assert reconcile(desired, await feeder.query_open_orders(SYMBOL), FILTERS).is_noop
+            finally:
+                await feeder.close()
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+import json
+import math
+import sys
+from config import Config
+from strategies.registry import StrategyRegistry
+from strategies.template import TemplateStrategy
+
+def _spec(name, priority, when, **extra):
+    return {"name": name, "priority": priority, "max_orders": 1, "when": when,
+            "orders": [{"side": "buy", "price": 1.0, "fraction": 1.0}], **extra}
+
+def test_discover_reads_specs_in_priority_order():
+    registry = StrategyRegistry.discover(Config())
+    assert registry.names == ["high_spread_004", "low_spread_001"]
+    assert registry.select({"range_ewma": 0.6}) == 0
+    assert registry.select({"range_ewma": 0.1}) == 1
+
+def test_exit_bounds_hold_the_current_strategy():
+    registry = StrategyRegistry(Config(), [
+        _spec("calm", 1, {}),
+        _spec("wide", 0, {"range_ewma": {"min": 0.5, "exit_min": 0.4}}),
+    ])
+    assert registry.names == ["wide", "calm"]
+    assert registry.select({"range_ewma": 0.45}) == 1
+    assert registry.select({"range_ewma": 0.45}, current=0) == 0
+    assert registry.select({"range_ewma": 0.35}, current=0) == 1
+    # A missing or NaN indicator fails its bound, not the unconditioned spec
+    assert list(registry.evaluate({"range_ewma": math.nan})) == [False, True]
+    assert list(registry.evaluate({})) == [False, True]
+
+def test_max_bound_and_no_match():
+    registry = StrategyRegistry(Config(), [_spec("narrow", 0, {"atr_pct": {"max": 0.2}, "range_ewma": {"min": 0.1}})])
+    assert registry.select({"atr_pct": 0.1, "range_ewma": 0.3}) == 0
+    assert registry.select({"atr_pct": 0.3, "range_ewma": 0.3}) is None
+
+def test_strategy_code_is_imported_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "custom_strategy_mod.py").write_text(
+        "class Custom:\n    def __init__(self, config):\n        self.config = config\n")
+    root = tmp_path / "specs"
+    for spec in (_spec("custom", 0, {"range_ewma": {"min": 1.0}}, module="custom_strategy_mod", **{"class": "Custom"}),
+                 _spec("plain", 1, {})):
+        (root / spec["name"]).mkdir(parents=True)
+        (root / spec["name"] / "strategy.json").write_text(json.dumps(spec))
+    (root / "broken").mkdir()
+    (root / "broken" / "strategy.json").write_text("{")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    registry = StrategyRegistry.discover(Config(), root)
+    assert registry.names == ["custom", "plain"]
+    assert "custom_strategy_mod" not in sys.modules
+    assert isinstance(registry.get(1), TemplateStrategy)
+    assert "custom_strategy_mod" not in sys.modules
+    strategy = registry.get(0)
+    assert type(strategy).__name__ == "Custom" and registry.get(0) is strategy
+    monkeypatch.delitem(sys.modules, "custom_strategy_mod")
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from config import Config
+from strategies.API_SDK_Tools import place_order_sdk
+from strategies.sdk_executor import SdkExecutor, SdkTimeout
+
+SYMBOL = "USD1USDT"
+
+class FakeSpot:
+    """Blocking stand-in for mexc_sdk.Spot whose order replies arrive after a delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.orders = {}
+        self.release = threading.Event()
+
+    def new_order(self, symbol, side, order_type, quantity, price, newClientOrderId):
+        # The exchange takes the order at once; only the reply is slow
+        self.orders[newClientOrderId] = {"orderId": f"O{len(self.orders) + 1}", "clientOrderId": newClientOrderId}
+        if self.delay:
+            self.release.wait(self.delay)
+        return self.orders[newClientOrderId]
+
+    def query_order(self, symbol, origClientOrderId):
+        if origClientOrderId not in self.orders:
+            raise Exception('{"code": -2013, "msg": "Order does not exist."}')
+        return self.orders[origClientOrderId]
+
+def _executor(client, workers=1, timeout=0.1):
+    config = Config()
+    config.SDK_TIMEOUT = timeout
+    config.SDK_MAX_WORKERS = workers
+    return SdkExecutor(client, config)
+
+def test_call_runs_off_the_loop_and_records_stats():
+    client = FakeSpot()
+    sdk = _executor(client)
+
+    async def scenario():
+        return await sdk.call("new_order", SYMBOL, "BUY", "LIMIT", quantity="1", price="1", newClientOrderId="a")
+    try:
+        assert asyncio.run(scenario())["orderId"] == "O1"
+    finally:
+        sdk.shutdown()
+    stats = sdk.stats()
+    assert stats["queued"] == 0 and stats["running"] == 0
+    assert stats["methods"]["new_order"]["calls"] == 1 and stats["methods"]["new_order"]["errors"] == 0
+
+def test_timeout_says_whether_the_call_started():
+    client = FakeSpot(delay=1.0)
+    sdk = _executor(client)
+
+    async def scenario():
+        # One worker: the second call is still queued when both time out
+        return await asyncio.gather(
+            sdk.call("new_order", SYMBOL, "BUY", "LIMIT", quantity="1", price="1", newClientOrderId="a"),
+            sdk.call("new_order", SYMBOL, "BUY", "LIMIT", quantity="1", price="1", newClientOrderId="b"),
+            return_exceptions=True,
+        )
+    try:
+        first, second = asyncio.run(scenario())
+        client.release.set()
+        assert isinstance(first, SdkTimeout) and first.started
+        assert isinstance(second, SdkTimeout) and not second.started
+        # The abandoned call never runs once a worker frees up
+        time.sleep(0.1)
+        assert list(client.orders) == ["a"]
+    finally:
+        sdk.shutdown()
+
+def test_timed_out_order_is_found_by_client_order_id():
+    client = FakeSpot(delay=1.0)
+    sdk = _executor(client, workers=2)
+    try:
+        assert asyncio.run(place_order_sdk(sdk, SYMBOL, "buy", 1, 1)) == "O1"
+    finally:
+        client.release.set()
+        sdk.shutdown()
+
+def test_order_that_never_started_is_reported_unsent():
+    client = FakeSpot(delay=1.0)
+    sdk = _executor(client)
+
+    async def scenario():
+        # The only worker is stuck on another reply, so this placement never runs
+        busy = asyncio.create_task(sdk.call("new_order", SYMBOL, "BUY", "LIMIT", quantity="1", price="1", newClientOrderId="busy"))
+        await asyncio.sleep(0.01)
+        result = await place_order_sdk(sdk, SYMBOL, "buy", 1, 1)
+        await asyncio.gather(busy, return_exceptions=True)
+        return result
+    try:
+        assert asyncio.run(scenario()) is None
+        assert list(client.orders) == ["busy"]
+    finally:
+        client.release.set()
+        sdk.shutdown()
+
+def test_failed_lookup_is_not_reported_unsent():
+    client = FakeSpot()
+    client.new_order = lambda **kwargs: (_ for _ in ()).throw(ConnectionResetError("connection reset"))
+    sdk = _executor(client)
+    try:
+        assert asyncio.run(place_order_sdk(sdk, SYMBOL, "buy", 1, 1)) is False
+    finally:
+        sdk.shutdown()
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import time
+from strategies.http_client import HttpClient
+from strategies.signing import RequestSigner, verify_signature
+
+def test_signed_query_verifies_including_escaped_params():
+    signer = RequestSigner("key", "secret")
+    batch = json.dumps([{"symbol": "USD1USDT", "side": "BUY", "price": "0.99"}], separators=(",", ":"))
+    query = signer.signed_query({"batchOrders": batch, "recvWindow": 5000, "timestamp": 1})
+    assert verify_signature("secret", query)
+    assert not verify_signature("other", query)
+    assert not verify_signature("secret", query.replace("0.99", "0.98"))
+
+def test_signed_request_accepted(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            http = HttpClient(sim.config)
+            try:
+                status, body = await http.signed_request("GET", "/api/v3/account")
+            finally:
+                await http.close()
+        assert status == 200
+        assert {b["asset"] for b in body["balances"]} == {"USDT", "USD1"}
+    asyncio.run(scenario())
+
+def test_bad_key_and_signature_rejected(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            sim.config.API_SECRET = "wrong-secret"
+            http = HttpClient(sim.config)
+            bad_signature = await http.signed_request("GET", "/api/v3/account")
+            await http.close()
+            sim.config.API_KEY = "wrong-key"
+            http = HttpClient(sim.config)
+            bad_key = await http.signed_request("GET", "/api/v3/account")
+            await http.close()
+        assert bad_signature[0] == 400 and bad_signature[1]["code"] == 700002
+        assert bad_key[0] == 400 and bad_key[1]["code"] == 700001
+    asyncio.run(scenario())
+
+def test_recv_window_resyncs_clock_and_retries(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            http = HttpClient(sim.config)
+            try:
+                await http.sync_time()
+                # A clock a minute behind: the first attempt falls outside recvWindow
+                http.time_offset -= 60_000
+                status, _ = await http.signed_request("GET", "/api/v3/account")
+            finally:
+                await http.close()
+            return status, http.time_offset
+    status, offset = asyncio.run(scenario())
+    assert status == 200
+    assert abs(offset) < 5_000
+
+def test_failed_time_sync_backs_off(simulator):
+    async def scenario():
+        async with simulator() as sim:
+            sim.config.BASE_URL = "http://127.0.0.1:1"
+            http = HttpClient(sim.config)
+            try:
+                await http.sync_time()
+                first = http._next_sync
+                await http.sync_time()
+            finally:
+                await http.close()
+            return first, http._next_sync, http._sync_backoff
+    first, second, backoff = asyncio.run(scenario())
+    assert first > time.monotonic() - 1
+    assert second > first
+    assert backoff == 4.0
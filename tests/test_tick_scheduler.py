@@ -0,0 +1,69 @@
+import asyncio
+import time
+from config import Config
+from strategies.kline_store import KlineStore
+from strategies.snapshot import MarketSnapshot
+from strategies.tick_scheduler import TickScheduler
+
+SYMBOL = "USD1USDT"
+
+def _snapshot(open_time=0, close=1.0, orders=()):
+    store = KlineStore(SYMBOL, 10)
+    store.update([[open_time, close, close * 1.001, close * 0.999, close, 1.0, open_time + 59_999]])
+    return MarketSnapshot.build(SYMBOL, 0, store.view(), {"USDT": 100.0}, list(orders), [])
+
+def _scheduler(**overrides):
+    config = Config()
+    config.CHECK_INTERVAL = 0.05
+    config.TICK_DEBOUNCE = 0.0
+    config.TICK_MIN_INTERVAL = 0.0
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return TickScheduler(config, SYMBOL)
+
+def test_runs_only_when_inputs_change():
+    scheduler = _scheduler()
+    assert scheduler.should_run(_snapshot()) == "start"
+    assert scheduler.should_run(_snapshot()) is None
+    # Below TICK_PRICE_THRESHOLD the close counts as unchanged
+    assert scheduler.should_run(_snapshot(close=1.0001)) is None
+    assert scheduler.should_run(_snapshot(close=1.01)) == "price"
+    assert scheduler.should_run(_snapshot(open_time=60_000, close=1.01)) == "candle"
+    order = {"order_id": "1", "side": "buy", "price": 0.9, "quantity": 10.0}
+    assert scheduler.should_run(_snapshot(open_time=60_000, close=1.01, orders=[order])) == "orders"
+    assert (scheduler.evaluated, scheduler.skipped) == (4, 2)
+
+def test_heartbeat_forces_a_tick():
+    scheduler = _scheduler(TICK_HEARTBEAT=0.0)
+    scheduler.should_run(_snapshot())
+    assert scheduler.should_run(_snapshot()) == "heartbeat"
+
+def test_notify_wakes_a_streaming_wait():
+    scheduler = TickScheduler(Config(), SYMBOL, streaming=lambda: True)
+    scheduler.should_run(_snapshot())  # heartbeat deadline is now TICK_HEARTBEAT away
+
+    async def scenario():
+        asyncio.get_running_loop().call_later(0.05, scheduler.notify)
+        start = time.monotonic()
+        await scheduler.wait()
+        return time.monotonic() - start
+    assert asyncio.run(scenario()) < 2.0
+
+def test_failed_ticks_back_off():
+    # Streaming with the heartbeat long overdue: without a back-off every wait returns at once
+    scheduler = _scheduler()
+    scheduler.streaming = lambda: True
+
+    async def scenario():
+        waits = []
+        for _ in range(3):
+            start = time.monotonic()
+            await scheduler.wait()
+            waits.append(time.monotonic() - start)
+            scheduler.failed()
+        return waits
+    waits = asyncio.run(scenario())
+    assert waits[0] < 0.05
+    assert 0.05 <= waits[1] < waits[2]
+    scheduler.should_run(_snapshot())
+    assert scheduler._failures == 0
@@ -0,0 +1,144 @@
+import logging
+import queue
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CANDLE_COLUMNS = ("open_time", "open", "high", "low", "close", "volume")
+
+class ChartFeed:
+    """Push the primary symbol's chart to dashboard clients as Socket.IO deltas.
+
+    publish() runs on the trading loop: it diffs the tick's snapshot
+    against what was last sent and queues a compact `chart_update`
+    (changed or new candles, order adds and removes, new fills). A
+    background task emits queued events once for every viewer, so the
+    loop never waits on the network. New clients get a `chart_snapshot`;
+    each update carries a sequence number, and a client that sees a gap
+    asks for a fresh snapshot with `chart_resync`. Candles changed behind
+    the newest one sent (a gap backfill) go out as a fresh snapshot too.
+    """
+
+    def __init__(self, socketio, queue_size: int = 256):
+        self.socketio = socketio
+        self.seq = 0
+        self.symbol = None
+        self.klines = None  # KlineView last sent; snapshot views are frozen copies
+        self.orders = {}  # order_id -> {"id", "side", "price", "quantity"}
+        self.fills = {}  # fill id -> {"id", "side", "price", "quantity", "timestamp"}
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = self.socketio.start_background_task(self._pump)
+
+    def _pump(self):
+        while True:
+            event, data = self._queue.get()
+            try:
+                self.socketio.emit(event, data)
+            except Exception as e:
+                logger.error(f"Chart feed emit error: {e}")
+
+    def publish(self, snapshot):
+        """Queue what changed since the last published snapshot; never blocks."""
+        with self._lock:
+            event = self._diff(snapshot)
+        if event is None:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Clients notice the sequence gap and resync
+            self.dropped += 1
+
+    def snapshot(self) -> dict:
+        """Full chart state for a client that just connected or fell behind."""
+        with self._lock:
+            return self._full()
+
+    def _full(self) -> dict:
+        return {
+            "seq": self.seq,
+            "symbol": self.symbol,
+            "candles": _candle_rows(self.klines) if self.klines is not None else [],
+            "orders": list(self.orders.values()),
+            "fills": list(self.fills.values()),
+        }
+
+    def _diff(self, snapshot):
+        klines = snapshot.klines
+        if klines is None or not len(klines):
+            return None
+        times = klines.open_time
+        first = int(times[0])
+        sent = self.klines
+        if snapshot.symbol != self.symbol or sent is None or first < int(sent.open_time[0]):
+            return self._resend(snapshot)
+
+        # Both windows should hold the same candles up to the newest one sent
+        offset = int(np.searchsorted(sent.open_time, first))
+        n = len(sent) - offset
+        if n < 1 or n > len(times) or not all(
+            np.array_equal(getattr(sent, name)[offset:-1], getattr(klines, name)[:n - 1]) for name in CANDLE_COLUMNS
+        ) or times[n - 1] != sent.open_time[-1]:
+            # A backfill inserted or rewrote older candles; clients only append, so start them over
+            return self._resend(snapshot)
+        # The newest candle sent may still have moved; everything after it is new
+        moved = any(getattr(sent, name)[-1] != getattr(klines, name)[n - 1] for name in CANDLE_COLUMNS)
+        candles = _candle_rows(klines, slice(n - 1 if moved else n, None))
+        self.klines = klines
+
+        orders = {o["id"]: o for o in map(_order, snapshot.open_orders)}
+        added = [o for order_id, o in orders.items() if self.orders.get(order_id) != o]
+        removed = [order_id for order_id in self.orders if order_id not in orders]
+        self.orders = orders
+
+        fills = [f for f in map(_fill, snapshot.fills) if f["id"] not in self.fills]
+        for fill in fills:
+            self.fills[fill["id"]] = fill
+        self.fills = {i: f for i, f in self.fills.items() if f["timestamp"] >= first}
+
+        if not (candles or added or removed or fills):
+            return None
+        self.seq += 1
+        update = {"seq": self.seq, "first": first}
+        if candles:
+            update["candles"] = candles
+        if added:
+            update["orders_added"] = added
+        if removed:
+            update["orders_removed"] = removed
+        if fills:
+            update["fills"] = fills
+        return "chart_update", update
+
+    def _resend(self, snapshot):
+        self.symbol = snapshot.symbol
+        self.klines = snapshot.klines
+        self.orders = {o["id"]: o for o in map(_order, snapshot.open_orders)}
+        self.fills = {f["id"]: f for f in map(_fill, snapshot.fills)}
+        self.seq += 1
+        return "chart_snapshot", self._full()
+
+def _candle_rows(klines, rows=slice(None)) -> list:
+    return [
+        [int(t), o, h, l, c, v]
+        for t, o, h, l, c, v in zip(
+            klines.open_time[rows], klines.open[rows].tolist(), klines.high[rows].tolist(),
+            klines.low[rows].tolist(), klines.close[rows].tolist(), klines.volume[rows].tolist()
+        )
+    ]
+
+def _order(order) -> dict:
+    return {"id": str(order["order_id"]), "side": order["side"], "price": float(order["price"]), "quantity": float(order["quantity"])}
+
+def _fill(fill) -> dict:
+    return {
+        "id": str(fill["id"]), "side": fill["side"], "price": float(fill["price"]),
+        "quantity": float(fill["quantity"]), "timestamp": int(fill["timestamp"])
+    }
@@ -1,10 +1,14 @@
-from flask import Flask, render_template
+from flask import Flask, Response, jsonify, render_template
+from flask_socketio import emit
 from datetime import datetime
 import logging
 import os
 import time
-from pathlib import Path
 from config import Config
+from strategies.metrics import METRICS
+from notifier import TelegramBan
+from web_server.socketio_init import socketio
+from web_server.chart_feed import ChartFeed
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
 
@@ -20,25 +24,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def get_latest_chart():
-    """Find the latest chart."""
-    chart_path = Path("web_server/static/kline_plot.png")
-    if chart_path.exists():
-        logger.info(f"Found chart: {chart_path}")
-        return str(chart_path)
-    logger.warning("No chart found")
-    return None
+# The bot publishes each tick's snapshot; the browser draws it with Plotly
+socketio.init_app(app, async_mode="threading")
+chart_feed = ChartFeed(socketio)
+
+@socketio.on("connect")
+def on_connect():
+    emit("chart_snapshot", chart_feed.snapshot())
+
+@socketio.on("chart_resync")
+def on_resync():
+    """A client missed an update; send it the whole chart again."""
+    emit("chart_snapshot", chart_feed.snapshot())
 
 @app.route("/")
 def index():
     """Render the dashboard."""
-    config = Config()  # Reload config to ensure latest TELEGRAM_BAN
-    chart_path = get_latest_chart()
-    chart_url = "/static/kline_plot.png" if chart_path else None
-    system_status = f"Telegram Ban Until: {datetime.fromtimestamp(config.TELEGRAM_BAN) if config.TELEGRAM_BAN > time.time() else 'Not banned'}"
+    config = Config()
+    # The notifier records flood-control bans in a shared state file
+    banned_until = TelegramBan(config.TELEGRAM_STATE_FILE, config.TELEGRAM_BAN).until
+    system_status = f"Telegram Ban Until: {datetime.fromtimestamp(banned_until) if banned_until > time.time() else 'Not banned'}"
     return render_template(
         "index.html",
-        chart_path=chart_url,
+        symbol=config.SYMBOL,
         system_status=system_status,
         current_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     )
+
+@app.route("/metrics")
+def metrics():
+    """Hot-path metrics in the Prometheus text format."""
+    if not METRICS.enabled:
+        return Response("Metrics disabled\n", status=404, mimetype="text/plain")
+    return Response(METRICS.prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.route("/metrics.json")
+def metrics_json():
+    """Hot-path metrics as a JSON snapshot."""
+    if not METRICS.enabled:
+        return jsonify({"enabled": False}), 404
+    return jsonify(METRICS.snapshot())
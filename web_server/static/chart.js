@@ -1,117 +1,150 @@
-const socket = io.connect('http://localhost:5000');
+// Live chart fed by web_server/chart_feed.py: one full snapshot on connect, then deltas.
+const socket = io();
+
+const state = {
+    seq: 0,
+    symbol: '',
+    candles: new Map(),  // open time -> [t, open, high, low, close, volume]
+    orders: new Map(),   // order id -> {id, side, price, quantity}
+    fills: new Map()     // fill id -> {id, side, price, quantity, timestamp}
+};
+let drawPending = false;
 
 socket.on('connect', () => {
     console.log('Connected to WebSocket server');
 });
 
+socket.on('chart_snapshot', (data) => {
+    state.seq = data.seq;
+    state.symbol = data.symbol || '';
+    state.candles = new Map(data.candles.map(c => [c[0], c]));
+    state.orders = new Map(data.orders.map(o => [o.id, o]));
+    state.fills = new Map(data.fills.map(f => [f.id, f]));
+    scheduleDraw();
+});
+
 socket.on('chart_update', (data) => {
-    console.log('Received chart update:', data);
-    const chartData = JSON.parse(data);
-    const klines = chartData.klines.klines;
-    const openOrders = chartData.open_orders;
-    const executedTrades = chartData.executed_trades;
+    if (data.seq <= state.seq) {
+        // Already covered by the snapshot we hold (updates queued before it was taken)
+        return;
+    }
+    if (data.seq > state.seq + 1) {
+        // Missed an update: start over from a snapshot
+        socket.emit('chart_resync');
+        return;
+    }
+    state.seq = data.seq;
+    (data.candles || []).forEach(c => state.candles.set(c[0], c));
+    for (const t of state.candles.keys()) {
+        if (t >= data.first) break;
+        state.candles.delete(t);
+    }
+    (data.orders_added || []).forEach(o => state.orders.set(o.id, o));
+    (data.orders_removed || []).forEach(id => state.orders.delete(id));
+    (data.fills || []).forEach(f => state.fills.set(f.id, f));
+    for (const [id, f] of state.fills) {
+        if (f.timestamp < data.first) state.fills.delete(id);
+    }
+    scheduleDraw();
+});
 
-    const timestamps = klines.map(k => new Date(parseInt(k[0])));
-    const opens = klines.map(k => parseFloat(k[1]));
-    const highs = klines.map(k => parseFloat(k[2]));
-    const lows = klines.map(k => parseFloat(k[3]));
-    const closes = klines.map(k => parseFloat(k[4]));
-    const volumes = klines.map(k => parseFloat(k[5]));
+socket.on('disconnect', () => {
+    console.log('Disconnected from WebSocket server');
+});
 
-    const volumeColors = closes.map((close, i) => close >= opens[i] ? 'green' : 'red');
+// Bursts of updates collapse into one redraw per animation frame
+function scheduleDraw() {
+    if (!drawPending) {
+        drawPending = true;
+        requestAnimationFrame(() => {
+            drawPending = false;
+            draw();
+        });
+    }
+}
 
-    const fig = {
-        data: [
-            {
-                x: timestamps,
-                open: opens,
-                high: highs,
-                low: lows,
-                close: closes,
-                type: 'candlestick',
-                name: 'Klines',
-                xaxis: 'x',
-                yaxis: 'y'
-            },
-            {
-                x: timestamps,
-                y: volumes,
-                type: 'bar',
-                marker: { color: volumeColors },
-                name: 'Volume',
-                xaxis: 'x2',
-                yaxis: 'y2'
-            }
-        ],
-        layout: {
-            title: 'Dynamic Kline Chart',
-            grid: { rows: 2, columns: 1, pattern: 'independent' },
-            xaxis: { domain: [0, 1] },
-            yaxis: { title: 'Price' },
-            xaxis2: { anchor: 'y2' },
-            yaxis2: { title: 'Volume', domain: [0, 0.2] },
-            height: 800,
-            margin: { l: 50, r: 50, t: 50, b: 50 },
-            template: 'plotly_dark'
-        }
-    };
+function draw() {
+    const candles = [...state.candles.values()].sort((a, b) => a[0] - b[0]);
+    if (!candles.length) return;
+    const times = candles.map(c => new Date(c[0]));
+    const opens = candles.map(c => c[1]);
+    const closes = candles.map(c => c[4]);
+    const first = times[0];
+    const last = times[times.length - 1];
 
-    openOrders.forEach(order => {
-        const price = parseFloat(order.price);
-        const side = order.side;
-        const quantity = parseFloat(order.quantity);
-        const color = side === 'sell' ? 'red' : 'green';
-        fig.data.push({
-            x: [timestamps[0], timestamps[timestamps.length - 1]],
-            y: [price, price],
-            mode: 'lines',
-            line: { color: color, dash: 'dash', width: 4 },
-            showlegend: false,
+    const data = [
+        {
+            x: times,
+            open: opens,
+            high: candles.map(c => c[2]),
+            low: candles.map(c => c[3]),
+            close: closes,
+            type: 'candlestick',
+            name: 'Klines',
             xaxis: 'x',
             yaxis: 'y'
-        });
-        fig.layout.annotations = fig.layout.annotations || [];
-        fig.layout.annotations.push({
-            x: timestamps[timestamps.length - 1],
-            y: price,
-            text: `${side.charAt(0).toUpperCase() + side.slice(1)} ${price.toFixed(4)} (${quantity.toFixed(2)})`,
-            showarrow: false,
-            font: { color: 'white', size: 10 },
-            bgcolor: 'black',
-            bordercolor: 'black',
-            borderwidth: 1,
-            xshift: 10
-        });
-        fig.data.push({
-            x: [timestamps[timestamps.length - 1]],
-            y: [side === 'buy' ? price + 0.00005 : price - 0.00005],
-            mode: 'markers',
-            marker: { symbol: side === 'buy' ? 'triangle-up' : 'triangle-down', size: 10, color: color },
-            showlegend: false,
+        },
+        {
+            x: times,
+            y: candles.map(c => c[5]),
+            type: 'bar',
+            marker: { color: closes.map((close, i) => close >= opens[i] ? 'green' : 'red') },
+            name: 'Volume',
             xaxis: 'x',
-            yaxis: 'y'
-        });
-    });
+            yaxis: 'y2'
+        }
+    ];
 
-    executedTrades.forEach(trade => {
-        const price = parseFloat(trade.price);
-        const side = trade.side;
-        const color = side === 'sell' ? 'red' : 'green';
-        const timestamp = new Date(parseInt(trade.timestamp));
-        fig.data.push({
-            x: [timestamp],
-            y: [side === 'buy' ? price + 0.00005 : price - 0.00005],
+    const fills = [...state.fills.values()];
+    ['buy', 'sell'].forEach(side => {
+        const mine = fills.filter(f => f.side === side);
+        data.push({
+            x: mine.map(f => new Date(f.timestamp)),
+            y: mine.map(f => side === 'buy' ? f.price + 0.00005 : f.price - 0.00005),
             mode: 'markers',
-            marker: { symbol: side === 'buy' ? 'triangle-up' : 'triangle-down', size: 10, color: color },
+            marker: { symbol: side === 'buy' ? 'triangle-up' : 'triangle-down', size: 10, color: side === 'buy' ? 'green' : 'red' },
+            name: `${side} fills`,
             showlegend: false,
             xaxis: 'x',
             yaxis: 'y'
         });
     });
 
-    Plotly.newPlot('dynamic-chart', fig.data, fig.layout);
-});
+    const orders = [...state.orders.values()];
+    const layout = {
+        title: `${state.symbol} Klines`,
+        xaxis: { rangeslider: { visible: false } },
+        yaxis: { title: 'Price', domain: [0.25, 1] },
+        yaxis2: { title: 'Volume', domain: [0, 0.2] },
+        showlegend: false,
+        height: 800,
+        margin: { l: 50, r: 50, t: 50, b: 50 },
+        template: 'plotly_dark',
+        uirevision: state.symbol,  // keep the user's zoom across redraws
+        shapes: orders.map(o => ({
+            type: 'line',
+            x0: first,
+            x1: last,
+            y0: o.price,
+            y1: o.price,
+            xref: 'x',
+            yref: 'y',
+            line: { color: o.side === 'sell' ? 'red' : 'green', dash: 'dash', width: 2 }
+        })),
+        annotations: orders.map(o => ({
+            x: last,
+            y: o.price,
+            xref: 'x',
+            yref: 'y',
+            text: `${o.side.charAt(0).toUpperCase() + o.side.slice(1)} ${o.price.toFixed(4)} (${o.quantity.toFixed(2)})`,
+            showarrow: false,
+            font: { color: 'white', size: 10 },
+            bgcolor: 'black',
+            xshift: 10,
+            xanchor: 'left'
+        }))
+    };
 
-socket.on('disconnect', () => {
-    console.log('Disconnected from WebSocket server');
-});
+    // react diffs against the previous figure instead of rebuilding the plot
+    Plotly.react('dynamic-chart', data, layout);
+}